@@ -0,0 +1,45 @@
+"""add conference preferences
+
+Revision ID: 3b9e4c1d2f70
+Revises: 80271c32de7b
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b9e4c1d2f70'
+down_revision: Union[str, Sequence[str], None] = '80271c32de7b'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'conference_preferences',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parent_id', sa.Integer(), nullable=False),
+        sa.Column('teacher_id', sa.Integer(), nullable=False),
+        sa.Column('conference_date', sa.Date(), nullable=False),
+        sa.Column('is_scheduled', sa.Boolean(), nullable=True, server_default='false'),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['parent_id'], ['users.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['teacher_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_conference_preferences_id', 'conference_preferences', ['id'])
+    op.create_index('ix_conference_preferences_parent_id', 'conference_preferences', ['parent_id'])
+    op.create_index('ix_conference_preferences_conference_date', 'conference_preferences', ['conference_date'])
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_conference_preferences_conference_date', table_name='conference_preferences')
+    op.drop_index('ix_conference_preferences_parent_id', table_name='conference_preferences')
+    op.drop_index('ix_conference_preferences_id', table_name='conference_preferences')
+    op.drop_table('conference_preferences')
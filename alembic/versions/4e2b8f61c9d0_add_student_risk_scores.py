@@ -0,0 +1,45 @@
+"""add student risk scores
+
+Revision ID: 4e2b8f61c9d0
+Revises: 9d41e6b07a35
+Create Date: 2026-10-19 15:12:40.218734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '4e2b8f61c9d0'
+down_revision: Union[str, Sequence[str], None] = '9d41e6b07a35'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'student_risk_scores',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+        sa.Column('level', sa.String(length=10), nullable=False),
+        sa.Column('absence_rate_short', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('absence_rate_long', sa.Float(), nullable=False, server_default='0'),
+        sa.Column('unexcused_absences', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('late_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('average_percent', sa.Float(), nullable=True),
+        sa.Column('grade_trend', sa.Float(), nullable=True),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('student_id')
+    )
+    op.create_index(op.f('ix_student_risk_scores_score'), 'student_risk_scores', ['score'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_student_risk_scores_score'), table_name='student_risk_scores')
+    op.drop_table('student_risk_scores')
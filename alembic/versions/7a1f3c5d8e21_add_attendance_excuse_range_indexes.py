@@ -0,0 +1,30 @@
+"""add attendance and absence excuse range indexes
+
+Revision ID: 7a1f3c5d8e21
+Revises: 4e2b8f61c9d0
+Create Date: 2026-10-19 16:05:12.643190
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7a1f3c5d8e21'
+down_revision: Union[str, Sequence[str], None] = '4e2b8f61c9d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_attendance_student_date', 'attendance', ['student_id', 'date'], unique=False)
+    op.create_index('ix_absence_excuses_student_range', 'absence_excuses', ['student_id', 'start_date', 'end_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_absence_excuses_student_range', table_name='absence_excuses')
+    op.drop_index('ix_attendance_student_date', table_name='attendance')
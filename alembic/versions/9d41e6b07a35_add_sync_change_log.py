@@ -0,0 +1,66 @@
+"""add sync change log and updated_at columns
+
+Revision ID: 9d41e6b07a35
+Revises: 5c0d7a9e3b12
+Create Date: 2026-10-19 13:26:51.804417
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9d41e6b07a35'
+down_revision: Union[str, Sequence[str], None] = '5c0d7a9e3b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+SYNCED_TABLES = ['grades', 'attendance', 'fee_records', 'absence_excuses', 'appointments', 'event_rsvps']
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    for table in SYNCED_TABLES:
+        op.add_column(table, sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True, server_default=sa.func.now()))
+
+    op.create_table(
+        'sync_changes',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('entity', sa.String(length=32), nullable=False),
+        sa.Column('entity_id', sa.Integer(), nullable=False),
+        sa.Column('op', sa.String(length=10), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.Column('teacher_id', sa.Integer(), nullable=True),
+        sa.Column('changed_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_sync_changes_student_id', 'sync_changes', ['student_id'])
+    op.create_index('ix_sync_changes_user_id', 'sync_changes', ['user_id'])
+    op.create_index('ix_sync_changes_teacher_id', 'sync_changes', ['teacher_id'])
+
+    # Seed the log with the current rows so a first sync (cursor 0) sees everything
+    op.execute("""
+        INSERT INTO sync_changes (entity, entity_id, op, student_id, user_id, teacher_id)
+        SELECT 'events', id, 'upsert', NULL, NULL, NULL FROM events
+        UNION ALL SELECT 'grades', id, 'upsert', student_id, NULL, NULL FROM grades
+        UNION ALL SELECT 'attendance', id, 'upsert', student_id, NULL, NULL FROM attendance
+        UNION ALL SELECT 'fees', id, 'upsert', student_id, NULL, NULL FROM fee_records
+        UNION ALL SELECT 'absence_excuses', id, 'upsert', student_id, NULL, NULL FROM absence_excuses
+        UNION ALL SELECT 'event_rsvps', id, 'upsert', student_id, user_id, NULL FROM event_rsvps
+        UNION ALL SELECT 'appointments', a.id, 'upsert', NULL, a.parent_id, t.teacher_id
+            FROM appointments a LEFT JOIN teacher_availabilities t ON t.id = a.availability_id
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_sync_changes_teacher_id', table_name='sync_changes')
+    op.drop_index('ix_sync_changes_user_id', table_name='sync_changes')
+    op.drop_index('ix_sync_changes_student_id', table_name='sync_changes')
+    op.drop_table('sync_changes')
+    for table in SYNCED_TABLES:
+        op.drop_column(table, 'updated_at')
@@ -0,0 +1,43 @@
+"""add fee payments
+
+Revision ID: a9c4e1f7b352
+Revises: f4b9d2e7a613
+Create Date: 2026-10-19 21:40:26.771950
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a9c4e1f7b352'
+down_revision: Union[str, Sequence[str], None] = 'f4b9d2e7a613'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'fee_payments',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('user_id', sa.Integer(), nullable=False),
+        sa.Column('idempotency_key', sa.String(length=255), nullable=True),
+        sa.Column('request_hash', sa.String(length=64), nullable=False),
+        sa.Column('payment_method', sa.String(), nullable=False),
+        sa.Column('status_code', sa.Integer(), nullable=True),
+        sa.Column('response', sa.Text(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('user_id', 'idempotency_key', name='uq_fee_payments_user_key')
+    )
+    op.create_index(op.f('ix_fee_payments_id'), 'fee_payments', ['id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_fee_payments_id'), table_name='fee_payments')
+    op.drop_table('fee_payments')
@@ -0,0 +1,37 @@
+"""add gist index on absence excuse periods
+
+Revision ID: b6d94e0a2c17
+Revises: 7a1f3c5d8e21
+Create Date: 2026-10-19 16:48:03.117452
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6d94e0a2c17'
+down_revision: Union[str, Sequence[str], None] = '7a1f3c5d8e21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index('ix_absence_excuses_dates', 'absence_excuses', ['start_date', 'end_date'], unique=False)
+    # Serves `daterange(start_date, end_date, '[]') @> :day` ("who is excused on D?");
+    # other backends use the btree above for `start_date <= :day AND end_date >= :day`
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute(
+            "CREATE INDEX ix_absence_excuses_period ON absence_excuses "
+            "USING gist (daterange(start_date, end_date, '[]'))"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_bind().dialect.name == 'postgresql':
+        op.execute("DROP INDEX IF EXISTS ix_absence_excuses_period")
+    op.drop_index('ix_absence_excuses_dates', table_name='absence_excuses')
@@ -0,0 +1,37 @@
+"""add attendance excused_by_excuse_id
+
+Revision ID: b8e2f5c4d019
+Revises: a9c4e1f7b352
+Create Date: 2026-10-20 09:12:44.308215
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8e2f5c4d019'
+down_revision: Union[str, Sequence[str], None] = 'a9c4e1f7b352'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Existing EXCUSED rows stay unlinked: it is not known whether a teacher
+    # or reconciliation set them, so revoking an excuse never touches them
+    op.add_column('attendance', sa.Column('excused_by_excuse_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_attendance_excused_by_excuse_id', 'attendance', 'absence_excuses',
+        ['excused_by_excuse_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index(op.f('ix_attendance_excused_by_excuse_id'), 'attendance', ['excused_by_excuse_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_attendance_excused_by_excuse_id'), table_name='attendance')
+    op.drop_constraint('fk_attendance_excused_by_excuse_id', 'attendance', type_='foreignkey')
+    op.drop_column('attendance', 'excused_by_excuse_id')
@@ -0,0 +1,44 @@
+"""add attendance bitmaps
+
+Revision ID: c3f8a2d5e914
+Revises: b6d94e0a2c17
+Create Date: 2026-10-19 18:04:11.520397
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f8a2d5e914'
+down_revision: Union[str, Sequence[str], None] = 'b6d94e0a2c17'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'attendance_bitmaps',
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('academic_year', sa.String(length=20), nullable=False),
+        sa.Column('term', sa.Integer(), nullable=False),
+        sa.Column('start_date', sa.Date(), nullable=False),
+        sa.Column('days', sa.Integer(), nullable=False),
+        sa.Column('present', sa.LargeBinary(), nullable=False),
+        sa.Column('absent', sa.LargeBinary(), nullable=False),
+        sa.Column('late', sa.LargeBinary(), nullable=False),
+        sa.Column('excused', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('student_id', 'academic_year', 'term')
+    )
+    op.create_index('ix_attendance_bitmaps_term', 'attendance_bitmaps', ['academic_year', 'term'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_attendance_bitmaps_term', table_name='attendance_bitmaps')
+    op.drop_table('attendance_bitmaps')
@@ -0,0 +1,46 @@
+"""add absence alerts
+
+Revision ID: d7e1b4a9c305
+Revises: c3f8a2d5e914
+Create Date: 2026-10-19 19:26:52.804113
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd7e1b4a9c305'
+down_revision: Union[str, Sequence[str], None] = 'c3f8a2d5e914'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'absence_alerts',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('parent_id', sa.Integer(), nullable=False),
+        sa.Column('student_id', sa.Integer(), nullable=False),
+        sa.Column('missed_days', sa.Integer(), nullable=False),
+        sa.Column('school_days', sa.Integer(), nullable=False),
+        sa.Column('longest_streak', sa.Integer(), nullable=False),
+        sa.Column('window_start', sa.Date(), nullable=False),
+        sa.Column('as_of', sa.Date(), nullable=False),
+        sa.Column('sent_at', sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['parent_id'], ['parents.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['student_id'], ['students.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_absence_alerts_id'), 'absence_alerts', ['id'], unique=False)
+    op.create_index('ix_absence_alerts_parent_sent', 'absence_alerts', ['parent_id', 'sent_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_absence_alerts_parent_sent', table_name='absence_alerts')
+    op.drop_index(op.f('ix_absence_alerts_id'), table_name='absence_alerts')
+    op.drop_table('absence_alerts')
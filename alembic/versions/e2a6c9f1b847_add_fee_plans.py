@@ -0,0 +1,59 @@
+"""add fee plans
+
+Revision ID: e2a6c9f1b847
+Revises: d7e1b4a9c305
+Create Date: 2026-10-19 20:11:37.942561
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a6c9f1b847'
+down_revision: Union[str, Sequence[str], None] = 'd7e1b4a9c305'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # gradelevel already exists (students.grade_level)
+    grade_level_enum = postgresql.ENUM(
+        'VORSCHULE', 'KLASSE_1', 'KLASSE_2', 'KLASSE_3', 'KLASSE_4',
+        name='gradelevel', create_type=False
+    )
+    op.create_table(
+        'fee_plans',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('grade_level', grade_level_enum, nullable=False),
+        sa.Column('academic_year', sa.String(), nullable=False),
+        sa.Column('fee_type', sa.String(), nullable=False),
+        sa.Column('amount', sa.Float(), nullable=False),
+        sa.Column('due_date', sa.Date(), nullable=False),
+        sa.Column('created_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['created_by'], ['users.id']),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('grade_level', 'academic_year', 'fee_type', name='uq_fee_plans_level_year_type')
+    )
+    op.create_index(op.f('ix_fee_plans_id'), 'fee_plans', ['id'], unique=False)
+
+    op.add_column('fee_records', sa.Column('fee_plan_id', sa.Integer(), nullable=True))
+    op.create_foreign_key(
+        'fk_fee_records_fee_plan_id', 'fee_records', 'fee_plans',
+        ['fee_plan_id'], ['id'], ondelete='SET NULL'
+    )
+    op.create_index('ix_fee_records_student_plan', 'fee_records', ['student_id', 'fee_plan_id'], unique=True)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fee_records_student_plan', table_name='fee_records')
+    op.drop_constraint('fk_fee_records_fee_plan_id', 'fee_records', type_='foreignkey')
+    op.drop_column('fee_records', 'fee_plan_id')
+    op.drop_index(op.f('ix_fee_plans_id'), table_name='fee_plans')
+    op.drop_table('fee_plans')
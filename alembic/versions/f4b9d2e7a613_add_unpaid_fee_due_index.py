@@ -0,0 +1,32 @@
+"""add partial index on unpaid fees by due date
+
+Revision ID: f4b9d2e7a613
+Revises: e2a6c9f1b847
+Create Date: 2026-10-19 20:58:14.306218
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4b9d2e7a613'
+down_revision: Union[str, Sequence[str], None] = 'e2a6c9f1b847'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_index(
+        'ix_fee_records_unpaid_due', 'fee_records', ['due_date', 'id'], unique=False,
+        postgresql_where=sa.text('NOT is_paid'),
+        sqlite_where=sa.text('NOT is_paid')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_fee_records_unpaid_due', table_name='fee_records')
@@ -0,0 +1,66 @@
+"""
+Benchmark the parent-teacher conference scheduler on a synthetic school.
+
+Usage: python benchmarks/bench_conference_scheduler.py [families] [teachers]
+"""
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The services package imports config, which insists on these being set.
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from services.conference_scheduler import schedule_conferences
+
+
+def build_school(families: int, teachers: int, meetings_per_family: int = 3, slot_minutes: int = 10):
+    rng = random.Random(42)
+    day_start = datetime(2026, 11, 20, 13, 0)
+    slots_per_teacher = (families * meetings_per_family) // teachers + 6
+
+    slots = []
+    slot_id = 0
+    for teacher_id in range(1, teachers + 1):
+        for i in range(slots_per_teacher):
+            start = day_start + timedelta(minutes=i * slot_minutes)
+            slot_id += 1
+            slots.append((slot_id, teacher_id, start, start + timedelta(minutes=slot_minutes)))
+
+    preferences = {
+        parent_id: rng.sample(range(1, teachers + 1), rng.randint(1, meetings_per_family * 2 - 1))
+        for parent_id in range(1, families + 1)
+    }
+    return slots, preferences
+
+
+def main():
+    families = int(sys.argv[1]) if len(sys.argv) > 1 else 600
+    teachers = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    slots, preferences = build_school(families, teachers)
+    requested = sum(len(t) for t in preferences.values())
+
+    started = time.perf_counter()
+    assignments, unscheduled = schedule_conferences(slots, preferences)
+    elapsed = time.perf_counter() - started
+
+    by_parent = {}
+    slot_times = {s[0]: (s[2], s[3]) for s in slots}
+    for parent_id, availability_id in assignments:
+        by_parent.setdefault(parent_id, []).append(slot_times[availability_id])
+    idle_minutes = sum(
+        ((max(e for _, e in times) - min(s for s, _ in times)) - sum((e - s for s, e in times), timedelta())).total_seconds() / 60
+        for times in by_parent.values()
+    )
+
+    print(f"families={families} teachers={teachers} slots={len(slots)} requested={requested}")
+    print(f"scheduled={len(assignments)} unscheduled={len(unscheduled)} "
+          f"avg_idle_minutes={idle_minutes / max(len(by_parent), 1):.1f}")
+    print(f"elapsed={elapsed:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
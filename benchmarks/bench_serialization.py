@@ -0,0 +1,131 @@
+"""
+Benchmark response serialization for GET /events: the old path (schema built
+field by field, re-validated against response_model, encoded with the stdlib
+json) against the ORM-row path (one from_attributes validation with a cached
+TypeAdapter, encoded by pydantic-core).
+
+Usage: python benchmarks/bench_serialization.py [events] [rounds]
+"""
+import asyncio
+import json
+import os
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+# The schemas package imports config, which insists on these being set.
+os.environ.setdefault("SECRET_KEY", "benchmark")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+
+from models import Event, EventType, EventAudience, RSVPStatus
+from schemas.event import EventDetailResponse
+from utils.serialization import row_data, dump_json
+
+
+def build_events(count: int):
+    now = datetime(2026, 11, 20, 9, 0, tzinfo=timezone.utc)
+    events = []
+    for i in range(count):
+        events.append((Event(
+            id=i + 1,
+            title=f"Event {i}",
+            description="School assembly in the main hall " * 3,
+            event_type=list(EventType)[i % len(EventType)],
+            start_date=now + timedelta(days=i),
+            end_date=now + timedelta(days=i, hours=2),
+            location="Main hall",
+            target_audience=EventAudience.ALL,
+            target_grade_levels="klasse_1,klasse_2",
+            requires_rsvp=bool(i % 2),
+            max_participants=120,
+            registration_deadline=now + timedelta(days=i - 1),
+            created_by=1,
+            organizer_name="Office",
+            organizer_contact="office@example.org",
+            is_published=True,
+            is_cancelled=False,
+            cancellation_reason=None,
+            created_at=now,
+            updated_at=now
+        ), {
+            "creator_name": "Ada Admin",
+            "total_rsvps": 40,
+            "attending_count": 35,
+            "available_spots": 85,
+            "user_rsvp_status": RSVPStatus.ATTENDING if i % 3 == 0 else None
+        }))
+    return events
+
+
+def before(events, field):
+    result = []
+    for event, extra in events:
+        result.append(EventDetailResponse(
+            id=event.id,
+            title=event.title,
+            description=event.description,
+            event_type=event.event_type.value if hasattr(event.event_type, 'value') else event.event_type,
+            start_date=event.start_date,
+            end_date=event.end_date,
+            location=event.location,
+            target_audience=event.target_audience.value if hasattr(event.target_audience, 'value') else event.target_audience,
+            target_grade_levels=event.target_grade_levels,
+            requires_rsvp=event.requires_rsvp,
+            max_participants=event.max_participants,
+            registration_deadline=event.registration_deadline,
+            created_by=event.created_by,
+            creator_name=extra["creator_name"],
+            organizer_name=event.organizer_name,
+            organizer_contact=event.organizer_contact,
+            is_published=event.is_published,
+            is_cancelled=event.is_cancelled,
+            cancellation_reason=event.cancellation_reason,
+            created_at=event.created_at,
+            updated_at=event.updated_at,
+            total_rsvps=extra["total_rsvps"],
+            attending_count=extra["attending_count"],
+            available_spots=extra["available_spots"],
+            user_rsvp_status=extra["user_rsvp_status"].value if extra["user_rsvp_status"] else None
+        ))
+    content = asyncio.run(serialize_response(field=field, response_content=result))
+    return JSONResponse(content).body
+
+
+def after(events):
+    return dump_json(List[EventDetailResponse], [row_data(event, **extra) for event, extra in events])
+
+
+def timed(fn, rounds):
+    best = None
+    for _ in range(rounds):
+        started = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - started
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    events = build_events(count)
+    field = create_model_field(name="Response_get_events", type_=List[EventDetailResponse], mode="serialization")
+
+    assert json.loads(before(events, field)) == json.loads(after(events)), "payloads differ"
+
+    old = timed(lambda: before(events, field), rounds)
+    new = timed(lambda: after(events), rounds)
+    scale = 1000 / count
+    print(f"events={count} rounds={rounds}")
+    print(f"before: {old * 1000 * scale:.2f} ms per 1,000 events")
+    print(f"after:  {new * 1000 * scale:.2f} ms per 1,000 events ({old / new:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -30,3 +30,28 @@ FRONTEND_URL = [
     url.strip() for url in os.getenv("FRONTEND_URL", "http://localhost:3000").split(",")
     if url.strip()
 ]
+
+# Response cache ("memory://" for the in-process LRU, or a redis:// URL). The LRU is
+# per worker; on Postgres invalidations reach the other workers through NOTIFY,
+# elsewhere run a single worker or use Redis
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL", "memory://")
+RESPONSE_CACHE_MAX_ENTRIES = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2048"))
+RESPONSE_CACHE_TTL_SECONDS = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "300"))
+
+# Delta sync (/sync)
+SYNC_PAGE_SIZE = int(os.getenv("SYNC_PAGE_SIZE", "1000"))
+SYNC_SETTLE_SECONDS = int(os.getenv("SYNC_SETTLE_SECONDS", "5"))
+
+# Live updates (/stream); fanned out across workers with Postgres LISTEN/NOTIFY
+EVENT_BUS_CHANNEL = os.getenv("EVENT_BUS_CHANNEL", "school_events")
+
+# Local time of the school; availabilities are stored as naive local times
+SCHOOL_TIMEZONE = os.getenv("SCHOOL_TIMEZONE", "Europe/Berlin")
+
+# Report-card rendering processes (0 = one per CPU)
+REPORT_CARD_WORKERS = int(os.getenv("REPORT_CARD_WORKERS", "0"))
+
+# Chronic absence alerts (jobs.absence_alerts): missed days among the last N school days
+CHRONIC_ABSENCE_WINDOW_DAYS = int(os.getenv("CHRONIC_ABSENCE_WINDOW_DAYS", "20"))
+CHRONIC_ABSENCE_THRESHOLD = int(os.getenv("CHRONIC_ABSENCE_THRESHOLD", "4"))
+CHRONIC_ABSENCE_COOLOFF_DAYS = int(os.getenv("CHRONIC_ABSENCE_COOLOFF_DAYS", "14"))
@@ -0,0 +1,5 @@
+# ============================================================
+# jobs/__init__.py
+# ============================================================
+# Batch jobs, run from cron or a scheduler as `python -m jobs.<name>`
+__all__ = []
@@ -0,0 +1,42 @@
+"""
+Daily chronic absence check: email parents of students who missed too
+many of the last school days, one message per parent, with a cool-off.
+
+Usage: python -m jobs.absence_alerts [--as-of 2026-03-01] [--window 20] [--threshold 4] [--cooloff 14] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+
+from config import CHRONIC_ABSENCE_WINDOW_DAYS, CHRONIC_ABSENCE_THRESHOLD, CHRONIC_ABSENCE_COOLOFF_DAYS
+from database import SessionLocal
+from services.absence_alerts import send_absence_alerts
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    parser.add_argument("--window", type=int, default=CHRONIC_ABSENCE_WINDOW_DAYS, help="school days to look back")
+    parser.add_argument("--threshold", type=int, default=CHRONIC_ABSENCE_THRESHOLD, help="missed days that trigger an alert")
+    parser.add_argument("--cooloff", type=int, default=CHRONIC_ABSENCE_COOLOFF_DAYS, help="days before a parent is alerted again")
+    parser.add_argument("--dry-run", action="store_true", help="find and group alerts without sending or logging them")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts = asyncio.run(send_absence_alerts(
+            db, args.as_of, args.window, args.threshold, args.cooloff, dry_run=args.dry_run
+        ))
+    finally:
+        db.close()
+
+    print(f"Flagged {counts['students']} students; emailed {counts['sent']} of {counts['parents']} parents "
+          f"({counts['cooling_off']} in cool-off) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+"""
+Rebuild the per-student attendance bitmaps of a term from the attendance
+table. The write paths keep them current; run this to backfill or repair.
+
+Usage: python -m jobs.build_attendance_bitmaps [--academic-year 2025-2026] [--term 1]
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from database import SessionLocal
+from repositories.attendance_bitmaps import rebuild_bitmaps
+from utils.grading import term_of
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--academic-year", default=None, help="defaults to the current academic year")
+    parser.add_argument("--term", type=int, choices=(1, 2), default=None, help="defaults to both terms")
+    args = parser.parse_args(argv)
+
+    academic_year = args.academic_year or term_of(date.today())[0]
+    terms = [args.term] if args.term else [1, 2]
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        written = {term: rebuild_bitmaps(db, academic_year, term) for term in terms}
+        db.commit()
+    finally:
+        db.close()
+
+    for term, count in written.items():
+        print(f"{academic_year} term {term}: {count} bitmaps")
+    print(f"Done in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
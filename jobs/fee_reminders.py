@@ -0,0 +1,37 @@
+"""
+Dunning run: email every parent with overdue fees one statement covering
+all their children.
+
+Usage: python -m jobs.fee_reminders [--as-of 2026-03-01] [--batch-size 200] [--dry-run]
+"""
+import argparse
+import asyncio
+import sys
+import time
+from datetime import date
+
+from database import SessionLocal
+from services.fee_reminders import send_fee_reminders, REMINDER_BATCH_SIZE
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    parser.add_argument("--batch-size", type=int, default=REMINDER_BATCH_SIZE, help="parents per query page and SMTP connection")
+    parser.add_argument("--dry-run", action="store_true", help="count reminders without sending them")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts = asyncio.run(send_fee_reminders(db, args.as_of, args.batch_size, dry_run=args.dry_run))
+    finally:
+        db.close()
+
+    print(f"Emailed {counts['sent']} of {counts['parents']} parents about {counts['fees']} overdue fees "
+          f"({counts['no_email']} without an email address) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
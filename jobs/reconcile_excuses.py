@@ -0,0 +1,35 @@
+"""
+Nightly sweep: mark ABSENT attendance covered by an approved absence excuse
+as EXCUSED, catching absences recorded after the excuse was approved.
+
+Usage: python -m jobs.reconcile_excuses
+"""
+import argparse
+import sys
+import time
+
+from database import SessionLocal
+from repositories.attendance import reconcile_excused_absences, invalidate_attendance
+from services.event_bus import event_bus  # noqa: F401  forwards the cache invalidation to the web workers
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts, days = reconcile_excused_absences(db)
+        db.commit()
+        invalidate_attendance(days)
+    finally:
+        db.close()
+
+    print(f"Excused {counts['excused_records']} attendance records for {counts['students']} students "
+          f"in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,54 @@
+"""
+Render report cards for a whole academic year (or one grade level / class)
+into a zip archive on disk.
+
+Usage: python -m jobs.render_report_cards 2025-2026 --term 1 --output report-cards.zip
+"""
+import argparse
+import sys
+import time
+
+from database import SessionLocal
+from models import Class
+from services.report_card_renderer import shutdown_renderer, stream_report_cards
+from services.report_cards import report_card_documents
+from utils.enums import GradeLevel
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("academic_year")
+    parser.add_argument("--term", type=int, choices=(1, 2))
+    parser.add_argument("--grade-level", choices=[level.value for level in GradeLevel])
+    parser.add_argument("--class-id", type=int)
+    parser.add_argument("--format", choices=("html", "pdf"), default="html")
+    parser.add_argument("--output", default="report-cards.zip")
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        query = db.query(Class).filter(Class.academic_year == args.academic_year)
+        if args.grade_level:
+            query = query.filter(Class.grade_level == GradeLevel(args.grade_level))
+        if args.class_id:
+            query = query.filter(Class.id == args.class_id)
+        classes = query.order_by(Class.grade_level, Class.name).all()
+        documents = report_card_documents(db, classes, args.term) if classes else []
+    finally:
+        db.close()
+
+    try:
+        with open(args.output, "wb") as output:
+            for chunk in stream_report_cards(documents, args.format):
+                output.write(chunk)
+    finally:
+        shutdown_renderer()
+
+    print(f"Rendered {len(documents)} report cards for {len(classes)} classes "
+          f"to {args.output} in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
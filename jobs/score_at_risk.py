@@ -0,0 +1,34 @@
+"""
+Nightly early-warning run: rescore every student and replace the
+student_risk_scores table served by /dashboard/at-risk.
+
+Usage: python -m jobs.score_at_risk [--as-of 2026-03-01]
+"""
+import argparse
+import sys
+import time
+from datetime import date
+
+from database import SessionLocal
+from services.risk_scoring import refresh_risk_scores
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--as-of", type=date.fromisoformat, default=None)
+    args = parser.parse_args(argv)
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        counts = refresh_risk_scores(db, args.as_of)
+    finally:
+        db.close()
+
+    print(f"Scored {counts['students']} students (high={counts['high']}, medium={counts['medium']}, "
+          f"low={counts['low']}) in {time.perf_counter() - started:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
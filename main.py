@@ -1,8 +1,10 @@
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse
 from database import Base, engine
 from config import ALLOWED_ORIGINS
+from services.event_bus import event_bus
+from services.report_card_renderer import shutdown_renderer
 
 
 # Import all routers
@@ -10,10 +12,11 @@ from routers import (
     auth, admission, students, teachers, 
     classes, courses, exams, grades,
     attendance, fees, registrations, 
-    parents, dashboard, absence_excuses, appointment, events
+    parents, dashboard, absence_excuses, appointment, events,
+    sync, stream, report_cards
 )
 
-app = FastAPI(title="Elementary School Management System")
+app = FastAPI(title="Elementary School Management System", default_response_class=ORJSONResponse)
 
 # CORS Middleware
 app.add_middleware(
@@ -28,6 +31,12 @@ app.add_middleware(
 @app.on_event("startup")
 async def startup():
     Base.metadata.create_all(bind=engine)
+    await event_bus.start()
+
+@app.on_event("shutdown")
+async def shutdown():
+    await event_bus.stop()
+    shutdown_renderer()
 
 # Include all routers
 app.include_router(auth.router)
@@ -46,6 +55,9 @@ app.include_router(dashboard.router)
 app.include_router(absence_excuses.router)
 app.include_router(appointment.router)
 app.include_router(events.router)
+app.include_router(sync.router)
+app.include_router(stream.router)
+app.include_router(report_cards.router)
 
 @app.get("/")
 async def root():
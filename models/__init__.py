@@ -3,13 +3,16 @@ from models.auth import RefreshToken, TokenBlacklist
 from models.student import Student, Parent, StudentParent
 from models.teacher import Teacher
 from models.academic import Class, Course, Exam, Grade
-from models.attendance import Attendance
-from models.fees import FeeRecord
+from models.attendance import Attendance, AttendanceBitmap, AbsenceAlert
+from models.fees import FeeRecord, FeePlan, FeePayment
 from models.registration import RegistrationRequest, RegistrationApprovalLog
 from models.admission import AdmissionLetter, StudentAdmission, ParentAdmission
 from models.absence_excuse import AbsenceExcuse, ExcuseStatus, AbsenceReason
-from models.appointment import AppointmentStatus, TeacherAvailability, Appointment, MeetingSummary
+from models.appointment import AppointmentStatus, TeacherAvailability, Appointment, MeetingSummary, ConferencePreference
 from models.event import Event, EventAttachment, EventAudience, EventRSVP, EventType, RSVPStatus
+from models.version import ResourceVersion
+from models.sync import SyncChange
+from models.risk import StudentRiskScore
 
 __all__ = [
     "User", "Role", "RoleUser",
@@ -17,11 +20,14 @@ __all__ = [
     "Student", "Parent", "StudentParent",
     "Teacher",
     "Class", "Course", "Exam", "Grade",
-    "Attendance",
-    "FeeRecord",
+    "Attendance", "AttendanceBitmap", "AbsenceAlert",
+    "FeeRecord", "FeePlan", "FeePayment",
     "RegistrationRequest", "RegistrationApprovalLog",
     "AdmissionLetter", "StudentAdmission", "ParentAdmission",
     "AbsenceExcuse", "ExcuseStatus", "AbsenceReason",
-    "AppointmentStatus", "TeacherAvailability", "Appointment", "MeetingSummary",
-    "Event", "EventAttachment", "EventAudience", "EventRSVP", "EventType", "RSVPStatus"
+    "AppointmentStatus", "TeacherAvailability", "Appointment", "MeetingSummary", "ConferencePreference",
+    "Event", "EventAttachment", "EventAudience", "EventRSVP", "EventType", "RSVPStatus",
+    "ResourceVersion",
+    "SyncChange",
+    "StudentRiskScore"
 ]
\ No newline at end of file
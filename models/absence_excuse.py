@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Text
+from sqlalchemy import Column, Integer, String, Date, DateTime, ForeignKey, Enum as SQLEnum, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from database import Base
@@ -18,6 +18,13 @@ class AbsenceReason(str, Enum):
 
 class AbsenceExcuse(Base):
     __tablename__ = "absence_excuses"
+    __table_args__ = (
+        # Range lookups: which excuses of a student cover a given date
+        Index("ix_absence_excuses_student_range", "student_id", "start_date", "end_date"),
+        # School-wide "excused on date D"; Postgres also has a GiST index on
+        # daterange(start_date, end_date, '[]') created by migration b6d94e0a2c17
+        Index("ix_absence_excuses_dates", "start_date", "end_date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"), nullable=False)
@@ -31,6 +38,7 @@ class AbsenceExcuse(Base):
     reviewed_at = Column(DateTime, nullable=True)
     reviewed_by = Column(Integer, ForeignKey("users.id"), nullable=True)
     admin_notes = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Relationships
     student = relationship("Student", foreign_keys=[student_id])
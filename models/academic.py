@@ -65,6 +65,7 @@ class Grade(Base):
     grade_value = Column(String)
     comments = Column(Text)
     graded_at = Column(DateTime, default=datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     student = relationship("Student", back_populates="grades")
     course = relationship("Course", back_populates="grades")
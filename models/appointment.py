@@ -1,8 +1,8 @@
-from sqlalchemy import Column, Integer, ForeignKey, DateTime, String, Enum, Boolean
+from sqlalchemy import Column, Integer, ForeignKey, DateTime, Date, String, Enum, Boolean
 from sqlalchemy.orm import relationship
 from database import Base
 import enum
-from datetime import datetime
+from datetime import datetime, timezone
 
 # Status of the appointment
 class AppointmentStatus(enum.Enum):
@@ -34,10 +34,25 @@ class Appointment(Base):
     status = Column(Enum(AppointmentStatus), default=AppointmentStatus.PENDING)
     reason = Column(String, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
 
     parent = relationship("User", foreign_keys=[parent_id])
     availability = relationship("TeacherAvailability")
 
+# Parent-teacher conference preferences (scheduled in batch)
+class ConferencePreference(Base):
+    __tablename__ = "conference_preferences"
+
+    id = Column(Integer, primary_key=True, index=True)
+    parent_id = Column(Integer, ForeignKey("users.id"), nullable=False, index=True)
+    teacher_id = Column(Integer, ForeignKey("users.id"), nullable=False)
+    conference_date = Column(Date, nullable=False, index=True)
+    is_scheduled = Column(Boolean, default=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+
+    parent = relationship("User", foreign_keys=[parent_id])
+    teacher = relationship("User", foreign_keys=[teacher_id])
+
 # Meeting summary table
 class MeetingSummary(Base):
     __tablename__ = "meeting_summaries"
@@ -1,7 +1,7 @@
 # ============================================================
 # models/attendance.py
 # ============================================================
-from sqlalchemy import Column, Integer, Date, ForeignKey, Text, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Date, ForeignKey, Text, DateTime, LargeBinary, Enum as SQLEnum, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
 from database import Base
@@ -9,6 +9,9 @@ from utils.enums import AttendanceStatus
 
 class Attendance(Base):
     __tablename__ = "attendance"
+    __table_args__ = (
+        Index("ix_attendance_student_date", "student_id", "date"),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
@@ -17,6 +20,54 @@ class Attendance(Base):
     notes = Column(Text)
     recorded_by = Column(Integer, ForeignKey("users.id"))
     recorded_at = Column(DateTime, default=datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+    # Set when reconciliation turned ABSENT into EXCUSED because of this
+    # excuse; only such rows are reverted when it loses its approval
+    excused_by_excuse_id = Column(Integer, ForeignKey("absence_excuses.id", ondelete="SET NULL"), index=True)
     
     student = relationship("Student", back_populates="attendance")
 
+
+class AttendanceBitmap(Base):
+    """
+    Attendance of one student over one term, one bit per calendar day from
+    `start_date` (little-endian packed) per status. Rebuilt from `Attendance`
+    by the attendance write paths; see repositories.attendance_bitmaps.
+    """
+    __tablename__ = "attendance_bitmaps"
+    __table_args__ = (
+        Index("ix_attendance_bitmaps_term", "academic_year", "term"),
+    )
+    
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    academic_year = Column(String(20), primary_key=True)
+    term = Column(Integer, primary_key=True)
+    start_date = Column(Date, nullable=False)
+    days = Column(Integer, nullable=False)
+    present = Column(LargeBinary, nullable=False)
+    absent = Column(LargeBinary, nullable=False)
+    late = Column(LargeBinary, nullable=False)
+    excused = Column(LargeBinary, nullable=False)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
+
+
+class AbsenceAlert(Base):
+    """
+    Chronic absence alert sent to a parent about one child, written by
+    `jobs.absence_alerts`; also the cool-off log that keeps the job from
+    alerting the same parent again too soon.
+    """
+    __tablename__ = "absence_alerts"
+    __table_args__ = (
+        Index("ix_absence_alerts_parent_sent", "parent_id", "sent_at"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    parent_id = Column(Integer, ForeignKey("parents.id", ondelete="CASCADE"), nullable=False)
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), nullable=False)
+    missed_days = Column(Integer, nullable=False)
+    school_days = Column(Integer, nullable=False)
+    longest_streak = Column(Integer, nullable=False)
+    window_start = Column(Date, nullable=False)
+    as_of = Column(Date, nullable=False)
+    sent_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
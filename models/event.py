@@ -60,7 +60,7 @@ class Event(Base):
     
     # Timestamps
     created_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
-    updated_at = Column(DateTime(timezone=True), default=datetime.now(timezone.utc), onupdate=datetime.now(timezone.utc))
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Relationships
     creator = relationship("User", foreign_keys=[created_by])
@@ -77,6 +77,7 @@ class EventRSVP(Base):
     status = Column(SQLEnum(RSVPStatus), nullable=False, default=RSVPStatus.PENDING)
     response_date = Column(DateTime(timezone=True), default=datetime.now(timezone.utc))
     notes = Column(Text, nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     # Relationships
     event = relationship("Event", back_populates="rsvps")
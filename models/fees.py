@@ -2,12 +2,24 @@
 # ============================================================
 # models/fees.py
 # ============================================================
-from sqlalchemy import Column, Integer, Float, String, Date, Boolean, ForeignKey
+from sqlalchemy import Column, Integer, Float, String, Text, Date, DateTime, Boolean, ForeignKey, Enum as SQLEnum, Index, UniqueConstraint, text
 from sqlalchemy.orm import relationship
+from datetime import datetime, timezone
 from database import Base
+from utils.enums import GradeLevel
 
 class FeeRecord(Base):
     __tablename__ = "fee_records"
+    __table_args__ = (
+        # One record per student and plan item, so regenerating a plan is a no-op
+        Index("ix_fee_records_student_plan", "student_id", "fee_plan_id", unique=True),
+        # Unpaid fees only, in the (due_date, id) order /fees/overdue pages through
+        Index(
+            "ix_fee_records_unpaid_due", "due_date", "id",
+            postgresql_where=text("NOT is_paid"),
+            sqlite_where=text("NOT is_paid")
+        ),
+    )
     
     id = Column(Integer, primary_key=True, index=True)
     student_id = Column(Integer, ForeignKey("students.id"))
@@ -18,6 +30,47 @@ class FeeRecord(Base):
     is_paid = Column(Boolean, default=False)
     payment_method = Column(String)
     academic_year = Column(String, nullable=False)
+    fee_plan_id = Column(Integer, ForeignKey("fee_plans.id", ondelete="SET NULL"), nullable=True)
+    updated_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc), onupdate=lambda: datetime.now(timezone.utc))
     
     student = relationship("Student", back_populates="fees")
 
+class FeePlan(Base):
+    """
+    One fee (tuition, lunch, trip, ...) charged to every student of a grade
+    level in an academic year. `FeeRecord`s are generated from plans in bulk;
+    see repositories.fees.generate_plan_fees.
+    """
+    __tablename__ = "fee_plans"
+    __table_args__ = (
+        UniqueConstraint("grade_level", "academic_year", "fee_type", name="uq_fee_plans_level_year_type"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    grade_level = Column(SQLEnum(GradeLevel), nullable=False)
+    academic_year = Column(String, nullable=False)
+    fee_type = Column(String, nullable=False)
+    amount = Column(Float, nullable=False)
+    due_date = Column(Date, nullable=False)
+    created_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
+
+class FeePayment(Base):
+    """
+    One payment request (one or more fees) and the response it got. With an
+    Idempotency-Key the (user, key) pair is unique, so a retried request
+    replays `response` instead of paying again.
+    """
+    __tablename__ = "fee_payments"
+    __table_args__ = (
+        UniqueConstraint("user_id", "idempotency_key", name="uq_fee_payments_user_key"),
+    )
+    
+    id = Column(Integer, primary_key=True, index=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    idempotency_key = Column(String(255), nullable=True)
+    request_hash = Column(String(64), nullable=False)
+    payment_method = Column(String, nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), default=lambda: datetime.now(timezone.utc))
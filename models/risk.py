@@ -0,0 +1,26 @@
+# ============================================================
+# models/risk.py
+# ============================================================
+from sqlalchemy import Column, Integer, String, Float, DateTime, Date, ForeignKey
+from datetime import datetime, timezone
+from database import Base
+
+class StudentRiskScore(Base):
+    """
+    Early-warning score per student, rewritten in full by the nightly
+    `jobs.score_at_risk` run. `score` is 0-100; the other columns are the
+    inputs it was built from, so the dashboard can say why.
+    """
+    __tablename__ = "student_risk_scores"
+    
+    student_id = Column(Integer, ForeignKey("students.id", ondelete="CASCADE"), primary_key=True)
+    score = Column(Float, nullable=False, index=True)
+    level = Column(String(10), nullable=False)
+    absence_rate_short = Column(Float, nullable=False, default=0)
+    absence_rate_long = Column(Float, nullable=False, default=0)
+    unexcused_absences = Column(Integer, nullable=False, default=0)
+    late_count = Column(Integer, nullable=False, default=0)
+    average_percent = Column(Float, nullable=True)
+    grade_trend = Column(Float, nullable=True)
+    as_of = Column(Date, nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
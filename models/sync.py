@@ -0,0 +1,25 @@
+# ============================================================
+# models/sync.py
+# ============================================================
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime, timezone
+from database import Base
+
+class SyncChange(Base):
+    """
+    Append-only change log behind `/sync`. The primary key is the monotonic
+    change sequence clients use as their cursor; `op` is "upsert" or
+    "delete" (a tombstone for a row that no longer exists). The owner
+    columns are copied from the changed row so visibility can be checked
+    without joining back to it.
+    """
+    __tablename__ = "sync_changes"
+    
+    id = Column(Integer, primary_key=True)
+    entity = Column(String(32), nullable=False)
+    entity_id = Column(Integer, nullable=False)
+    op = Column(String(10), nullable=False)
+    student_id = Column(Integer, nullable=True, index=True)
+    user_id = Column(Integer, nullable=True, index=True)
+    teacher_id = Column(Integer, nullable=True, index=True)
+    changed_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,18 @@
+# ============================================================
+# models/version.py
+# ============================================================
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime, timezone
+from database import Base
+
+class ResourceVersion(Base):
+    """
+    Change counter per resource name (e.g. "events", "grades:42"). Write paths
+    bump it in the same transaction; read paths use it to build ETag and
+    Last-Modified validators without touching the underlying tables.
+    """
+    __tablename__ = "resource_versions"
+    
+    name = Column(String, primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc))
@@ -0,0 +1,57 @@
+# repositories/absence_excuses.py
+
+from datetime import date, timedelta
+from typing import List
+
+from sqlalchemy import and_, func, literal_column
+from sqlalchemy.orm import Session
+
+from models import User, Student, Class, AbsenceExcuse, ExcuseStatus
+
+
+def _is_postgres(db: Session) -> bool:
+    return db.get_bind().dialect.name == "postgresql"
+
+
+def covers_date(db: Session, day: date):
+    """
+    Filter for excuses whose period includes `day`. On Postgres this is
+    `daterange(start_date, end_date, '[]') @> day`, which the GiST index
+    ix_absence_excuses_period answers; elsewhere a plain range predicate.
+    """
+    if _is_postgres(db):
+        period = func.daterange(AbsenceExcuse.start_date, AbsenceExcuse.end_date, literal_column("'[]'"))
+        return period.op("@>")(day)
+    return and_(AbsenceExcuse.start_date <= day, AbsenceExcuse.end_date >= day)
+
+
+def find_overlapping(db: Session, student_id: int, start: date, end: date, touching: bool = False) -> List[AbsenceExcuse]:
+    """
+    A student's pending or approved excuses overlapping [start, end] (both
+    inclusive), via ix_absence_excuses_student_range. With `touching`,
+    excuses ending the day before or starting the day after count too.
+    """
+    slack = timedelta(days=1 if touching else 0)
+    return db.query(AbsenceExcuse).filter(
+        AbsenceExcuse.student_id == student_id,
+        AbsenceExcuse.start_date <= end + slack,
+        AbsenceExcuse.end_date >= start - slack,
+        AbsenceExcuse.status.in_([ExcuseStatus.PENDING, ExcuseStatus.APPROVED])
+    ).order_by(AbsenceExcuse.start_date, AbsenceExcuse.id).all()
+
+
+def get_active_excuses(db: Session, day: date, include_pending: bool = False):
+    """Excuses covering `day` across the school, with student and class names, in one query."""
+    statuses = [ExcuseStatus.APPROVED, ExcuseStatus.PENDING] if include_pending else [ExcuseStatus.APPROVED]
+    return db.query(
+        AbsenceExcuse,
+        User.firstName,
+        User.lastName,
+        Class.id.label("class_id"),
+        Class.name.label("class_name")
+    ).join(Student, Student.id == AbsenceExcuse.student_id)\
+        .join(User, User.id == Student.user_id)\
+        .outerjoin(Class, Class.id == Student.class_id)\
+        .filter(covers_date(db, day), AbsenceExcuse.status.in_(statuses))\
+        .order_by(Class.name, User.lastName, User.firstName)\
+        .all()
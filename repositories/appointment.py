@@ -1,14 +1,36 @@
 # repositories/appointment.py
 
+from collections import defaultdict
+from sqlalchemy import insert, update
 from sqlalchemy.orm import Session
-from datetime import datetime
+from datetime import date, datetime, timedelta
 from typing import Optional
+from zoneinfo import ZoneInfo
+
+from config import SCHOOL_TIMEZONE
 
 # Import your SQLAlchemy models
-from models import TeacherAvailability, Appointment, MeetingSummary, AppointmentStatus
+from models import (
+    TeacherAvailability, Appointment, MeetingSummary, AppointmentStatus,
+    ConferencePreference, Event, EventType, Role, RoleUser
+)
 
 # Import your Pydantic schemas
-from schemas import TeacherAvailabilityCreate, AppointmentCreate, MeetingSummaryCreate
+from schemas import (
+    TeacherAvailabilityCreate, AppointmentCreate, MeetingSummaryCreate,
+    RecurringAvailabilityCreate, ConferencePreferenceCreate
+)
+from services.conference_scheduler import schedule_conferences
+from repositories.sync import record_bulk_changes
+from services.event_bus import event_bus
+from utils.enums import RoleType
+from utils.intervals import IntervalIndex
+
+MAX_GENERATED_SLOTS = 10000
+
+
+class SchedulingConflict(Exception):
+    """Slots picked by the conference scheduler were booked by someone else meanwhile."""
 
 
 # -------------------------------
@@ -28,6 +50,80 @@ def create_availability(db: Session, teacher_id: int, data: TeacherAvailabilityC
     return availability
 
 
+def _naive(value: datetime) -> datetime:
+    # Availabilities are stored as naive school-local times; events are
+    # timezone-aware, so convert to the school's zone before dropping tzinfo.
+    return value.astimezone(ZoneInfo(SCHOOL_TIMEZONE)).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _expand_pattern(data: RecurringAvailabilityCreate):
+    step = timedelta(minutes=data.slot_minutes)
+    day = data.start_date
+    while day <= data.end_date:
+        if day.weekday() in data.weekdays:
+            slot_start = datetime.combine(day, data.start_time)
+            window_end = datetime.combine(day, data.end_time)
+            while slot_start + step <= window_end:
+                yield day, slot_start, slot_start + step
+                slot_start += step
+        day += timedelta(days=1)
+
+
+def generate_availabilities(db: Session, teacher_id: int, data: RecurringAvailabilityCreate):
+    range_start = datetime.combine(data.start_date, data.start_time)
+    range_end = datetime.combine(data.end_date, data.end_time)
+
+    existing = IntervalIndex(
+        db.query(TeacherAvailability.start_time, TeacherAvailability.end_time).filter(
+            TeacherAvailability.teacher_id == teacher_id,
+            TeacherAvailability.start_time < range_end,
+            TeacherAvailability.end_time > range_start
+        ).all()
+    )
+
+    holidays = IntervalIndex()
+    if data.skip_holidays:
+        # A day of slack on both sides covers the UTC offset; the exact
+        # overlap is checked in local time below
+        holidays = IntervalIndex(
+            (_naive(start), _naive(end)) for start, end in db.query(Event.start_date, Event.end_date).filter(
+                Event.event_type == EventType.HOLIDAY,
+                Event.is_cancelled == False,
+                Event.start_date < range_end + timedelta(days=1),
+                Event.end_date > range_start - timedelta(days=1)
+            ).all()
+        )
+
+    rows = []
+    skipped_existing = 0
+    skipped_holidays = 0
+    for day, slot_start, slot_end in _expand_pattern(data):
+        if holidays.overlaps(slot_start, slot_end):
+            skipped_holidays += 1
+        elif existing.overlaps(slot_start, slot_end):
+            skipped_existing += 1
+        else:
+            rows.append({
+                "teacher_id": teacher_id,
+                "date": datetime.combine(day, datetime.min.time()),
+                "start_time": slot_start,
+                "end_time": slot_end,
+                "is_booked": False
+            })
+        if len(rows) > MAX_GENERATED_SLOTS:
+            raise ValueError(f"Pattern expands to more than {MAX_GENERATED_SLOTS} slots")
+
+    if rows:
+        db.execute(insert(TeacherAvailability), rows)
+        db.commit()
+
+    return {
+        "created_count": len(rows),
+        "skipped_existing": skipped_existing,
+        "skipped_holidays": skipped_holidays
+    }
+
+
 def get_teacher_availabilities(db: Session, teacher_id: int):
     return db.query(TeacherAvailability).filter(TeacherAvailability.teacher_id == teacher_id).all()
 
@@ -67,6 +163,14 @@ def get_teacher_appointments(db: Session, teacher_id: int):
     ).all()
 
 
+def _publish_confirmed(appointments):
+    for appointment_id, parent_id, availability_id in appointments:
+        event_bus.publish("appointment.confirmed", {
+            "appointment_id": appointment_id,
+            "availability_id": availability_id
+        }, user_ids=[parent_id])
+
+
 def update_appointment_status(db: Session, appointment_id: int, status: AppointmentStatus):
     appointment = db.query(Appointment).filter(Appointment.id == appointment_id).first()
     if not appointment:
@@ -74,6 +178,8 @@ def update_appointment_status(db: Session, appointment_id: int, status: Appointm
     appointment.status = status
     db.commit()
     db.refresh(appointment)
+    if status == AppointmentStatus.CONFIRMED:
+        _publish_confirmed([(appointment.id, appointment.parent_id, appointment.availability_id)])
     return appointment
 
 
@@ -83,9 +189,123 @@ def confirm_appointment(db, appointment_id: int):
         appointment.status = AppointmentStatus.CONFIRMED
         db.commit()
         db.refresh(appointment)
+        _publish_confirmed([(appointment.id, appointment.parent_id, appointment.availability_id)])
     return appointment
 
 
+# -------------------------------
+# Parent-Teacher Conference Scheduling
+# -------------------------------
+def save_conference_preferences(db: Session, parent_id: int, data: ConferencePreferenceCreate):
+    teacher_ids = list(dict.fromkeys(data.teacher_ids))
+    teachers = {user_id for user_id, in db.query(RoleUser.user_id).join(Role, Role.id == RoleUser.role_id).filter(
+        Role.name == RoleType.TEACHER,
+        RoleUser.user_id.in_(teacher_ids)
+    )}
+    unknown = [teacher_id for teacher_id in teacher_ids if teacher_id not in teachers]
+    if unknown:
+        raise ValueError(f"Unknown teachers: {unknown}")
+
+    db.query(ConferencePreference).filter(
+        ConferencePreference.parent_id == parent_id,
+        ConferencePreference.conference_date == data.conference_date,
+        ConferencePreference.is_scheduled == False
+    ).delete(synchronize_session=False)
+
+    db.execute(insert(ConferencePreference), [{
+        "parent_id": parent_id,
+        "teacher_id": teacher_id,
+        "conference_date": data.conference_date,
+        "is_scheduled": False
+    } for teacher_id in teacher_ids])
+    db.commit()
+    return {"conference_date": data.conference_date, "teacher_ids": teacher_ids}
+
+
+def schedule_conference_day(db: Session, conference_date: date, dry_run: bool = False):
+    day_start = datetime.combine(conference_date, datetime.min.time())
+    day_end = day_start + timedelta(days=1)
+
+    preference_rows = db.query(
+        ConferencePreference.id, ConferencePreference.parent_id, ConferencePreference.teacher_id
+    ).filter(
+        ConferencePreference.conference_date == conference_date,
+        ConferencePreference.is_scheduled == False
+    ).all()
+
+    preferences = defaultdict(list)
+    preference_ids = {}
+    for preference_id, parent_id, teacher_id in preference_rows:
+        preferences[parent_id].append(teacher_id)
+        preference_ids[(parent_id, teacher_id)] = preference_id
+
+    teacher_ids = {teacher_id for _, _, teacher_id in preference_rows}
+    slots = db.query(
+        TeacherAvailability.id, TeacherAvailability.teacher_id,
+        TeacherAvailability.start_time, TeacherAvailability.end_time
+    ).filter(
+        TeacherAvailability.teacher_id.in_(teacher_ids),
+        TeacherAvailability.is_booked == False,
+        TeacherAvailability.start_time >= day_start,
+        TeacherAvailability.start_time < day_end
+    ).all() if teacher_ids else []
+
+    busy = defaultdict(list)
+    if preferences:
+        booked = db.query(
+            Appointment.parent_id, TeacherAvailability.start_time, TeacherAvailability.end_time
+        ).join(TeacherAvailability, Appointment.availability_id == TeacherAvailability.id).filter(
+            Appointment.parent_id.in_(list(preferences)),
+            Appointment.status.in_([AppointmentStatus.PENDING, AppointmentStatus.CONFIRMED]),
+            TeacherAvailability.start_time >= day_start,
+            TeacherAvailability.start_time < day_end
+        ).all()
+        for parent_id, start, end in booked:
+            busy[parent_id].append((start, end))
+
+    assignments, unscheduled = schedule_conferences(
+        [tuple(slot) for slot in slots], dict(preferences), busy
+    )
+
+    if assignments and not dry_run:
+        slot_teacher = {slot.id: slot.teacher_id for slot in slots}
+        availability_ids = [availability_id for _, availability_id in assignments]
+        result = db.execute(
+            update(TeacherAvailability)
+            .where(TeacherAvailability.id.in_(availability_ids), TeacherAvailability.is_booked == False)
+            .values(is_booked=True)
+        )
+        if result.rowcount != len(availability_ids):
+            db.rollback()
+            raise SchedulingConflict("Some slots were booked while scheduling; please run the scheduler again")
+
+        created = db.execute(insert(Appointment).returning(
+            Appointment.id, Appointment.parent_id, Appointment.availability_id
+        ), [{
+            "parent_id": parent_id,
+            "availability_id": availability_id,
+            "status": AppointmentStatus.CONFIRMED,
+            "reason": "Parent-teacher conference"
+        } for parent_id, availability_id in assignments]).all()
+        record_bulk_changes(db, "appointments", created)
+        db.execute(
+            update(ConferencePreference)
+            .where(ConferencePreference.id.in_([
+                preference_ids[(parent_id, slot_teacher[availability_id])]
+                for parent_id, availability_id in assignments
+            ]))
+            .values(is_scheduled=True)
+        )
+        db.commit()
+        _publish_confirmed(created)
+
+    return {
+        "families": len(preferences),
+        "scheduled_count": len(assignments),
+        "unscheduled": [{"parent_id": p, "teacher_id": t} for p, t in unscheduled]
+    }
+
+
 # -------------------------------
 # Meeting Summary CRUD
 # -------------------------------
@@ -0,0 +1,224 @@
+# repositories/attendance.py
+
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import Date, Integer, case, cast, func, select, update
+from sqlalchemy.orm import Session
+
+from models import Attendance, AbsenceExcuse, ExcuseStatus, Student, Class
+from repositories.sync import record_bulk_changes
+from repositories.attendance_bitmaps import sync_bitmaps
+from utils.enums import AttendanceStatus
+from utils.response_cache import response_cache
+
+TREND_GRANULARITIES = ("day", "week", "month", "weekday")
+TREND_GROUPS = ("none", "class", "grade_level")
+TREND_METRICS = ("total", "present", "absent", "late", "excused", "attendance_rate", "absence_rate")
+
+
+def attendance_month_tag(day: date) -> str:
+    return f"attendance:{day:%Y-%m}"
+
+
+def attendance_month_tags(start: date, end: date) -> List[str]:
+    """Cache tags for every calendar month touched by [start, end]."""
+    tags = []
+    year, month = start.year, start.month
+    while (year, month) <= (end.year, end.month):
+        tags.append(f"attendance:{year:04d}-{month:02d}")
+        year, month = (year + 1, 1) if month == 12 else (year, month + 1)
+    return tags
+
+
+def invalidate_attendance(days: Iterable[date]):
+    """Drop cached aggregates for the months these attendance dates fall in."""
+    tags = {attendance_month_tag(day) for day in days if day}
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+def _covering_excuses():
+    """Ids of the approved excuses covering the attendance row of the enclosing UPDATE."""
+    return select(AbsenceExcuse.id).where(
+        AbsenceExcuse.student_id == Attendance.student_id,
+        AbsenceExcuse.status == ExcuseStatus.APPROVED,
+        Attendance.date.between(AbsenceExcuse.start_date, AbsenceExcuse.end_date)
+    )
+
+
+def reconcile_excused_absences(db: Session, excuse_ids: Optional[Iterable[int]] = None) -> Tuple[dict, List[date]]:
+    """
+    Mark every ABSENT attendance row that falls inside an approved excuse as
+    EXCUSED, in one UPDATE, and link it to the excuse in
+    `excused_by_excuse_id`. Limited to `excuse_ids` when given (the approval
+    path), otherwise a sweep over all approved excuses. Idempotent.
+    Returns the counts and the changed dates; the caller commits, then
+    passes the dates to `invalidate_attendance`.
+    """
+    covering = _covering_excuses()
+    if excuse_ids is not None:
+        covering = covering.where(AbsenceExcuse.id.in_(list(excuse_ids)))
+
+    rows = db.execute(
+        update(Attendance)
+        .where(Attendance.status == AttendanceStatus.ABSENT, covering.exists())
+        .values(
+            status=AttendanceStatus.EXCUSED,
+            excused_by_excuse_id=covering.order_by(AbsenceExcuse.id).limit(1).scalar_subquery(),
+            updated_at=datetime.now(timezone.utc)
+        )
+        .returning(Attendance.id, Attendance.student_id, Attendance.date)
+        .execution_options(synchronize_session=False)
+    ).all()
+    # Core UPDATE bypasses the flush hook that feeds /sync
+    record_bulk_changes(db, "attendance", rows)
+    sync_bitmaps(db, ((row.student_id, row.date) for row in rows))
+
+    return {
+        "excused_records": len(rows),
+        "students": len({row.student_id for row in rows})
+    }, sorted({row.date for row in rows})
+
+
+def revert_excused_absences(db: Session, excuse_ids: Iterable[int]) -> Tuple[dict, List[date]]:
+    """
+    Reverse of `reconcile_excused_absences` for excuses that stopped being
+    approved (rejected, reset or about to be deleted): the EXCUSED rows
+    reconciliation linked to them go back to ABSENT, unless another approved
+    excuse still covers the day, in which case they are linked to that one.
+    Rows recorded as EXCUSED by a teacher carry no link and are left alone.
+    Two UPDATEs. Returns the counts and the reverted dates; the caller
+    commits, then passes the dates to `invalidate_attendance`.
+    """
+    excuse_ids = list(excuse_ids)
+    if not excuse_ids:
+        return {"reverted_records": 0, "students": 0}, []
+
+    now = datetime.now(timezone.utc)
+    linked = (Attendance.excused_by_excuse_id.in_(excuse_ids), Attendance.status == AttendanceStatus.EXCUSED)
+    other = _covering_excuses().where(AbsenceExcuse.id.notin_(excuse_ids))
+    relinked = db.execute(
+        update(Attendance)
+        .where(*linked, other.exists())
+        .values(excused_by_excuse_id=other.order_by(AbsenceExcuse.id).limit(1).scalar_subquery(), updated_at=now)
+        .returning(Attendance.id, Attendance.student_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    rows = db.execute(
+        update(Attendance)
+        .where(*linked)
+        .values(status=AttendanceStatus.ABSENT, excused_by_excuse_id=None, updated_at=now)
+        .returning(Attendance.id, Attendance.student_id, Attendance.date)
+        .execution_options(synchronize_session=False)
+    ).all()
+    # Core UPDATE bypasses the flush hook that feeds /sync
+    record_bulk_changes(db, "attendance", [*relinked, *rows])
+    sync_bitmaps(db, ((row.student_id, row.date) for row in rows))
+
+    return {
+        "reverted_records": len(rows),
+        "students": len({row.student_id for row in rows})
+    }, sorted({row.date for row in rows})
+
+
+def _bucket(db: Session, granularity: str):
+    """Bucket start date (or ISO weekday 1-7) of Attendance.date, computed in the database."""
+    if db.get_bind().dialect.name == "postgresql":
+        if granularity == "weekday":
+            return cast(func.extract("isodow", Attendance.date), Integer)
+        if granularity == "day":
+            return Attendance.date
+        return cast(func.date_trunc(granularity, Attendance.date), Date)
+    # SQLite
+    if granularity == "weekday":
+        return (cast(func.strftime("%w", Attendance.date), Integer) + 6) % 7 + 1
+    if granularity == "week":
+        return func.date(Attendance.date, "weekday 0", "-6 days")
+    if granularity == "month":
+        return func.strftime("%Y-%m-01", Attendance.date)
+    return Attendance.date
+
+
+def attendance_trend(
+    db: Session,
+    granularity: str,
+    date_from: date,
+    date_to: date,
+    group_by: str = "none",
+    class_id: Optional[int] = None,
+    metrics: Iterable[str] = TREND_METRICS
+) -> dict:
+    """
+    Attendance counts and rates per time bucket (and per class or grade
+    level), aggregated by one GROUP BY in the database. Column-oriented:
+    `buckets` is the x axis and each series holds one list per metric.
+    """
+    def count(status):
+        return func.sum(case((Attendance.status == status, 1), else_=0))
+
+    bucket = _bucket(db, granularity).label("bucket")
+    if group_by == "class":
+        group = Student.class_id
+    elif group_by == "grade_level":
+        group = Student.grade_level
+    else:
+        group = None
+
+    columns = [
+        bucket,
+        func.count(Attendance.id).label("total"),
+        count(AttendanceStatus.PRESENT).label("present"),
+        count(AttendanceStatus.ABSENT).label("absent"),
+        count(AttendanceStatus.LATE).label("late"),
+        count(AttendanceStatus.EXCUSED).label("excused"),
+    ]
+    query = db.query(*columns, *([group.label("group_key")] if group is not None else []))\
+        .filter(Attendance.date.between(date_from, date_to))
+    if group is not None or class_id:
+        query = query.join(Student, Student.id == Attendance.student_id)
+    if class_id:
+        query = query.filter(Student.class_id == class_id)
+    group_columns = [bucket] + ([group] if group is not None else [])
+    rows = query.group_by(*group_columns).order_by(*group_columns).all()
+
+    buckets = sorted({str(row.bucket) for row in rows}, key=lambda b: (len(b), b))
+    position = {b: i for i, b in enumerate(buckets)}
+    metrics = [m for m in metrics if m in TREND_METRICS]
+
+    labels = {}
+    if group_by == "class":
+        class_ids = {row.group_key for row in rows if row.group_key is not None}
+        labels = dict(db.query(Class.id, Class.name).filter(Class.id.in_(class_ids)).all()) if class_ids else {}
+
+    series = {}
+    for row in rows:
+        key = getattr(row, "group_key", None)
+        key = key.value if hasattr(key, "value") else key
+        if key not in series:
+            series[key] = {
+                "key": key,
+                "label": labels.get(key, key) if group_by == "class" else (key or "all"),
+                **{metric: [None] * len(buckets) for metric in metrics}
+            }
+        i = position[str(row.bucket)]
+        values = {
+            "total": row.total,
+            "present": row.present,
+            "absent": row.absent,
+            "late": row.late,
+            "excused": row.excused,
+            "attendance_rate": round((row.present + row.late) / row.total * 100, 2) if row.total else None,
+            "absence_rate": round((row.absent + row.excused) / row.total * 100, 2) if row.total else None,
+        }
+        for metric in metrics:
+            series[key][metric][i] = values[metric]
+
+    return {
+        "granularity": granularity,
+        "group_by": group_by,
+        "date_from": date_from.isoformat(),
+        "date_to": date_to.isoformat(),
+        "buckets": [int(b) if granularity == "weekday" else b for b in buckets],
+        "series": list(series.values())
+    }
@@ -0,0 +1,162 @@
+# repositories/attendance_bitmaps.py
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import Attendance, AttendanceBitmap, Student
+from utils.enums import AttendanceStatus
+from utils.grading import term_bounds, term_of
+
+STATUSES = tuple(status.value for status in AttendanceStatus)
+UPSERT_CHUNK = 1000  # rows per INSERT, well below the bind parameter limits
+
+
+def _pack(bits: np.ndarray) -> bytes:
+    return np.packbits(bits, bitorder="little").tobytes()
+
+
+def _unpack(blobs, days: int) -> np.ndarray:
+    """Stack packed bitmaps of one term into a (students, days) boolean matrix."""
+    if not blobs:
+        return np.zeros((0, days), dtype=bool)
+    packed = np.frombuffer(b"".join(blobs), dtype=np.uint8).reshape(len(blobs), -1)
+    return np.unpackbits(packed, axis=1, count=days, bitorder="little").astype(bool)
+
+
+def rebuild_bitmaps(db: Session, academic_year: str, term: int, student_ids: Optional[Iterable[int]] = None) -> int:
+    """
+    Rewrite the bitmaps of one term from `Attendance`, for the given students
+    or everyone. One query and one bulk upsert; the caller commits. Returns
+    the number of bitmaps written.
+
+    For given students the student rows are locked first (FOR UPDATE, in id
+    order), so two transactions rebuilding the same student run one after
+    the other and the second reads the first one's attendance.
+    """
+    start, end = term_bounds(academic_year, term)
+    days = (end - start).days + 1
+
+    query = db.query(Attendance.student_id, Attendance.date, Attendance.status)\
+        .filter(Attendance.date.between(start, end), Attendance.student_id.isnot(None))
+    stale = delete(AttendanceBitmap).where(AttendanceBitmap.academic_year == academic_year, AttendanceBitmap.term == term)
+    if student_ids is not None:
+        student_ids = sorted(set(student_ids))
+        if not student_ids:
+            return 0
+        db.query(Student.id).filter(Student.id.in_(student_ids)).order_by(Student.id).with_for_update().all()
+        query = query.filter(Attendance.student_id.in_(student_ids))
+        stale = stale.where(AttendanceBitmap.student_id.in_(student_ids))
+
+    bits = defaultdict(lambda: np.zeros((len(STATUSES), days), dtype=bool))
+    status_index = {status: i for i, status in enumerate(STATUSES)}
+    for student_id, day, status in query:
+        bits[student_id][status_index[status.value], (day - start).days] = True
+
+    now = datetime.now(timezone.utc)
+    rows = [{
+        "student_id": student_id,
+        "academic_year": academic_year,
+        "term": term,
+        "start_date": start,
+        "days": days,
+        **{status: _pack(matrix[i]) for i, status in enumerate(STATUSES)},
+        "updated_at": now
+    } for student_id, matrix in sorted(bits.items())]
+
+    # Students left without attendance in the term lose their bitmap
+    db.execute(stale.where(AttendanceBitmap.student_id.notin_(list(bits))) if bits else stale)
+    for i in range(0, len(rows), UPSERT_CHUNK):
+        _upsert(db, rows[i:i + UPSERT_CHUNK])
+    return len(rows)
+
+
+def _upsert(db: Session, rows):
+    dialect = db.get_bind().dialect.name
+    if dialect not in ("postgresql", "sqlite"):
+        db.execute(delete(AttendanceBitmap).where(
+            AttendanceBitmap.academic_year == rows[0]["academic_year"],
+            AttendanceBitmap.term == rows[0]["term"],
+            AttendanceBitmap.student_id.in_([row["student_id"] for row in rows])
+        ))
+        db.execute(insert(AttendanceBitmap), rows)
+        return
+    stmt = (postgresql if dialect == "postgresql" else sqlite).insert(AttendanceBitmap).values(rows)
+    db.execute(stmt.on_conflict_do_update(
+        index_elements=[AttendanceBitmap.student_id, AttendanceBitmap.academic_year, AttendanceBitmap.term],
+        set_={column: stmt.excluded[column] for column in ("start_date", "days", *STATUSES, "updated_at")}
+    ))
+
+
+def sync_bitmaps(db: Session, changes: Iterable[Tuple[int, date]]):
+    """Rebuild the bitmaps touched by attendance writes, given (student_id, date) pairs."""
+    students_by_term = defaultdict(set)
+    for student_id, day in changes:
+        if student_id is not None and day is not None:
+            students_by_term[term_of(day)].add(student_id)
+    for (academic_year, term), student_ids in students_by_term.items():
+        rebuild_bitmaps(db, academic_year, term, student_ids)
+
+
+def load_bitmaps(
+    db: Session,
+    academic_year: str,
+    term: int,
+    class_id: Optional[int] = None,
+    until: Optional[date] = None
+) -> Tuple[np.ndarray, Dict[str, np.ndarray]]:
+    """
+    Student ids (sorted) and one (students, days) boolean matrix per status
+    for a term, optionally limited to a class and to the days up to `until`.
+    """
+    start, end = term_bounds(academic_year, term)
+    term_days = (end - start).days + 1
+    query = db.query(AttendanceBitmap)\
+        .filter(AttendanceBitmap.academic_year == academic_year, AttendanceBitmap.term == term)
+    if class_id:
+        query = query.join(Student, Student.id == AttendanceBitmap.student_id).filter(Student.class_id == class_id)
+    bitmaps = query.order_by(AttendanceBitmap.student_id).all()
+
+    days = term_days if until is None else max(0, min(term_days, (until - start).days + 1))
+    student_ids = np.array([b.student_id for b in bitmaps], dtype=np.int64)
+    matrices = {status: _unpack([getattr(b, status) for b in bitmaps], term_days)[:, :days] for status in STATUSES}
+    return student_ids, matrices
+
+
+def _streaks(hit: np.ndarray, recorded: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Longest and current (trailing) run of `hit` per row, counted over
+    recorded days only: days without a record (weekends, holidays) neither
+    extend nor break a run.
+    """
+    if not hit.shape[1]:
+        zeros = np.zeros(hit.shape[0], dtype=np.int64)
+        return zeros, zeros
+    hits = np.cumsum(hit & recorded, axis=1)
+    # hits is non-decreasing, so a running maximum carries the count at the last break forward
+    at_break = np.maximum.accumulate(np.where(recorded & ~hit, hits, 0), axis=1)
+    runs = hits - at_break
+    return runs.max(axis=1), runs[:, -1]
+
+
+def summarize(matrices: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    """Per-student counts, rates and absence streaks from `load_bitmaps` matrices."""
+    present, absent, late, excused = (matrices[status] for status in STATUSES)
+    recorded = present | absent | late | excused
+    missed = absent | excused
+    school_days = recorded.sum(axis=1)
+    longest, current = _streaks(missed, recorded)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        attendance_rate = np.round((present | late).sum(axis=1) / school_days * 100, 1)
+    return {
+        "school_days": school_days,
+        **{status: matrices[status].sum(axis=1) for status in STATUSES},
+        "attendance_rate": attendance_rate,
+        "longest_absence_streak": longest,
+        "current_absence_streak": current,
+    }
@@ -0,0 +1,246 @@
+# repositories/fees.py
+
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, exists, false, func, insert, literal, not_, select, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import User, Student, Parent, StudentParent, Class, FeeRecord, FeePlan
+from repositories.sync import record_bulk_changes
+from utils.enums import GradeLevel
+from utils.response_cache import response_cache
+
+
+def student_fees_tag(student_id: int) -> str:
+    return f"fees:student:{student_id}"
+
+
+def parent_statement_tag(parent_id: int) -> str:
+    return f"fees:parent:{parent_id}"
+
+
+def invalidate_fees(student_ids: Iterable[Optional[int]]):
+    """Drop cached statements of every family these students belong to."""
+    tags = {student_fees_tag(student_id) for student_id in student_ids if student_id is not None}
+    if tags:
+        response_cache.invalidate(*tags)
+
+
+def generate_plan_fees(db: Session, academic_year: str, grade_level: Optional[GradeLevel] = None) -> Tuple[dict, List[int]]:
+    """
+    Create the `FeeRecord`s of every fee plan of `academic_year` (optionally
+    one grade level) for all students of the plan's grade level, in one
+    INSERT ... SELECT from students joined to fee_plans. Students who
+    already have a record for a plan are skipped, so re-running only fills
+    in students added since; ON CONFLICT DO NOTHING on
+    ix_fee_records_student_plan skips the rows an overlapping run inserted
+    meanwhile. Returns the counts and the ids of the
+    students who got new records; the caller commits, then invalidates
+    their fees.
+    """
+    plans = select(FeePlan.id).where(FeePlan.academic_year == academic_year)
+    if grade_level is not None:
+        plans = plans.where(FeePlan.grade_level == grade_level)
+    plan_count = db.execute(select(func.count()).select_from(plans.subquery())).scalar()
+    if not plan_count:
+        return {"plans": 0, "created": 0, "existing": 0, "students": 0}, []
+
+    already_billed = exists().where(
+        FeeRecord.student_id == Student.id,
+        FeeRecord.fee_plan_id == FeePlan.id
+    )
+    matches = and_(Student.grade_level == FeePlan.grade_level, FeePlan.id.in_(plans))
+    eligible = db.execute(
+        select(func.count()).select_from(Student).join(FeePlan, matches)
+    ).scalar()
+
+    now = datetime.now(timezone.utc)
+    columns = ["student_id", "amount", "fee_type", "due_date", "is_paid", "academic_year", "fee_plan_id", "updated_at"]
+    source = select(
+        Student.id,
+        FeePlan.amount,
+        FeePlan.fee_type,
+        FeePlan.due_date,
+        false(),
+        FeePlan.academic_year,
+        FeePlan.id,
+        literal(now, FeeRecord.updated_at.type)
+    ).join(FeePlan, matches).where(~already_billed)
+
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = (postgresql if dialect == "postgresql" else sqlite).insert(FeeRecord).from_select(columns, source)\
+            .on_conflict_do_nothing(index_elements=[FeeRecord.student_id, FeeRecord.fee_plan_id])
+    else:
+        stmt = insert(FeeRecord).from_select(columns, source)
+    rows = db.execute(stmt.returning(FeeRecord.id, FeeRecord.student_id)).all()
+    # Core INSERT bypasses the flush hook that feeds /sync
+    record_bulk_changes(db, "fees", rows)
+
+    student_ids = sorted({row.student_id for row in rows})
+    return {
+        "plans": plan_count,
+        "created": len(rows),
+        "existing": eligible - len(rows),
+        "students": len(student_ids)
+    }, student_ids
+
+
+def pay_fees(db: Session, fee_ids: List[int], payment_method: str) -> dict:
+    """
+    Mark unpaid fees as paid with one conditional UPDATE ... WHERE NOT
+    is_paid RETURNING. Of two concurrent payments of the same fee, the
+    second waits on the row lock, then finds it paid and skips it, so a fee
+    is never paid twice. Fees missing from the result were already paid or
+    do not exist (or were deleted meanwhile). The caller commits.
+    """
+    fee_ids = sorted(set(fee_ids))
+    now = datetime.now(timezone.utc)
+    rows = db.execute(
+        update(FeeRecord)
+        .where(FeeRecord.id.in_(fee_ids), not_(FeeRecord.is_paid))
+        .values(is_paid=True, paid_date=now.date(), payment_method=payment_method, updated_at=now)
+        .returning(FeeRecord.id, FeeRecord.student_id, FeeRecord.amount)
+        .execution_options(synchronize_session=False)
+    ).all()
+    # Core UPDATE bypasses the flush hook that feeds /sync
+    record_bulk_changes(db, "fees", rows)
+
+    remaining = set(fee_ids) - {row.id for row in rows}
+    already_paid = {fee_id for fee_id, in db.query(FeeRecord.id).filter(FeeRecord.id.in_(remaining))} if remaining else set()
+    return {
+        "paid": [{"id": row.id, "student_id": row.student_id, "amount": row.amount} for row in sorted(rows)],
+        "amount": round(sum(row.amount for row in rows), 2),
+        "paid_date": now.date().isoformat(),
+        "already_paid": sorted(already_paid),
+        "not_found": sorted(remaining - already_paid)
+    }
+
+
+def overdue(as_of: date):
+    """Unpaid and due before `as_of`; matches the partial index ix_fee_records_unpaid_due."""
+    return and_(not_(FeeRecord.is_paid), FeeRecord.due_date < as_of)
+
+
+def encode_cursor(due_date: date, fee_id: int) -> str:
+    return f"{due_date.isoformat()}.{fee_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[date, int]:
+    try:
+        due_date, fee_id = cursor.split(".")
+        return date.fromisoformat(due_date), int(fee_id)
+    except ValueError:
+        raise ValueError("Invalid cursor")
+
+
+def get_overdue_fees(
+    db: Session,
+    as_of: date,
+    limit: int,
+    after: Optional[Tuple[date, int]] = None,
+    academic_year: Optional[str] = None,
+    class_id: Optional[int] = None
+) -> Tuple[List, Optional[str]]:
+    """
+    One page of overdue fees, oldest due first, with student and class
+    names. Keyset pagination on (due_date, id): each page is an index range
+    scan from the previous page's last row, however deep the listing goes.
+    Returns the rows and the cursor of the next page (None on the last).
+    """
+    query = db.query(
+        FeeRecord,
+        User.firstName,
+        User.lastName,
+        Class.name.label("class_name")
+    ).join(Student, Student.id == FeeRecord.student_id)\
+        .join(User, User.id == Student.user_id)\
+        .outerjoin(Class, Class.id == Student.class_id)\
+        .filter(overdue(as_of))
+    if after is not None:
+        query = query.filter(tuple_(FeeRecord.due_date, FeeRecord.id) > tuple_(*after))
+    if academic_year:
+        query = query.filter(FeeRecord.academic_year == academic_year)
+    if class_id:
+        query = query.filter(Student.class_id == class_id)
+
+    rows = query.order_by(FeeRecord.due_date, FeeRecord.id).limit(limit + 1).all()
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    last = rows[-1][0]
+    return rows, encode_cursor(last.due_date, last.id)
+
+
+def get_overdue_families(db: Session, as_of: date, limit: int, after_parent_id: int = 0) -> Tuple[List[dict], Optional[int]]:
+    """
+    Overdue fees grouped by parent through StudentParent, keyset-paginated
+    on parent id: one grouped query picks the page of parents and their
+    totals, one more loads their line items. A fee of a child with two
+    parents appears under both. Returns the families and the next cursor.
+    """
+    totals = db.query(
+        StudentParent.parent_id,
+        func.count(FeeRecord.id).label("fee_count"),
+        func.sum(FeeRecord.amount).label("amount_due"),
+        func.min(FeeRecord.due_date).label("oldest_due_date")
+    ).join(FeeRecord, FeeRecord.student_id == StudentParent.student_id)\
+        .filter(overdue(as_of), StudentParent.parent_id > after_parent_id)\
+        .group_by(StudentParent.parent_id)\
+        .order_by(StudentParent.parent_id)\
+        .limit(limit + 1)\
+        .all()
+    next_cursor = None
+    if len(totals) > limit:
+        totals = totals[:limit]
+        next_cursor = totals[-1].parent_id
+    if not totals:
+        return [], None
+
+    parent_ids = [row.parent_id for row in totals]
+    items = db.query(
+        StudentParent.parent_id,
+        FeeRecord,
+        User.firstName,
+        User.lastName
+    ).join(FeeRecord, FeeRecord.student_id == StudentParent.student_id)\
+        .join(Student, Student.id == StudentParent.student_id)\
+        .join(User, User.id == Student.user_id)\
+        .filter(overdue(as_of), StudentParent.parent_id.in_(parent_ids))\
+        .order_by(StudentParent.parent_id, FeeRecord.due_date, FeeRecord.id)\
+        .all()
+    parents = {
+        row.id: row for row in db.query(Parent.id, User.email, User.firstName, User.lastName)
+        .join(User, User.id == Parent.user_id)
+        .filter(Parent.id.in_(parent_ids))
+    }
+
+    fees = defaultdict(list)
+    for parent_id, fee, first_name, last_name in items:
+        fees[parent_id].append({
+            "fee_id": fee.id,
+            "student_id": fee.student_id,
+            "student_name": f"{first_name} {last_name}",
+            "fee_type": fee.fee_type,
+            "academic_year": fee.academic_year,
+            "amount": fee.amount,
+            "due_date": fee.due_date,
+            "days_overdue": (as_of - fee.due_date).days
+        })
+
+    families = []
+    for row in totals:
+        parent = parents.get(row.parent_id)
+        families.append({
+            "parent_id": row.parent_id,
+            "name": f"{parent.firstName} {parent.lastName}" if parent else None,
+            "email": parent.email if parent else None,
+            "fee_count": row.fee_count,
+            "amount_due": round(row.amount_due, 2),
+            "oldest_due_date": row.oldest_due_date,
+            "fees": fees[row.parent_id]
+        })
+    return families, next_cursor
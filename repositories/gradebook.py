@@ -0,0 +1,124 @@
+# repositories/gradebook.py
+
+from collections import namedtuple
+
+import numpy as np
+from sqlalchemy import and_
+from sqlalchemy.orm import Session
+
+from models import User, Student, Exam, Grade
+
+ExamAxis = namedtuple("ExamAxis", "id title exam_date max_score weight course_id")
+
+
+def _column(values: np.ndarray, decimals: int = 2) -> list:
+    """NumPy vector -> JSON list with NaN as null."""
+    rounded = np.round(values.astype(float), decimals)
+    return [None if np.isnan(v) else float(v) for v in rounded]
+
+
+def _nan_stat(fn: str, matrix: np.ndarray, axis: int) -> np.ndarray:
+    """Row/column mean, min or max ignoring NaN; NaN (not a warning) for empty slices."""
+    missing = np.isnan(matrix)
+    counts = np.sum(~missing, axis=axis)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        if fn == "mean":
+            result = np.where(missing, 0, matrix).sum(axis=axis) / counts
+        elif fn == "min":
+            result = np.where(missing, np.inf, matrix).min(axis=axis, initial=np.inf)
+        else:
+            result = np.where(missing, -np.inf, matrix).max(axis=axis, initial=-np.inf)
+    return np.where(counts > 0, result, np.nan)
+
+
+def build_gradebook(db: Session, class_id: int) -> dict:
+    """
+    Students x exams for a class as a column-oriented matrix: `scores[j][i]`
+    is student i's score on exam j (null if ungraded). One query pairs every
+    student with every exam of the class and outer-joins the grade; the
+    rows are pivoted in NumPy, with per-exam and per-student aggregates.
+    Only a class without students needs a second query, for the exam axis.
+    """
+    exam_columns = (Exam.id, Exam.title, Exam.exam_date, Exam.max_score, Exam.weight, Exam.course_id)
+    rows = db.query(
+        Student.id.label("student_id"), User.firstName, User.lastName,
+        *(column.label(f"exam_{column.key}") for column in exam_columns),
+        Grade.id.label("grade_id"), Grade.score, Grade.grade_value
+    ).join(User, User.id == Student.user_id)\
+        .outerjoin(Exam, Exam.class_id == class_id)\
+        .outerjoin(Grade, and_(Grade.student_id == Student.id, Grade.exam_id == Exam.id))\
+        .filter(Student.class_id == class_id)\
+        .order_by(User.lastName, User.firstName, Student.id, Exam.exam_date, Exam.id)\
+        .all()
+
+    student_index = {}
+    student_names = []
+    exams = {}
+    cells = []
+    for row in rows:
+        if row.student_id not in student_index:
+            student_index[row.student_id] = len(student_index)
+            student_names.append(f"{row.firstName} {row.lastName}")
+        if row.exam_id is None:
+            continue
+        # Every student is paired with the same exams, in exam order
+        exams.setdefault(row.exam_id, ExamAxis(*(getattr(row, f"exam_{column.key}") for column in exam_columns)))
+        if row.grade_id is not None:
+            cells.append((student_index[row.student_id], row.exam_id, row.score, row.grade_value))
+    exams = list(exams.values())
+    if not rows:
+        exams = [ExamAxis(*exam) for exam in db.query(*exam_columns)
+                 .filter(Exam.class_id == class_id)
+                 .order_by(Exam.exam_date, Exam.id)]
+    exam_ids = [exam.id for exam in exams]
+
+    exam_index = {exam_id: j for j, exam_id in enumerate(exam_ids)}
+    n_students, n_exams = len(student_index), len(exam_ids)
+    scores = np.full((n_exams, n_students), np.nan)
+    grade_values = np.zeros((n_exams, n_students), dtype=np.int8)
+    if cells:
+        i = np.fromiter((c[0] for c in cells), dtype=np.intp, count=len(cells))
+        j = np.fromiter((exam_index[c[1]] for c in cells), dtype=np.intp, count=len(cells))
+        scores[j, i] = np.fromiter((c[2] for c in cells), dtype=float, count=len(cells))
+        grade_values[j, i] = [int(c[3]) if c[3] and c[3].isdigit() else 0 for c in cells]
+
+    max_scores = np.array([exam.max_score or np.nan for exam in exams], dtype=float)
+    weights = np.array([exam.weight or 1.0 for exam in exams], dtype=float)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        percents = scores / max_scores[:, None] * 100
+
+    graded = ~np.isnan(percents)
+    weight_matrix = np.where(graded, weights[:, None], 0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        weighted = (np.where(graded, percents, 0) * weight_matrix).sum(axis=0) / weight_matrix.sum(axis=0)
+
+    return {
+        "class_id": class_id,
+        "students": {
+            "id": list(student_index),
+            "name": student_names
+        },
+        "exams": {
+            "id": exam_ids,
+            "title": [exam.title for exam in exams],
+            "exam_date": [exam.exam_date.isoformat() for exam in exams],
+            "course_id": [exam.course_id for exam in exams],
+            "max_score": _column(max_scores),
+            "weight": _column(weights)
+        },
+        "scores": [_column(column) for column in scores],
+        # German grade 1-6 per cell, null where ungraded
+        "grade_values": [[int(v) if v else None for v in column] for column in grade_values.tolist()],
+        "exam_stats": {
+            "graded": np.sum(graded, axis=1).tolist(),
+            "mean": _column(_nan_stat("mean", scores, axis=1)),
+            "min": _column(_nan_stat("min", scores, axis=1)),
+            "max": _column(_nan_stat("max", scores, axis=1)),
+            "mean_percent": _column(_nan_stat("mean", percents, axis=1))
+        },
+        "student_stats": {
+            "graded": np.sum(graded, axis=0).tolist(),
+            "mean_percent": _column(_nan_stat("mean", percents, axis=0)),
+            "weighted_percent": _column(weighted)
+        }
+    }
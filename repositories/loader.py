@@ -0,0 +1,64 @@
+# repositories/loader.py
+
+from collections import defaultdict
+from fastapi import Depends
+from sqlalchemy.orm import Session
+from typing import Dict, Iterable, List, Optional
+
+from database import get_db
+from models import User
+
+
+class DataLoader:
+    """
+    Request-scoped batching loader (DataLoader pattern) for any model keyed
+    by `id` -- in practice User, Student, Parent, Teacher and Class.
+
+    Handlers first declare the keys they will need with `want()`, then read
+    them with `load()`. The first read of a model fetches every pending key
+    for it with a single `IN` query; results (including misses) are memoized
+    for the rest of the request.
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+        self._cache: Dict[type, Dict[int, object]] = defaultdict(dict)
+        self._pending: Dict[type, set] = defaultdict(set)
+
+    def want(self, model, keys: Iterable[Optional[int]]) -> "DataLoader":
+        cache = self._cache[model]
+        self._pending[model].update(k for k in keys if k is not None and k not in cache)
+        return self
+
+    def flush(self, model) -> None:
+        keys = self._pending.pop(model, None)
+        if not keys:
+            return
+        cache = self._cache[model]
+        for row in self.db.query(model).filter(model.id.in_(keys)).all():
+            cache[row.id] = row
+        for key in keys:
+            cache.setdefault(key, None)
+
+    def load(self, model, key: Optional[int]):
+        if key is None:
+            return None
+        cache = self._cache[model]
+        if key not in cache:
+            self._pending[model].add(key)
+            self.flush(model)
+        return cache[key]
+
+    def load_many(self, model, keys: Iterable[Optional[int]]) -> List[object]:
+        keys = list(keys)
+        self.want(model, keys)
+        self.flush(model)
+        return [self.load(model, key) for key in keys]
+
+    def full_name(self, user_id: Optional[int]) -> Optional[str]:
+        user = self.load(User, user_id)
+        return f"{user.firstName} {user.lastName}" if user else None
+
+
+def get_loader(db: Session = Depends(get_db)) -> DataLoader:
+    return DataLoader(db)
@@ -0,0 +1,164 @@
+# repositories/parent_overview.py
+
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import func, or_
+from sqlalchemy.orm import Session
+
+from models import (
+    User, Parent, Student, StudentParent, Grade, Course, Attendance, FeeRecord,
+    AbsenceExcuse, ExcuseStatus, Event, EventAudience
+)
+from utils.enums import AttendanceStatus
+
+
+def _value(enum_or_str):
+    return enum_or_str.value if hasattr(enum_or_str, 'value') else enum_or_str
+
+
+def build_parent_overview(
+    db: Session,
+    parent: Parent,
+    user: User,
+    grades_per_child: int = 5,
+    attendance_days: int = 30,
+    events_limit: int = 20
+) -> dict:
+    """
+    Everything the parent home screen needs, in a fixed number of queries:
+    children, recent grades, attendance tallies, open fees, pending excuses
+    and upcoming events targeted at the children's grade levels.
+    """
+    children = db.query(Student, User.firstName, User.lastName, StudentParent.relationship_type)\
+        .join(StudentParent, StudentParent.student_id == Student.id)\
+        .join(User, User.id == Student.user_id)\
+        .filter(StudentParent.parent_id == parent.id)\
+        .order_by(Student.id)\
+        .all()
+    student_ids = [student.id for student, *_ in children]
+
+    grades = defaultdict(list)
+    attendance = defaultdict(lambda: {status.value: 0 for status in AttendanceStatus})
+    open_fees = defaultdict(list)
+    pending_excuses = defaultdict(list)
+
+    if student_ids:
+        ranked = db.query(
+            Grade.id.label("id"),
+            func.row_number().over(
+                partition_by=Grade.student_id,
+                order_by=(Grade.graded_at.desc(), Grade.id.desc())
+            ).label("rank")
+        ).filter(Grade.student_id.in_(student_ids)).subquery()
+
+        recent_grades = db.query(Grade, Course.name)\
+            .join(ranked, ranked.c.id == Grade.id)\
+            .outerjoin(Course, Course.id == Grade.course_id)\
+            .filter(ranked.c.rank <= grades_per_child)\
+            .order_by(Grade.student_id, ranked.c.rank)\
+            .all()
+        for grade, course_name in recent_grades:
+            grades[grade.student_id].append({
+                "id": grade.id,
+                "course_id": grade.course_id,
+                "course_name": course_name or "Unknown Course",
+                "exam_id": grade.exam_id,
+                "score": float(grade.score),
+                "grade_value": grade.grade_value,
+                "graded_at": grade.graded_at.isoformat() if grade.graded_at else None
+            })
+
+        since = date.today() - timedelta(days=attendance_days)
+        tallies = db.query(Attendance.student_id, Attendance.status, func.count(Attendance.id))\
+            .filter(Attendance.student_id.in_(student_ids), Attendance.date >= since)\
+            .group_by(Attendance.student_id, Attendance.status)\
+            .all()
+        for student_id, status, count in tallies:
+            attendance[student_id][_value(status)] = count
+
+        for fee in db.query(FeeRecord)\
+                .filter(FeeRecord.student_id.in_(student_ids), FeeRecord.is_paid == False)\
+                .order_by(FeeRecord.due_date.asc())\
+                .all():
+            open_fees[fee.student_id].append({
+                "id": fee.id,
+                "amount": fee.amount,
+                "fee_type": fee.fee_type,
+                "due_date": fee.due_date,
+                "academic_year": fee.academic_year
+            })
+
+        for excuse in db.query(AbsenceExcuse)\
+                .filter(AbsenceExcuse.student_id.in_(student_ids), AbsenceExcuse.status == ExcuseStatus.PENDING)\
+                .order_by(AbsenceExcuse.submitted_at.desc())\
+                .all():
+            pending_excuses[excuse.student_id].append({
+                "id": excuse.id,
+                "start_date": excuse.start_date,
+                "end_date": excuse.end_date,
+                "reason": _value(excuse.reason),
+                "submitted_at": excuse.submitted_at
+            })
+
+    grade_levels = {_value(student.grade_level) for student, *_ in children}
+    events_query = db.query(Event).filter(
+        Event.is_published == True,
+        Event.is_cancelled == False,
+        Event.end_date >= datetime.now(timezone.utc),
+        Event.target_audience.in_([EventAudience.ALL, EventAudience.PARENTS, EventAudience.STUDENTS])
+    )
+    if grade_levels:
+        events_query = events_query.filter(or_(
+            Event.target_grade_levels == None,
+            Event.target_grade_levels == "",
+            *[Event.target_grade_levels.contains(level) for level in grade_levels]
+        ))
+    else:
+        events_query = events_query.filter(or_(Event.target_grade_levels == None, Event.target_grade_levels == ""))
+    events = events_query.order_by(Event.start_date.asc()).limit(events_limit).all()
+
+    result_children = []
+    for student, first_name, last_name, relationship_type in children:
+        tally = attendance[student.id]
+        total = sum(tally.values())
+        result_children.append({
+            "student_id": student.id,
+            "firstName": first_name,
+            "lastName": last_name,
+            "student_number": student.student_number,
+            "grade_level": _value(student.grade_level),
+            "class_id": student.class_id,
+            "relationship_type": relationship_type,
+            "recent_grades": grades[student.id],
+            "attendance": {
+                **tally,
+                "total_records": total,
+                "attendance_rate": round(tally[AttendanceStatus.PRESENT.value] / total * 100, 2) if total else 0
+            },
+            "open_fees": open_fees[student.id],
+            "open_fees_total": sum(fee["amount"] for fee in open_fees[student.id]),
+            "pending_excuses": pending_excuses[student.id]
+        })
+
+    return {
+        "parent": {
+            "id": parent.id,
+            "firstName": user.firstName,
+            "lastName": user.lastName,
+            "email": user.email,
+            "phone_number": parent.phone_number,
+            "address": parent.address
+        },
+        "children": result_children,
+        "upcoming_events": [{
+            "id": event.id,
+            "title": event.title,
+            "event_type": _value(event.event_type),
+            "start_date": event.start_date,
+            "end_date": event.end_date,
+            "location": event.location,
+            "target_grade_levels": event.target_grade_levels,
+            "requires_rsvp": event.requires_rsvp,
+            "registration_deadline": event.registration_deadline
+        } for event in events]
+    }
@@ -0,0 +1,50 @@
+# repositories/roster.py
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from typing import Optional
+
+from models import User, Teacher, Student, Class, Course
+
+
+# -------------------------------
+# Classes
+# -------------------------------
+def get_classes_with_student_counts(
+    db: Session,
+    *criteria,
+    skip: Optional[int] = None,
+    limit: Optional[int] = None
+):
+    """Return (Class, student_count) pairs from a single grouped query."""
+    query = db.query(Class, func.count(Student.id).label("student_count"))\
+        .outerjoin(Student, Student.class_id == Class.id)\
+        .filter(*criteria)\
+        .group_by(Class.id)\
+        .order_by(Class.id)
+
+    if skip:
+        query = query.offset(skip)
+    if limit is not None:
+        query = query.limit(limit)
+
+    return query.all()
+
+
+# -------------------------------
+# Courses
+# -------------------------------
+def get_courses_with_names(db: Session, *criteria):
+    """Return (Course, teacher_name, class_name) rows from a single join."""
+    rows = db.query(Course, User.firstName, User.lastName, Class.name)\
+        .outerjoin(Teacher, Teacher.id == Course.teacher_id)\
+        .outerjoin(User, User.id == Teacher.user_id)\
+        .outerjoin(Class, Class.id == Course.class_id)\
+        .filter(*criteria)\
+        .order_by(Course.id)\
+        .all()
+
+    return [
+        (course, f"{first_name} {last_name}" if first_name is not None else None, class_name)
+        for course, first_name, last_name, class_name in rows
+    ]
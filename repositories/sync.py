@@ -0,0 +1,174 @@
+# repositories/sync.py
+
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import event, inspect, insert, or_, select, union
+from sqlalchemy.orm import Session
+from typing import Iterable, List
+
+from config import SYNC_PAGE_SIZE, SYNC_SETTLE_SECONDS
+from models import (
+    User, Student, Parent, StudentParent, Teacher, Class, Course,
+    Event, Grade, Attendance, FeeRecord, AbsenceExcuse, Appointment, EventRSVP,
+    TeacherAvailability, SyncChange
+)
+
+SYNC_MODELS = {
+    "events": Event,
+    "grades": Grade,
+    "attendance": Attendance,
+    "fees": FeeRecord,
+    "absence_excuses": AbsenceExcuse,
+    "appointments": Appointment,
+    "event_rsvps": EventRSVP,
+}
+_ENTITY_BY_MODEL = {model: entity for entity, model in SYNC_MODELS.items()}
+
+
+def _change(entity: str, obj, op: str) -> dict:
+    row = {
+        "entity": entity,
+        "entity_id": obj.id,
+        "op": op,
+        "student_id": getattr(obj, "student_id", None),
+        "user_id": getattr(obj, "user_id", None),
+        "teacher_id": None,
+    }
+    if entity == "appointments":
+        row["user_id"] = obj.parent_id
+        row["availability_id"] = obj.availability_id
+    return row
+
+
+def record_changes(conn, rows: Iterable[dict]) -> None:
+    """
+    Append rows built by `_change` to the change log. Appointments are owned
+    by the teacher of their slot, resolved here in one query.
+    """
+    rows = list(rows)
+    if not rows:
+        return
+    availability_ids = {row["availability_id"] for row in rows if row.get("availability_id")}
+    teachers = {}
+    if availability_ids:
+        teachers = dict(conn.execute(
+            select(TeacherAvailability.id, TeacherAvailability.teacher_id)
+            .where(TeacherAvailability.id.in_(availability_ids))
+        ).all())
+    now = datetime.now(timezone.utc)
+    for row in rows:
+        availability_id = row.pop("availability_id", None)
+        if availability_id:
+            row["teacher_id"] = teachers.get(availability_id)
+        row["changed_at"] = now
+    conn.execute(insert(SyncChange), rows)
+
+
+def record_bulk_changes(db: Session, entity: str, objs: Iterable, op: str = "upsert") -> None:
+    """For Core bulk statements, which bypass the flush hook below."""
+    record_changes(db, (_change(entity, obj, op) for obj in objs))
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session, flush_context):
+    rows = []
+    for op, objs in (("upsert", session.new), ("upsert", session.dirty), ("delete", session.deleted)):
+        for obj in objs:
+            entity = _ENTITY_BY_MODEL.get(type(obj))
+            if entity is None:
+                continue
+            if obj in session.dirty and not session.is_modified(obj, include_collections=False):
+                continue
+            rows.append(_change(entity, obj, op))
+    record_changes(session.connection(), rows)
+
+
+def _serialize(obj) -> dict:
+    return jsonable_encoder({attr.key: getattr(obj, attr.key) for attr in inspect(type(obj)).column_attrs})
+
+
+def _visible_changes(user: User, roles: List[str]):
+    if "admin" in roles:
+        return None
+    student_ids = union(
+        select(StudentParent.student_id)
+            .join(Parent, Parent.id == StudentParent.parent_id)
+            .where(Parent.user_id == user.id),
+        select(Student.id).where(Student.user_id == user.id),
+        select(Student.id)
+            .join(Class, Class.id == Student.class_id)
+            .join(Teacher, Teacher.id == Class.class_teacher_id)
+            .where(Teacher.user_id == user.id),
+        select(Student.id)
+            .join(Course, Course.class_id == Student.class_id)
+            .join(Teacher, Teacher.id == Course.teacher_id)
+            .where(Teacher.user_id == user.id)
+    )
+    return or_(
+        SyncChange.entity == "events",
+        SyncChange.student_id.in_(student_ids),
+        SyncChange.user_id == user.id,
+        SyncChange.teacher_id == user.id
+    )
+
+
+def get_changes(db: Session, user: User, roles: List[str], since: int = 0, limit: int = SYNC_PAGE_SIZE) -> dict:
+    """
+    Rows created, updated or deleted after `since` that `user` may see,
+    compacted to the latest state per row. `cursor` only advances over
+    changes older than SYNC_SETTLE_SECONDS, so a transaction that took a
+    lower sequence number but committed late is not skipped; recent changes
+    may therefore be sent twice, which is harmless for upserts and deletes.
+    `has_more` is only set when the cursor moves: a page made entirely of
+    unsettled changes is re-sent on the next regular poll rather than
+    fetched again in a loop.
+    """
+    query = db.query(SyncChange.id, SyncChange.entity, SyncChange.entity_id, SyncChange.op)\
+        .filter(SyncChange.id > since)
+    visible = _visible_changes(user, roles)
+    if visible is not None:
+        query = query.filter(visible)
+    changes = query.order_by(SyncChange.id).limit(limit + 1).all()
+    has_more = len(changes) > limit
+    changes = changes[:limit]
+
+    latest = {}
+    for change in changes:
+        latest[(change.entity, change.entity_id)] = change.op
+
+    upserts = defaultdict(list)
+    deleted = defaultdict(list)
+    for (entity, entity_id), op in latest.items():
+        (upserts if op == "upsert" else deleted)[entity].append(entity_id)
+
+    staff = "admin" in roles or "teacher" in roles
+    upserted = defaultdict(list)
+    for entity, ids in upserts.items():
+        model = SYNC_MODELS[entity]
+        found = set()
+        for obj in db.query(model).filter(model.id.in_(ids)).order_by(model.id):
+            if entity == "events" and not obj.is_published and not staff:
+                continue
+            found.add(obj.id)
+            upserted[entity].append(_serialize(obj))
+        # Gone since this page was read, or hidden from this user
+        deleted[entity].extend(entity_id for entity_id in ids if entity_id not in found)
+
+    settled_before = datetime.now(timezone.utc) - timedelta(seconds=SYNC_SETTLE_SECONDS)
+    settled_head = db.query(SyncChange.id)\
+        .filter(SyncChange.changed_at <= settled_before)\
+        .order_by(SyncChange.id.desc())\
+        .limit(1)\
+        .scalar() or 0
+    cursor = max(since, min(changes[-1].id, settled_head) if has_more else settled_head)
+
+    return {
+        "cursor": cursor,
+        "has_more": has_more and cursor > since,
+        "changes": {
+            entity: {"upserted": upserted.get(entity, []), "deleted": sorted(deleted.get(entity, []))}
+            for entity in SYNC_MODELS
+            if upserted.get(entity) or deleted.get(entity)
+        }
+    }
@@ -0,0 +1,55 @@
+# repositories/versions.py
+
+from datetime import datetime, timezone
+from sqlalchemy import update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+from typing import Dict, Optional, Tuple
+
+from models import ResourceVersion
+
+
+def bump_versions(db: Session, *names: str) -> None:
+    """
+    Increment the change counters for `names` as part of the caller's
+    transaction; the caller commits. Counters are created on first write,
+    with an INSERT ... ON CONFLICT DO UPDATE so two concurrent first writers
+    both count instead of one failing on the primary key.
+    """
+    names = sorted(set(names))  # fixed lock order across transactions
+    if not names:
+        return
+    now = datetime.now(timezone.utc)
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        insert = (postgresql if dialect == "postgresql" else sqlite).insert
+        stmt = insert(ResourceVersion).values([{"name": name, "version": 1, "updated_at": now} for name in names])
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[ResourceVersion.name],
+            set_={"version": ResourceVersion.version + 1, "updated_at": stmt.excluded.updated_at}
+        ))
+        return
+
+    bumped = db.execute(
+        update(ResourceVersion)
+        .where(ResourceVersion.name.in_(names))
+        .values(version=ResourceVersion.version + 1, updated_at=now)
+        .returning(ResourceVersion.name)
+    ).scalars().all()
+    db.add_all(ResourceVersion(name=name, version=1, updated_at=now) for name in set(names) - set(bumped))
+
+
+def get_versions(db: Session, *names: str) -> Tuple[Dict[str, int], Optional[datetime]]:
+    """
+    Current counters for `names` (0 if never written) and the most recent
+    change time among them, in a single query.
+    """
+    versions = dict.fromkeys(names, 0)
+    last_modified = None
+    for name, version, updated_at in db.query(
+        ResourceVersion.name, ResourceVersion.version, ResourceVersion.updated_at
+    ).filter(ResourceVersion.name.in_(names)):
+        versions[name] = version
+        if last_modified is None or updated_at > last_modified:
+            last_modified = updated_at
+    return versions, last_modified
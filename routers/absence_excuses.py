@@ -1,16 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from sqlalchemy.orm import Session, joinedload
 from typing import List, Optional
-from datetime import datetime, timezone
+from datetime import date, datetime, timezone
 
 from database import get_db
 from dependencies import get_current_user, require_roles, get_user_roles
-from models import User, Student, Parent, StudentParent, AbsenceExcuse
+from models import User, Student, Parent, StudentParent, AbsenceExcuse, ExcuseStatus, Class, Teacher
+from repositories.absence_excuses import find_overlapping, get_active_excuses
+from repositories.attendance import reconcile_excused_absences, revert_excused_absences, invalidate_attendance
+from repositories.versions import get_versions, bump_versions
+from utils.http_cache import make_etag, not_modified, validator_headers
+from services.event_bus import event_bus
+from utils.serialization import row_data, orm_response
 from schemas.absence_excuse import (
     AbsenceExcuseCreate,
     AbsenceExcuseUpdate,
+    AbsenceExcuseBatchUpdate,
     AbsenceExcuseResponse,
-    AbsenceExcuseDetailResponse
+    AbsenceExcuseDetailResponse,
+    AbsenceExcuseBatchResult,
+    MESSAGE_MAX_LENGTH
 )
 
 router = APIRouter(prefix="/absence-excuses", tags=["absence-excuses"])
@@ -32,8 +41,9 @@ async def create_absence_excuse(
     if not parent:
         raise HTTPException(status_code=403, detail="You must be a parent to submit excuses")
     
-    # Verify student exists
-    student = db.query(Student).filter(Student.id == student_id).first()
+    # Verify student exists; the row lock serializes concurrent submissions
+    # for the student, so both cannot pass the overlap check below
+    student = db.query(Student).filter(Student.id == student_id).with_for_update().first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
@@ -46,21 +56,75 @@ async def create_absence_excuse(
     if not relationship:
         raise HTTPException(status_code=403, detail="You are not authorized to submit excuses for this student")
     
-    # Create the excuse
-    new_excuse = AbsenceExcuse(
-        student_id=student_id,
-        parent_id=parent.id,
-        start_date=excuse_data.start_date,
-        end_date=excuse_data.end_date,
-        reason=excuse_data.reason,
-        message=excuse_data.message,
-        status="pending"
-    )
+    start, end = excuse_data.start_date, excuse_data.end_date
+    nearby = find_overlapping(db, student_id, start, end, touching=True)
+    conflicts = [
+        e for e in nearby
+        if e.start_date <= end and e.end_date >= start
+        and (e.status == ExcuseStatus.APPROVED or e.parent_id != parent.id)
+    ]
+    if conflicts:
+        periods = ", ".join(f"{e.start_date}..{e.end_date}" for e in conflicts)
+        raise HTTPException(status_code=409, detail=f"Overlaps existing absence excuses ({periods})")
+    
+    # Overlapping or adjacent pending excuses from this parent become one excuse
+    pending = [e for e in nearby if e.status == ExcuseStatus.PENDING and e.parent_id == parent.id]
+    other_reasons = [
+        e for e in pending
+        if (e.reason.value if hasattr(e.reason, 'value') else e.reason) != excuse_data.reason
+    ]
+    if other_reasons:
+        periods = ", ".join(
+            f"{e.start_date}..{e.end_date} ({e.reason.value if hasattr(e.reason, 'value') else e.reason})"
+            for e in other_reasons
+        )
+        raise HTTPException(
+            status_code=409,
+            detail=f"Overlaps or adjoins pending excuses with a different reason ({periods}); "
+                   f"they can only be merged when the reason is the same"
+        )
+    if pending:
+        message = "\n\n".join([e.message for e in pending] + [excuse_data.message])
+        if len(message) > MESSAGE_MAX_LENGTH:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Merging with your pending excuses would exceed {MESSAGE_MAX_LENGTH} characters of message; "
+                       f"shorten the message"
+            )
+        new_excuse = pending[0]
+        new_excuse.start_date = min([start] + [e.start_date for e in pending])
+        new_excuse.end_date = max([end] + [e.end_date for e in pending])
+        new_excuse.message = message
+        for duplicate in pending[1:]:
+            db.delete(duplicate)
+    else:
+        new_excuse = AbsenceExcuse(
+            student_id=student_id,
+            parent_id=parent.id,
+            start_date=start,
+            end_date=end,
+            reason=excuse_data.reason,
+            message=excuse_data.message,
+            status="pending"
+        )
+        db.add(new_excuse)
     
-    db.add(new_excuse)
+    bump_versions(db, "absence_excuses")
     db.commit()
     db.refresh(new_excuse)
     
+    class_teacher_user_id = db.query(Teacher.user_id)\
+        .join(Class, Class.class_teacher_id == Teacher.id)\
+        .filter(Class.id == student.class_id)\
+        .scalar() if student.class_id else None
+    event_bus.publish("excuse.created", {
+        "excuse_id": new_excuse.id,
+        "student_id": student_id,
+        "class_id": student.class_id,
+        "start_date": new_excuse.start_date,
+        "end_date": new_excuse.end_date
+    }, user_ids=[class_teacher_user_id], roles=["admin"])
+    
     return AbsenceExcuseResponse(
         id=new_excuse.id,
         student_id=new_excuse.student_id,
@@ -137,8 +201,39 @@ async def get_student_absence_excuses(
 
 # ================== ADMIN/TEACHER ENDPOINTS ==================
 
+def _with_people(query):
+    """Load each excuse's student, parent and reviewer (and their users) in the same query."""
+    return query.options(
+        joinedload(AbsenceExcuse.student).joinedload(Student.user),
+        joinedload(AbsenceExcuse.parent).joinedload(Parent.user),
+        joinedload(AbsenceExcuse.reviewer)
+    )
+
+def _full_name(user: Optional[User], default: Optional[str] = "Unknown") -> Optional[str]:
+    return f"{user.firstName} {user.lastName}" if user else default
+
+def _detail_data(excuse: AbsenceExcuse, **extra) -> dict:
+    student, parent = excuse.student, excuse.parent
+    return row_data(
+        excuse,
+        student_name=_full_name(student.user if student else None),
+        student_number=student.student_number if student else "N/A",
+        parent_name=_full_name(parent.user if parent else None),
+        reviewed_by=_full_name(excuse.reviewer, None),
+        **extra
+    )
+
+def _publish_reviewed(excuse: AbsenceExcuse):
+    event_bus.publish("excuse.reviewed", {
+        "excuse_id": excuse.id,
+        "student_id": excuse.student_id,
+        "status": excuse.status.value if hasattr(excuse.status, 'value') else excuse.status,
+        "reviewed_at": excuse.reviewed_at
+    }, user_ids=[excuse.parent.user_id if excuse.parent else None])
+
 @router.get("", response_model=List[AbsenceExcuseDetailResponse])
 async def get_all_absence_excuses(
+    request: Request,
     status: Optional[str] = Query(None, description="Filter by status: pending, approved, rejected"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=500),
@@ -148,49 +243,50 @@ async def get_all_absence_excuses(
     """
     Get all absence excuses (admin/teacher only).
     """
-    query = db.query(AbsenceExcuse)
+    versions, last_modified = get_versions(db, "absence_excuses")
+    etag = make_etag(request.url.path, sorted(request.query_params.multi_items()), versions)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged:
+        return unchanged
+    headers = validator_headers(etag, last_modified)
+    
+    query = _with_people(db.query(AbsenceExcuse))
     
     if status:
         query = query.filter(AbsenceExcuse.status == status)
     
     excuses = query.order_by(AbsenceExcuse.submitted_at.desc()).offset(skip).limit(limit).all()
     
-    result = []
-    for excuse in excuses:
-        # Get student info
-        student = db.query(Student).filter(Student.id == excuse.student_id).first()
-        student_user = db.query(User).filter(User.id == student.user_id).first() if student else None
-        
-        # Get parent info
-        parent = db.query(Parent).filter(Parent.id == excuse.parent_id).first()
-        parent_user = db.query(User).filter(User.id == parent.user_id).first() if parent else None
-        
-        # Get reviewer info
-        reviewer_name = None
-        if excuse.reviewed_by:
-            reviewer = db.query(User).filter(User.id == excuse.reviewed_by).first()
-            if reviewer:
-                reviewer_name = f"{reviewer.firstName} {reviewer.lastName}"
-        
-        result.append(AbsenceExcuseDetailResponse(
-            id=excuse.id,
-            student_id=excuse.student_id,
-            student_name=f"{student_user.firstName} {student_user.lastName}" if student_user else "Unknown",
-            student_number=student.student_number if student else "N/A",
-            parent_id=excuse.parent_id,
-            parent_name=f"{parent_user.firstName} {parent_user.lastName}" if parent_user else "Unknown",
-            start_date=excuse.start_date,
-            end_date=excuse.end_date,
-            reason=excuse.reason.value if hasattr(excuse.reason, 'value') else excuse.reason,
-            message=excuse.message,
-            status=excuse.status.value if hasattr(excuse.status, 'value') else excuse.status,
-            submitted_at=excuse.submitted_at,
-            reviewed_at=excuse.reviewed_at,
-            reviewed_by=reviewer_name,
-            admin_notes=excuse.admin_notes
-        ))
+    return orm_response(List[AbsenceExcuseDetailResponse], [_detail_data(e) for e in excuses], headers=headers)
+
+@router.get("/active")
+async def get_active_absence_excuses(
+    day: Optional[date] = Query(None, alias="date", description="Defaults to today"),
+    include_pending: bool = False,
+    current_user: User = Depends(require_roles(["admin", "teacher"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Who is excused on a given date, school-wide (admin/teacher only).
+    """
+    day = day or date.today()
+    rows = get_active_excuses(db, day, include_pending)
     
-    return result
+    return {
+        "date": day.isoformat(),
+        "count": len(rows),
+        "excuses": [{
+            "excuse_id": excuse.id,
+            "student_id": excuse.student_id,
+            "student_name": f"{first_name} {last_name}",
+            "class_id": class_id,
+            "class_name": class_name,
+            "start_date": excuse.start_date.isoformat(),
+            "end_date": excuse.end_date.isoformat(),
+            "reason": excuse.reason.value if hasattr(excuse.reason, 'value') else excuse.reason,
+            "status": excuse.status.value if hasattr(excuse.status, 'value') else excuse.status
+        } for excuse, first_name, last_name, class_id, class_name in rows]
+    }
 
 @router.get("/{excuse_id}", response_model=AbsenceExcuseDetailResponse)
 async def get_absence_excuse_detail(
@@ -201,42 +297,65 @@ async def get_absence_excuse_detail(
     """
     Get detailed information about a specific absence excuse (admin/teacher only).
     """
-    excuse = db.query(AbsenceExcuse).filter(AbsenceExcuse.id == excuse_id).first()
+    excuse = _with_people(db.query(AbsenceExcuse)).filter(AbsenceExcuse.id == excuse_id).first()
     if not excuse:
         raise HTTPException(status_code=404, detail="Absence excuse not found")
     
-    # Get student info
-    student = db.query(Student).filter(Student.id == excuse.student_id).first()
-    student_user = db.query(User).filter(User.id == student.user_id).first() if student else None
-    
-    # Get parent info
-    parent = db.query(Parent).filter(Parent.id == excuse.parent_id).first()
-    parent_user = db.query(User).filter(User.id == parent.user_id).first() if parent else None
-    
-    # Get reviewer info
-    reviewer_name = None
-    if excuse.reviewed_by:
-        reviewer = db.query(User).filter(User.id == excuse.reviewed_by).first()
-        if reviewer:
-            reviewer_name = f"{reviewer.firstName} {reviewer.lastName}"
-    
-    return AbsenceExcuseDetailResponse(
-        id=excuse.id,
-        student_id=excuse.student_id,
-        student_name=f"{student_user.firstName} {student_user.lastName}" if student_user else "Unknown",
-        student_number=student.student_number if student else "N/A",
-        parent_id=excuse.parent_id,
-        parent_name=f"{parent_user.firstName} {parent_user.lastName}" if parent_user else "Unknown",
-        start_date=excuse.start_date,
-        end_date=excuse.end_date,
-        reason=excuse.reason.value if hasattr(excuse.reason, 'value') else excuse.reason,
-        message=excuse.message,
-        status=excuse.status.value if hasattr(excuse.status, 'value') else excuse.status,
-        submitted_at=excuse.submitted_at,
-        reviewed_at=excuse.reviewed_at,
-        reviewed_by=reviewer_name,
-        admin_notes=excuse.admin_notes
-    )
+    return orm_response(AbsenceExcuseDetailResponse, _detail_data(excuse))
+
+@router.patch("/batch", response_model=AbsenceExcuseBatchResult)
+async def batch_update_absence_excuse_status(
+    update_data: AbsenceExcuseBatchUpdate,
+    current_user: User = Depends(require_roles(["admin", "teacher"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Approve or reject many absence excuses in one transaction (admin/teacher only).
+    Either all of them are updated or, if any id is unknown, none are.
+    """
+    excuse_ids = sorted(set(update_data.excuse_ids))
+    excuses = db.query(AbsenceExcuse).filter(AbsenceExcuse.id.in_(excuse_ids)).all()
+    missing = set(excuse_ids) - {e.id for e in excuses}
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Absence excuses not found: {sorted(missing)}")
+    
+    # Excuses losing their approval hand their days back to ABSENT
+    unapproved = [
+        e.id for e in excuses
+        if e.status == ExcuseStatus.APPROVED and update_data.status != ExcuseStatus.APPROVED
+    ]
+    reviewed_at = datetime.now(timezone.utc)
+    for excuse in excuses:
+        excuse.status = update_data.status
+        excuse.reviewed_at = reviewed_at
+        excuse.reviewed_by = current_user.id
+        if update_data.admin_notes:
+            excuse.admin_notes = update_data.admin_notes
+    
+    db.flush()
+    if update_data.status == ExcuseStatus.APPROVED:
+        counts, days = reconcile_excused_absences(db, excuse_ids)
+        reconciled = counts["excused_records"]
+    else:
+        counts, days = revert_excused_absences(db, unapproved)
+        reconciled = counts["reverted_records"]
+    
+    bump_versions(db, "absence_excuses")
+    db.commit()
+    invalidate_attendance(days)
+    
+    excuses = _with_people(db.query(AbsenceExcuse))\
+        .filter(AbsenceExcuse.id.in_(excuse_ids))\
+        .order_by(AbsenceExcuse.id)\
+        .all()
+    for excuse in excuses:
+        _publish_reviewed(excuse)
+    
+    return orm_response(AbsenceExcuseBatchResult, {
+        "updated": len(excuses),
+        "reconciled_attendance": reconciled,
+        "excuses": [_detail_data(e) for e in excuses]
+    })
 
 @router.patch("/{excuse_id}", response_model=AbsenceExcuseDetailResponse)
 async def update_absence_excuse_status(
@@ -252,6 +371,8 @@ async def update_absence_excuse_status(
     if not excuse:
         raise HTTPException(status_code=404, detail="Absence excuse not found")
     
+    was_approved = excuse.status == ExcuseStatus.APPROVED
+    
     # Update the excuse
     excuse.status = update_data.status
     excuse.reviewed_at = datetime.now(timezone.utc)
@@ -260,37 +381,24 @@ async def update_absence_excuse_status(
     if update_data.admin_notes:
         excuse.admin_notes = update_data.admin_notes
     
-    db.commit()
-    db.refresh(excuse)
-    
-    # Get student info
-    student = db.query(Student).filter(Student.id == excuse.student_id).first()
-    student_user = db.query(User).filter(User.id == student.user_id).first() if student else None
+    reconciled, days = None, []
+    if excuse.status == ExcuseStatus.APPROVED:
+        db.flush()
+        counts, days = reconcile_excused_absences(db, [excuse.id])
+        reconciled = counts["excused_records"]
+    elif was_approved:
+        db.flush()
+        counts, days = revert_excused_absences(db, [excuse.id])
+        reconciled = counts["reverted_records"]
     
-    # Get parent info
-    parent = db.query(Parent).filter(Parent.id == excuse.parent_id).first()
-    parent_user = db.query(User).filter(User.id == parent.user_id).first() if parent else None
+    bump_versions(db, "absence_excuses")
+    db.commit()
+    invalidate_attendance(days)
     
-    # Get reviewer info
-    reviewer_name = f"{current_user.firstName} {current_user.lastName}"
+    excuse = _with_people(db.query(AbsenceExcuse)).filter(AbsenceExcuse.id == excuse_id).first()
+    _publish_reviewed(excuse)
     
-    return AbsenceExcuseDetailResponse(
-        id=excuse.id,
-        student_id=excuse.student_id,
-        student_name=f"{student_user.firstName} {student_user.lastName}" if student_user else "Unknown",
-        student_number=student.student_number if student else "N/A",
-        parent_id=excuse.parent_id,
-        parent_name=f"{parent_user.firstName} {parent_user.lastName}" if parent_user else "Unknown",
-        start_date=excuse.start_date,
-        end_date=excuse.end_date,
-        reason=excuse.reason.value if hasattr(excuse.reason, 'value') else excuse.reason,
-        message=excuse.message,
-        status=excuse.status.value if hasattr(excuse.status, 'value') else excuse.status,
-        submitted_at=excuse.submitted_at,
-        reviewed_at=excuse.reviewed_at,
-        reviewed_by=reviewer_name,
-        admin_notes=excuse.admin_notes
-    )
+    return orm_response(AbsenceExcuseDetailResponse, _detail_data(excuse, reconciled_attendance=reconciled))
 
 @router.delete("/{excuse_id}")
 async def delete_absence_excuse(
@@ -305,7 +413,13 @@ async def delete_absence_excuse(
     if not excuse:
         raise HTTPException(status_code=404, detail="Absence excuse not found")
     
+    # Revert before the delete, which would clear the links to the excuse
+    days = []
+    if excuse.status == ExcuseStatus.APPROVED:
+        _, days = revert_excused_absences(db, [excuse.id])
     db.delete(excuse)
+    bump_versions(db, "absence_excuses")
     db.commit()
+    invalidate_attendance(days)
     
     return {"message": "Absence excuse deleted successfully"}
\ No newline at end of file
@@ -21,6 +21,8 @@ from schemas.admission import (
 )
 from utils.enums import RoleType, RegistrationStatus
 from utils.security import get_password_hash, generate_password
+from utils.response_cache import response_cache
+from services.event_bus import event_bus
 from services.email_service import (
     send_admission_pending_email,
     send_admission_approval_email,
@@ -282,6 +284,11 @@ async def register_student_admission(
     
     db.commit()
     db.refresh(db_admission)
+    event_bus.publish("admission.status", {
+        "admission_id": db_admission.id,
+        "admission_number": db_admission.admission_number,
+        "status": db_admission.status
+    }, roles=["admin"])
     
     # Send pending notification email
     primary_parent = next(
@@ -501,6 +508,12 @@ async def approve_admission(
         
         db.commit()
         db.refresh(admission)
+        response_cache.invalidate("students", "classes")
+        event_bus.publish("admission.status", {
+            "admission_id": admission.id,
+            "admission_number": admission.admission_number,
+            "status": admission.status
+        }, user_ids=parent_user_ids, roles=["admin"])
         
         # Send approval email
         try:
@@ -568,6 +581,11 @@ async def reject_admission(
         admission.admission_letter.used_at = None
     
     db.commit()
+    event_bus.publish("admission.status", {
+        "admission_id": admission.id,
+        "admission_number": admission.admission_number,
+        "status": admission.status
+    }, roles=["admin"])
     
     # Send rejection email
     primary_parent = next(
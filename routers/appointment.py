@@ -5,12 +5,19 @@ from typing import Optional
 
 # Import your SQLAlchemy models
 from database import get_db
-from dependencies import get_current_user
-from repositories.appointment import book_appointment, confirm_appointment, create_availability, save_meeting_summary
+from dependencies import get_current_user, require_roles
+from repositories.appointment import (
+    book_appointment, confirm_appointment, create_availability, generate_availabilities, save_meeting_summary,
+    save_conference_preferences, schedule_conference_day, SchedulingConflict
+)
 from models import TeacherAvailability, Appointment, MeetingSummary, AppointmentStatus
 
 # Import your Pydantic schemas
-from schemas import TeacherAvailabilityCreate, AppointmentCreate, MeetingSummaryCreate
+from schemas import (
+    TeacherAvailabilityCreate, AppointmentCreate, MeetingSummaryCreate,
+    RecurringAvailabilityCreate, RecurringAvailabilityResult,
+    ConferencePreferenceCreate, ConferenceScheduleRequest, ConferenceScheduleResult
+)
 
 router = APIRouter(prefix="/appointments", tags=["Appointments"])
 
@@ -23,6 +30,18 @@ def add_availability(data: TeacherAvailabilityCreate, current_user=Depends(get_c
         raise HTTPException(403)
     return create_availability(db, current_user.id, data)
 
+@router.post("/teacher/availability/recurring", response_model=RecurringAvailabilityResult)
+def add_recurring_availability(
+    data: RecurringAvailabilityCreate,
+    current_user=Depends(require_roles(["teacher"])),
+    db=Depends(get_db)
+):
+    """Expand a weekly pattern into slots, skipping holidays and existing slots, in one bulk insert."""
+    try:
+        return generate_availabilities(db, current_user.id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
 @router.get("/available")
 def list_available_slots(class_id: int, db=Depends(get_db)):
     # Filter by class and teacher's availability
@@ -40,6 +59,30 @@ def confirm(appointment_id: int, current_user=Depends(get_current_user), db=Depe
         raise HTTPException(403)
     return confirm_appointment(db, appointment_id)
 
+@router.post("/conference/preferences")
+def submit_conference_preferences(
+    data: ConferencePreferenceCreate,
+    current_user=Depends(require_roles(["parent"])),
+    db=Depends(get_db)
+):
+    """Replace the teachers this parent wants to meet on a conference day."""
+    try:
+        return save_conference_preferences(db, current_user.id, data)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+@router.post("/conference/schedule", response_model=ConferenceScheduleResult)
+def schedule_conference(
+    data: ConferenceScheduleRequest,
+    current_user=Depends(require_roles(["admin"])),
+    db=Depends(get_db)
+):
+    """Assign all pending conference preferences for a day to free slots in one batch."""
+    try:
+        return schedule_conference_day(db, data.conference_date, data.dry_run)
+    except SchedulingConflict as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
 @router.post("/summary")
 def save_summary(data: MeetingSummaryCreate, current_user=Depends(get_current_user), db=Depends(get_db)):
     if current_user.role != "teacher":
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from datetime import date
@@ -7,6 +7,9 @@ from database import get_db
 from dependencies import get_current_user, require_roles
 from models import User, Attendance
 from schemas.attendance import AttendanceCreate, AttendanceResponse
+from repositories.attendance import reconcile_excused_absences, invalidate_attendance
+from repositories.attendance_bitmaps import sync_bitmaps, load_bitmaps, summarize, STATUSES
+from utils.grading import term_of
 
 router = APIRouter(prefix="/attendance", tags=["attendance"])
 
@@ -24,8 +27,11 @@ async def create_attendance(
         recorded_by=current_user.id
     )
     db.add(new_attendance)
+    db.flush()
+    sync_bitmaps(db, [(new_attendance.student_id, new_attendance.date)])
     db.commit()
     db.refresh(new_attendance)
+    invalidate_attendance([new_attendance.date])
     
     return AttendanceResponse(
         id=new_attendance.id,
@@ -35,6 +41,54 @@ async def create_attendance(
         notes=new_attendance.notes
     )
 
+@router.post("/reconcile-excuses")
+async def reconcile_excuses(
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Mark absences covered by approved excuses as excused (also run nightly by jobs.reconcile_excuses)"""
+    counts, days = reconcile_excused_absences(db)
+    db.commit()
+    invalidate_attendance(days)
+    return counts
+
+@router.get("/rates")
+async def get_attendance_rates(
+    academic_year: Optional[str] = None,
+    term: Optional[int] = Query(None, ge=1, le=2),
+    class_id: Optional[int] = None,
+    min_streak: int = Query(0, ge=0),
+    current_user: User = Depends(require_roles(["admin", "teacher"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Attendance rate, status counts and absence streaks per student for a term
+    (default: the current one), computed from the attendance bitmaps.
+    `min_streak` keeps students with at least that many missed school days in a row.
+    """
+    if academic_year is None or term is None:
+        current_year, current_term = term_of(date.today())
+        academic_year, term = academic_year or current_year, term or current_term
+    try:
+        student_ids, matrices = load_bitmaps(db, academic_year, term, class_id, until=date.today())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    summary = summarize(matrices)
+    keep = summary["longest_absence_streak"] >= min_streak
+
+    return {
+        "academic_year": academic_year,
+        "term": term,
+        "students": [{
+            "student_id": int(student_id),
+            "school_days": int(summary["school_days"][i]),
+            **{status: int(summary[status][i]) for status in STATUSES},
+            "attendance_rate": None if not summary["school_days"][i] else float(summary["attendance_rate"][i]),
+            "longest_absence_streak": int(summary["longest_absence_streak"][i]),
+            "current_absence_streak": int(summary["current_absence_streak"][i])
+        } for i, student_id in enumerate(student_ids) if keep[i]]
+    }
+
 @router.get("", response_model=List[AttendanceResponse])
 async def get_attendance(
     skip: int = 0,
@@ -84,6 +138,10 @@ async def delete_attendance(
     if not attendance:
         raise HTTPException(status_code=404, detail="Attendance record not found")
     
+    attendance_date = attendance.date
     db.delete(attendance)
+    db.flush()
+    sync_bitmaps(db, [(attendance.student_id, attendance_date)])
     db.commit()
+    invalidate_attendance([attendance_date])
     return {"message": "Attendance record deleted successfully"}
\ No newline at end of file
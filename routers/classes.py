@@ -1,4 +1,5 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -6,6 +7,11 @@ from database import get_db
 from dependencies import get_current_user, require_roles
 from models import User, Class, Student, Course
 from schemas.academic import ClassCreate, ClassResponse
+from repositories.gradebook import build_gradebook
+from repositories.loader import DataLoader, get_loader
+from services.report_cards import report_card_tag
+from repositories.roster import get_classes_with_student_counts, get_courses_with_names
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/classes", tags=["classes"])
 
@@ -26,6 +32,7 @@ async def create_class(
     db.add(new_class)
     db.commit()
     db.refresh(new_class)
+    response_cache.invalidate("classes")
     
     return ClassResponse(
         id=new_class.id,
@@ -38,17 +45,20 @@ async def create_class(
 
 @router.get("")
 async def get_classes(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    classes = db.query(Class).offset(skip).limit(limit).all()
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
+    classes = get_classes_with_student_counts(db, skip=skip, limit=limit)
     
     result = []
-    for c in classes:
-        student_count = db.query(Student).filter(Student.class_id == c.id).count()
-        
+    for c, student_count in classes:
         result.append({
             "id": c.id,
             "name": c.name,
@@ -59,21 +69,26 @@ async def get_classes(
             "student_count": student_count
         })
     
-    return result
+    return response_cache.put(request, result, ["classes"])
 
 @router.get("/{class_id}")
 async def get_class(
     class_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     class_obj = db.query(Class).filter(Class.id == class_id).first()
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     
     student_count = db.query(Student).filter(Student.class_id == class_id).count()
     
-    return {
+    return response_cache.put(request, {
         "id": class_obj.id,
         "name": class_obj.name,
         "grade_level": class_obj.grade_level,
@@ -81,7 +96,7 @@ async def get_class(
         "room_number": class_obj.room_number,
         "max_students": class_obj.max_students,
         "student_count": student_count
-    }
+    }, [f"class:{class_id}"])
 
 @router.delete("/{class_id}")
 async def delete_class(
@@ -95,23 +110,26 @@ async def delete_class(
     
     db.delete(class_obj)
     db.commit()
+    response_cache.invalidate("classes", f"class:{class_id}")
     return {"message": "Class deleted successfully"}
 
 @router.get("/{class_id}/students")
 async def get_class_students(
     class_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: DataLoader = Depends(get_loader)
 ):
     class_obj = db.query(Class).filter(Class.id == class_id).first()
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     
     students = db.query(Student).filter(Student.class_id == class_id).all()
+    loader.want(User, (s.user_id for s in students))
     
     result = []
     for s in students:
-        user = db.query(User).filter(User.id == s.user_id).first()
+        user = loader.load(User, s.user_id)
         result.append({
             "id": s.id,
             "firstName": user.firstName,
@@ -132,23 +150,32 @@ async def get_class_courses(
     if not class_obj:
         raise HTTPException(status_code=404, detail="Class not found")
     
-    courses = db.query(Course).filter(Course.class_id == class_id).all()
+    courses = get_courses_with_names(db, Course.class_id == class_id)
     
     result = []
-    for c in courses:
-        from models import Teacher
-        teacher = db.query(Teacher).filter(Teacher.id == c.teacher_id).first()
-        teacher_user = db.query(User).filter(User.id == teacher.user_id).first() if teacher else None
-        
+    for c, teacher_name, _ in courses:
         result.append({
             "id": c.id,
             "name": c.name,
             "code": c.code,
-            "teacher_name": f"{teacher_user.firstName} {teacher_user.lastName}" if teacher_user else None
+            "teacher_name": teacher_name
         })
     
     return result
 
+@router.get("/{class_id}/gradebook")
+async def get_class_gradebook(
+    class_id: int,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    # Already plain JSON types; skip jsonable_encoder on the matrix
+    return ORJSONResponse(build_gradebook(db, class_id))
+
 @router.post("/{class_id}/students/{student_id}")
 async def assign_student_to_class(
     class_id: int,
@@ -168,8 +195,13 @@ async def assign_student_to_class(
     if current_students >= class_obj.max_students:
         raise HTTPException(status_code=400, detail="Class is full")
     
+    previous_class_id = student.class_id
     student.class_id = class_id
     db.commit()
+    response_cache.invalidate(
+        "classes", f"class:{class_id}", f"class:{previous_class_id}",
+        report_card_tag(class_id), report_card_tag(previous_class_id)
+    )
     
     return {"message": "Student assigned to class successfully"}
 
@@ -186,5 +218,6 @@ async def remove_student_from_class(
     
     student.class_id = None
     db.commit()
+    response_cache.invalidate("classes", f"class:{class_id}", report_card_tag(class_id))
     
     return {"message": "Student removed from class successfully"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -6,6 +6,7 @@ from database import get_db
 from dependencies import get_current_user, require_roles
 from models import User, Course
 from schemas.academic import CourseCreate, CourseResponse
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/courses", tags=["courses"])
 
@@ -26,6 +27,7 @@ async def create_course(
     db.add(new_course)
     db.commit()
     db.refresh(new_course)
+    response_cache.invalidate("courses")
     
     return CourseResponse(
         id=new_course.id,
@@ -39,13 +41,18 @@ async def create_course(
 
 @router.get("", response_model=List[CourseResponse])
 async def get_courses(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     courses = db.query(Course).offset(skip).limit(limit).all()
-    return [CourseResponse(
+    return response_cache.put(request, [CourseResponse(
         id=c.id,
         name=c.name,
         code=c.code,
@@ -53,19 +60,24 @@ async def get_courses(
         class_id=c.class_id,
         teacher_id=c.teacher_id,
         academic_year=c.academic_year
-    ) for c in courses]
+    ) for c in courses], ["courses"])
 
 @router.get("/{course_id}", response_model=CourseResponse)
 async def get_course(
     course_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     course = db.query(Course).filter(Course.id == course_id).first()
     if not course:
         raise HTTPException(status_code=404, detail="Course not found")
     
-    return CourseResponse(
+    return response_cache.put(request, CourseResponse(
         id=course.id,
         name=course.name,
         code=course.code,
@@ -73,7 +85,7 @@ async def get_course(
         class_id=course.class_id,
         teacher_id=course.teacher_id,
         academic_year=course.academic_year
-    )
+    ), [f"course:{course_id}"])
 
 @router.delete("/{course_id}")
 async def delete_course(
@@ -87,4 +99,5 @@ async def delete_course(
     
     db.delete(course)
     db.commit()
+    response_cache.invalidate("courses", f"course:{course_id}")
     return {"message": "Course deleted successfully"}
\ No newline at end of file
@@ -1,23 +1,32 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
 from typing import Optional
-from datetime import date
+from datetime import date, timedelta
 
 from database import get_db
-from dependencies import get_current_user
+from dependencies import get_current_user, require_roles
 from models import (
     User, Student, Teacher, Class, Course, 
-    RegistrationRequest, Attendance, FeeRecord, Grade
+    RegistrationRequest, Attendance, FeeRecord, Grade, StudentRiskScore
 )
 from utils.enums import RegistrationStatus, AttendanceStatus
+from utils.response_cache import response_cache
+from repositories.attendance import (
+    attendance_trend, attendance_month_tags, TREND_GRANULARITIES, TREND_GROUPS, TREND_METRICS
+)
 
 router = APIRouter(prefix="/dashboard", tags=["dashboard"])
 
 @router.get("/stats")
 async def get_dashboard_stats(
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     total_students = db.query(Student).count()
     total_teachers = db.query(Teacher).count()
     total_classes = db.query(Class).count()
@@ -26,13 +35,13 @@ async def get_dashboard_stats(
         RegistrationRequest.status == RegistrationStatus.PENDING
     ).count()
     
-    return {
+    return response_cache.put(request, {
         "total_students": total_students,
         "total_teachers": total_teachers,
         "total_classes": total_classes,
         "total_courses": total_courses,
         "pending_registrations": pending_registrations
-    }
+    }, ["students", "teachers", "classes", "courses", "registrations"])
 
 @router.get("/attendance-summary")
 async def get_attendance_summary(
@@ -64,6 +73,44 @@ async def get_attendance_summary(
         "attendance_rate": round((present / len(attendance_records) * 100), 2) if attendance_records else 0
     }
 
+@router.get("/attendance-trend")
+async def get_attendance_trend(
+    request: Request,
+    granularity: str = Query("week", pattern=f"^({'|'.join(TREND_GRANULARITIES)})$"),
+    group_by: str = Query("none", pattern=f"^({'|'.join(TREND_GROUPS)})$"),
+    metrics: str = "attendance_rate,absent,late",
+    date_from: Optional[date] = None,
+    date_to: Optional[date] = None,
+    class_id: Optional[int] = None,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """
+    Attendance time series bucketed in the database by day, week or month;
+    `granularity=weekday` with `group_by=class` gives the weekday x class
+    heatmap. Ranges that ended before today are cached until an attendance
+    record in one of their months changes.
+    """
+    date_to = date_to or date.today()
+    date_from = date_from or date_to - timedelta(days=90)
+    if date_from > date_to:
+        raise HTTPException(status_code=400, detail="date_from must not be after date_to")
+    selected = [m.strip() for m in metrics.split(",") if m.strip()]
+    unknown = [m for m in selected if m not in TREND_METRICS]
+    if unknown or not selected:
+        raise HTTPException(status_code=400, detail=f"metrics must be a comma separated subset of {', '.join(TREND_METRICS)}")
+
+    closed = date_to < date.today()
+    if closed:
+        cached = response_cache.get(request)
+        if cached:
+            return cached
+
+    trend = attendance_trend(db, granularity, date_from, date_to, group_by, class_id, selected)
+    if not closed:
+        return trend
+    return response_cache.put(request, trend, attendance_month_tags(date_from, date_to))
+
 @router.get("/fee-summary")
 async def get_fee_summary(
     academic_year: Optional[str] = None,
@@ -115,4 +162,51 @@ async def get_grade_distribution(
         "total_grades": len(grades),
         "average_score": round(average_score, 2),
         "grade_distribution": grade_counts
-    }
\ No newline at end of file
+    }
+
+@router.get("/at-risk")
+async def get_at_risk_students(
+    level: Optional[str] = Query(None, pattern="^(high|medium|low)$"),
+    class_id: Optional[int] = None,
+    min_score: float = 0,
+    limit: int = Query(50, ge=1, le=500),
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Students ranked by the nightly early-warning score (see jobs.score_at_risk)"""
+    query = db.query(
+        StudentRiskScore,
+        User.firstName,
+        User.lastName,
+        Class.id.label("class_id"),
+        Class.name.label("class_name")
+    ).join(Student, Student.id == StudentRiskScore.student_id)\
+        .join(User, User.id == Student.user_id)\
+        .outerjoin(Class, Class.id == Student.class_id)\
+        .filter(StudentRiskScore.score >= min_score)
+    
+    if level:
+        query = query.filter(StudentRiskScore.level == level)
+    if class_id:
+        query = query.filter(Student.class_id == class_id)
+    
+    rows = query.order_by(StudentRiskScore.score.desc(), StudentRiskScore.student_id).limit(limit).all()
+    
+    return {
+        "as_of": rows[0][0].as_of.isoformat() if rows else None,
+        "computed_at": rows[0][0].computed_at.isoformat() if rows else None,
+        "students": [{
+            "student_id": risk.student_id,
+            "name": f"{first_name} {last_name}",
+            "class_id": risk_class_id,
+            "class_name": class_name,
+            "score": risk.score,
+            "level": risk.level,
+            "absence_rate_short": risk.absence_rate_short,
+            "absence_rate_long": risk.absence_rate_long,
+            "unexcused_absences": risk.unexcused_absences,
+            "late_count": risk.late_count,
+            "average_percent": risk.average_percent,
+            "grade_trend": risk.grade_trend
+        } for risk, first_name, last_name, risk_class_id, class_name in rows]
+    }
@@ -1,12 +1,18 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, func
 from typing import List, Optional
 from datetime import datetime, timezone
 
 from database import get_db
 from dependencies import get_current_user, require_roles, get_user_roles
-from models import User, Event, EventRSVP, Student, Parent, StudentParent
+from models import User, Event, EventRSVP, RSVPStatus, Student, Parent, StudentParent
+from repositories.loader import DataLoader, get_loader
+from repositories.versions import get_versions, bump_versions
+from utils.http_cache import make_etag, not_modified, validator_headers
+from utils.response_cache import response_cache, user_scope
+from services.event_bus import event_bus
+from utils.serialization import row_data, dump_json
 from schemas.event import (
     EventCreate, EventUpdate, EventCancel, EventResponse, EventDetailResponse,
     RSVPCreate, RSVPUpdate, RSVPResponse
@@ -44,8 +50,10 @@ async def create_event(
     )
     
     db.add(new_event)
+    bump_versions(db, "events")
     db.commit()
     db.refresh(new_event)
+    response_cache.invalidate("events")
     
     return EventResponse(
         id=new_event.id,
@@ -72,6 +80,7 @@ async def create_event(
 
 @router.get("", response_model=List[EventDetailResponse])
 async def get_events(
+    request: Request,
     event_type: Optional[str] = Query(None),
     target_audience: Optional[str] = Query(None),
     start_date: Optional[datetime] = Query(None),
@@ -85,6 +94,18 @@ async def get_events(
     """
     Get all events with optional filters.
     """
+    versions, last_modified = get_versions(db, "events")
+    etag = make_etag(request.url.path, sorted(request.query_params.multi_items()), current_user.id, versions)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged:
+        return unchanged
+    headers = validator_headers(etag, last_modified)
+    
+    cached = response_cache.get(request, user_scope(current_user))
+    if cached:
+        cached.headers.update(headers)
+        return cached
+    
     user_roles = get_user_roles(current_user)
     
     # Base query - only published events for non-admin/teacher
@@ -140,47 +161,43 @@ async def get_events(
             EventRSVP.event_id == event.id,
             EventRSVP.user_id == current_user.id
         ).first()
-        user_rsvp_status = user_rsvp.status.value if user_rsvp and hasattr(user_rsvp.status, 'value') else (user_rsvp.status if user_rsvp else None)
         
-        result.append(EventDetailResponse(
-            id=event.id,
-            title=event.title,
-            description=event.description,
-            event_type=event.event_type.value if hasattr(event.event_type, 'value') else event.event_type,
-            start_date=event.start_date,
-            end_date=event.end_date,
-            location=event.location,
-            target_audience=event.target_audience.value if hasattr(event.target_audience, 'value') else event.target_audience,
-            target_grade_levels=event.target_grade_levels,
-            requires_rsvp=event.requires_rsvp,
-            max_participants=event.max_participants,
-            registration_deadline=event.registration_deadline,
-            created_by=event.created_by,
+        result.append(row_data(
+            event,
             creator_name=creator_name,
-            organizer_name=event.organizer_name,
-            organizer_contact=event.organizer_contact,
-            is_published=event.is_published,
-            is_cancelled=event.is_cancelled,
-            cancellation_reason=event.cancellation_reason,
-            created_at=event.created_at,
-            updated_at=event.updated_at,
             total_rsvps=total_rsvps,
             attending_count=attending_count,
             available_spots=available_spots,
-            user_rsvp_status=user_rsvp_status
+            user_rsvp_status=user_rsvp.status if user_rsvp else None
         ))
     
-    return result
+    body = dump_json(List[EventDetailResponse], result)
+    response = response_cache.put(request, body, ["events"], user_scope(current_user))
+    response.headers.update(headers)
+    return response
 
 @router.get("/{event_id}", response_model=EventDetailResponse)
 async def get_event(
     event_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific event.
     """
+    versions, last_modified = get_versions(db, f"event:{event_id}")
+    etag = make_etag(request.url.path, current_user.id, versions)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged:
+        return unchanged
+    headers = validator_headers(etag, last_modified)
+    
+    cached = response_cache.get(request, user_scope(current_user))
+    if cached:
+        cached.headers.update(headers)
+        return cached
+    
     event = db.query(Event).filter(Event.id == event_id).first()
     if not event:
         raise HTTPException(status_code=404, detail="Event not found")
@@ -214,7 +231,7 @@ async def get_event(
     ).first()
     user_rsvp_status = user_rsvp.status.value if user_rsvp and hasattr(user_rsvp.status, 'value') else (user_rsvp.status if user_rsvp else None)
     
-    return EventDetailResponse(
+    detail = EventDetailResponse(
         id=event.id,
         title=event.title,
         description=event.description,
@@ -241,6 +258,9 @@ async def get_event(
         available_spots=available_spots,
         user_rsvp_status=user_rsvp_status
     )
+    response = response_cache.put(request, detail, [f"event:{event_id}"], user_scope(current_user))
+    response.headers.update(headers)
+    return response
 
 @router.patch("/{event_id}", response_model=EventResponse)
 async def update_event(
@@ -288,8 +308,10 @@ async def update_event(
     
     event.updated_at = datetime.now(timezone.utc)
     
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
     db.refresh(event)
+    response_cache.invalidate("events", f"event:{event_id}")
     
     return EventResponse(
         id=event.id,
@@ -332,8 +354,10 @@ async def cancel_event(
     event.cancellation_reason = cancel_data.cancellation_reason
     event.updated_at = datetime.now(timezone.utc)
     
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
     db.refresh(event)
+    response_cache.invalidate("events", f"event:{event_id}")
     
     return EventResponse(
         id=event.id,
@@ -372,12 +396,34 @@ async def delete_event(
         raise HTTPException(status_code=404, detail="Event not found")
     
     db.delete(event)
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
+    response_cache.invalidate("events", f"event:{event_id}")
     
     return {"message": "Event deleted successfully"}
 
 # ==================== RSVP MANAGEMENT ====================
 
+def _publish_rsvp_counts(db: Session, event_id: int):
+    """Push the event's new RSVP totals to live clients."""
+    row = db.query(
+        Event.is_published,
+        func.count(EventRSVP.id),
+        func.count(EventRSVP.id).filter(EventRSVP.status == RSVPStatus.ATTENDING)
+    ).outerjoin(EventRSVP, EventRSVP.event_id == Event.id)\
+     .filter(Event.id == event_id)\
+     .group_by(Event.id)\
+     .first()
+    if not row:
+        return
+    is_published, total_rsvps, attending_count = row
+    event_bus.publish(
+        "event.rsvp_count",
+        {"event_id": event_id, "total_rsvps": total_rsvps, "attending_count": attending_count},
+        roles=["admin", "teacher"],
+        broadcast=is_published
+    )
+
 @router.post("/{event_id}/rsvp", response_model=RSVPResponse)
 async def create_rsvp(
     event_id: int,
@@ -456,8 +502,11 @@ async def create_rsvp(
     )
     
     db.add(new_rsvp)
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
     db.refresh(new_rsvp)
+    response_cache.invalidate("events", f"event:{event_id}")
+    _publish_rsvp_counts(db, event_id)
     
     # Get user and student names
     user_name = f"{current_user.firstName} {current_user.lastName}"
@@ -507,8 +556,11 @@ async def update_rsvp(
     rsvp.notes = rsvp_data.notes
     rsvp.response_date = datetime.now(timezone.utc)
     
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
     db.refresh(rsvp)
+    response_cache.invalidate("events", f"event:{event_id}")
+    _publish_rsvp_counts(db, event_id)
     
     # Get user and student names
     user_name = f"{current_user.firstName} {current_user.lastName}"
@@ -537,7 +589,8 @@ async def get_event_rsvps(
     event_id: int,
     status: Optional[str] = Query(None),
     current_user: User = Depends(require_roles(["admin", "teacher"])),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: DataLoader = Depends(get_loader)
 ):
     """
     Get all RSVPs for an event (admin/teacher only).
@@ -553,20 +606,15 @@ async def get_event_rsvps(
     
     rsvps = query.order_by(EventRSVP.response_date.desc()).all()
     
+    # Batch user and student lookups: one IN query per entity type
+    loader.want(User, (rsvp.user_id for rsvp in rsvps))
+    students = loader.load_many(Student, (rsvp.student_id for rsvp in rsvps))
+    loader.want(User, (s.user_id for s in students if s))
+    
     result = []
-    for rsvp in rsvps:
-        # Get user name
-        user = db.query(User).filter(User.id == rsvp.user_id).first()
-        user_name = f"{user.firstName} {user.lastName}" if user else "Unknown"
-        
-        # Get student name if applicable
-        student_name = None
-        if rsvp.student_id:
-            student = db.query(Student).filter(Student.id == rsvp.student_id).first()
-            if student:
-                student_user = db.query(User).filter(User.id == student.user_id).first()
-                if student_user:
-                    student_name = f"{student_user.firstName} {student_user.lastName}"
+    for rsvp, student in zip(rsvps, students):
+        user_name = loader.full_name(rsvp.user_id) or "Unknown"
+        student_name = loader.full_name(student.user_id) if student else None
         
         result.append(RSVPResponse(
             id=rsvp.id,
@@ -602,6 +650,9 @@ async def delete_rsvp(
         raise HTTPException(status_code=404, detail="RSVP not found")
     
     db.delete(rsvp)
+    bump_versions(db, "events", f"event:{event_id}")
     db.commit()
+    response_cache.invalidate("events", f"event:{event_id}")
+    _publish_rsvp_counts(db, event_id)
     
     return {"message": "RSVP deleted successfully"}
\ No newline at end of file
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List, Optional
 from pydantic import BaseModel
@@ -8,6 +8,13 @@ from database import get_db
 from dependencies import get_current_user, require_roles
 from models import User, Exam, Grade, Class
 from schemas.academic import ExamCreate, ExamResponse
+from repositories.versions import bump_versions
+from services.exam_stats import (
+    get_exam_stats, get_class_exam_stats, invalidate_exam_stats, exam_stats_tag, class_exam_stats_tag
+)
+from services.report_cards import invalidate_report_cards
+from utils.grading import german_grade
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/exams", tags=["exams"])
 
@@ -31,6 +38,7 @@ async def create_exam(
     db.add(new_exam)
     db.commit()
     db.refresh(new_exam)
+    response_cache.invalidate("exams", class_exam_stats_tag(new_exam.class_id))
     
     return ExamResponse(
         id=new_exam.id,
@@ -47,13 +55,18 @@ async def create_exam(
 
 @router.get("", response_model=List[ExamResponse])
 async def get_exams(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     exams = db.query(Exam).offset(skip).limit(limit).all()
-    return [ExamResponse(
+    return response_cache.put(request, [ExamResponse(
         id=e.id,
         title=e.title,
         exam_date=e.exam_date,
@@ -64,19 +77,24 @@ async def get_exams(
         course_id=e.course_id,
         class_id=e.class_id,
         description=e.description
-    ) for e in exams]
+    ) for e in exams], ["exams"])
 
 @router.get("/{exam_id}", response_model=ExamResponse)
 async def get_exam(
     exam_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     exam = db.query(Exam).filter(Exam.id == exam_id).first()
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
     
-    return ExamResponse(
+    return response_cache.put(request, ExamResponse(
         id=exam.id,
         title=exam.title,
         exam_date=exam.exam_date,
@@ -87,7 +105,7 @@ async def get_exam(
         course_id=exam.course_id,
         class_id=exam.class_id,
         description=exam.description
-    )
+    ), [f"exam:{exam_id}"])
 
 @router.delete("/{exam_id}")
 async def delete_exam(
@@ -99,19 +117,28 @@ async def delete_exam(
     if not exam:
         raise HTTPException(status_code=404, detail="Exam not found")
     
+    graded_students = [student_id for student_id, in db.query(Grade.student_id).filter(Grade.exam_id == exam_id)]
+    class_id = exam.class_id
     db.delete(exam)
     db.commit()
+    response_cache.invalidate("exams", f"exam:{exam_id}", exam_stats_tag(exam_id), class_exam_stats_tag(class_id))
+    invalidate_report_cards(db, graded_students)
     return {"message": "Exam deleted successfully"}
 
 @router.get("/classes/{class_id}/exams", response_model=List[ExamResponse])
 async def get_class_exams(
     class_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     """Get all exams for a specific class"""
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     exams = db.query(Exam).filter(Exam.class_id == class_id).order_by(Exam.exam_date.desc()).all()
-    return [ExamResponse(
+    return response_cache.put(request, [ExamResponse(
         id=e.id,
         title=e.title,
         exam_date=e.exam_date,
@@ -122,7 +149,20 @@ async def get_class_exams(
         course_id=e.course_id,
         class_id=e.class_id,
         description=e.description
-    ) for e in exams]
+    ) for e in exams], ["exams"])
+
+@router.get("/classes/{class_id}/stats")
+async def get_class_stats(
+    class_id: int,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Score statistics for every exam of a class, plus the distribution of all results"""
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    return Response(content=get_class_exam_stats(db, class_id), media_type="application/json")
 
 @router.post("/classes/{class_id}/exams", response_model=ExamResponse)
 async def create_class_exam(
@@ -150,6 +190,7 @@ async def create_class_exam(
     db.add(new_exam)
     db.commit()
     db.refresh(new_exam)
+    response_cache.invalidate("exams", class_exam_stats_tag(new_exam.class_id))
     
     return ExamResponse(
         id=new_exam.id,
@@ -164,6 +205,19 @@ async def create_class_exam(
         description=new_exam.description
     )
 
+@router.get("/{exam_id}/stats")
+async def get_exam_statistics(
+    exam_id: int,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Mean, median, standard deviation, quartiles, grade histogram and pass rate of an exam"""
+    exam = db.query(Exam).filter(Exam.id == exam_id).first()
+    if not exam:
+        raise HTTPException(status_code=404, detail="Exam not found")
+    
+    return Response(content=get_exam_stats(db, exam), media_type="application/json")
+
 # Exam Results Schemas
 class ExamResultInput(BaseModel):
     student_id: int
@@ -212,19 +266,7 @@ async def save_exam_results(
         ).first()
         
         # Calculate grade value (German grading system)
-        percentage = (result.score / exam.max_score) * 100
-        if percentage >= 92:
-            grade_value = "1"  # Sehr gut
-        elif percentage >= 81:
-            grade_value = "2"  # Gut
-        elif percentage >= 67:
-            grade_value = "3"  # Befriedigend
-        elif percentage >= 50:
-            grade_value = "4"  # Ausreichend
-        elif percentage >= 30:
-            grade_value = "5"  # Mangelhaft
-        else:
-            grade_value = "6"  # Ungenügend
+        grade_value = german_grade((result.score / exam.max_score) * 100)
         
         if existing_grade:
             existing_grade.score = result.score
@@ -242,5 +284,8 @@ async def save_exam_results(
             )
             db.add(new_grade)
     
+    bump_versions(db, *(f"grades:{result.student_id}" for result in data.results))
     db.commit()
+    invalidate_report_cards(db, (result.student_id for result in data.results))
+    invalidate_exam_stats(db, [exam_id])
     return {"message": "Results saved successfully", "count": len(data.results)}
\ No newline at end of file
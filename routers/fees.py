@@ -1,15 +1,37 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query
+from fastapi.responses import Response
+from sqlalchemy import update
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Optional
-from datetime import datetime, timezone
+from typing import Callable, List, Optional, Tuple
+from datetime import date, datetime, timezone
+import hashlib
+
+import orjson
 
 from database import get_db
-from dependencies import get_current_user, require_roles
-from models import User, FeeRecord
-from schemas.fees import FeeRecordCreate, FeeRecordResponse
+from dependencies import get_current_user, require_roles, check_user_has_role
+from models import User, Parent, StudentParent, FeeRecord, FeePlan, FeePayment
+from schemas.fees import (
+    FeeRecordCreate, FeeRecordResponse,
+    FeePlanCreate, FeePlanResponse, FeePlanGenerate, FeePlanGenerateResult, FeePaymentRequest
+)
+from repositories.fees import generate_plan_fees, get_overdue_fees, get_overdue_families, decode_cursor, pay_fees, invalidate_fees
+from repositories.sync import record_bulk_changes
+from utils.enums import GradeLevel
 
 router = APIRouter(prefix="/fees", tags=["fees"])
 
+def _plan_response(plan: FeePlan) -> FeePlanResponse:
+    return FeePlanResponse(
+        id=plan.id,
+        grade_level=plan.grade_level,
+        academic_year=plan.academic_year,
+        fee_type=plan.fee_type,
+        amount=plan.amount,
+        due_date=plan.due_date
+    )
+
 @router.post("", response_model=FeeRecordResponse)
 async def create_fee(
     fee: FeeRecordCreate,
@@ -26,6 +48,7 @@ async def create_fee(
     db.add(new_fee)
     db.commit()
     db.refresh(new_fee)
+    invalidate_fees([new_fee.student_id])
     
     return FeeRecordResponse(
         id=new_fee.id,
@@ -60,6 +83,217 @@ async def get_fees(
         academic_year=f.academic_year
     ) for f in fees]
 
+@router.post("/plans", response_model=FeePlanResponse)
+async def create_fee_plan(
+    plan: FeePlanCreate,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    existing = db.query(FeePlan).filter(
+        FeePlan.grade_level == plan.grade_level,
+        FeePlan.academic_year == plan.academic_year,
+        FeePlan.fee_type == plan.fee_type
+    ).first()
+    if existing:
+        raise HTTPException(status_code=409, detail="A plan for this grade level, year and fee type already exists")
+    
+    new_plan = FeePlan(
+        grade_level=plan.grade_level,
+        academic_year=plan.academic_year,
+        fee_type=plan.fee_type,
+        amount=plan.amount,
+        due_date=plan.due_date,
+        created_by=current_user.id
+    )
+    db.add(new_plan)
+    db.commit()
+    db.refresh(new_plan)
+    return _plan_response(new_plan)
+
+@router.get("/plans", response_model=List[FeePlanResponse])
+async def get_fee_plans(
+    academic_year: Optional[str] = None,
+    grade_level: Optional[GradeLevel] = None,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    query = db.query(FeePlan)
+    if academic_year:
+        query = query.filter(FeePlan.academic_year == academic_year)
+    if grade_level:
+        query = query.filter(FeePlan.grade_level == grade_level)
+    
+    plans = query.order_by(FeePlan.academic_year, FeePlan.grade_level, FeePlan.fee_type).all()
+    return [_plan_response(p) for p in plans]
+
+@router.post("/plans/generate", response_model=FeePlanGenerateResult)
+async def generate_fee_plan_records(
+    request: FeePlanGenerate,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Create the fee records of a year's plans for all students in one statement; safe to re-run"""
+    counts, student_ids = generate_plan_fees(db, request.academic_year, request.grade_level)
+    db.commit()
+    invalidate_fees(student_ids)
+    return counts
+
+@router.delete("/plans/{plan_id}")
+async def delete_fee_plan(
+    plan_id: int,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Generated fee records are kept and just lose the link to the plan"""
+    plan = db.query(FeePlan).filter(FeePlan.id == plan_id).first()
+    if not plan:
+        raise HTTPException(status_code=404, detail="Fee plan not found")
+    
+    unlinked = db.execute(
+        update(FeeRecord)
+        .where(FeeRecord.fee_plan_id == plan_id)
+        .values(fee_plan_id=None, updated_at=datetime.now(timezone.utc))
+        .returning(FeeRecord.id, FeeRecord.student_id)
+        .execution_options(synchronize_session=False)
+    ).all()
+    record_bulk_changes(db, "fees", unlinked)
+    db.delete(plan)
+    db.commit()
+    return {"message": "Fee plan deleted successfully"}
+
+@router.get("/overdue")
+async def get_overdue(
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=500),
+    academic_year: Optional[str] = None,
+    class_id: Optional[int] = None,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Unpaid fees past their due date, oldest first. Pass `next_cursor` back as `cursor` for the next page"""
+    try:
+        after = decode_cursor(cursor) if cursor else None
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    today = date.today()
+    rows, next_cursor = get_overdue_fees(db, today, limit, after, academic_year, class_id)
+    return {
+        "as_of": today,
+        "next_cursor": next_cursor,
+        "fees": [{
+            "id": fee.id,
+            "student_id": fee.student_id,
+            "student_name": f"{first_name} {last_name}",
+            "class_name": class_name,
+            "amount": fee.amount,
+            "fee_type": fee.fee_type,
+            "due_date": fee.due_date,
+            "days_overdue": (today - fee.due_date).days,
+            "academic_year": fee.academic_year
+        } for fee, first_name, last_name, class_name in rows]
+    }
+
+@router.get("/overdue/families")
+async def get_overdue_by_family(
+    cursor: int = Query(0, ge=0, description="`next_cursor` of the previous page"),
+    limit: int = Query(50, ge=1, le=200),
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Overdue fees grouped per parent, with totals; the same grouping the reminder job mails"""
+    today = date.today()
+    families, next_cursor = get_overdue_families(db, today, limit, cursor)
+    return {"as_of": today, "next_cursor": next_cursor, "families": families}
+
+def _payment_response(status_code: int, body: str, replayed: bool = False) -> Response:
+    headers = {"Idempotent-Replayed": "true"} if replayed else None
+    return Response(content=body, status_code=status_code, media_type="application/json", headers=headers)
+
+def _claimed_payment(db: Session, user_id: int, key: Optional[str]) -> Optional[FeePayment]:
+    if not key:
+        return None
+    return db.query(FeePayment).filter(FeePayment.user_id == user_id, FeePayment.idempotency_key == key).first()
+
+def _replay(previous: FeePayment, request_hash: str) -> Response:
+    if previous.request_hash != request_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different payment")
+    return _payment_response(previous.status_code, previous.response, replayed=True)
+
+def _record_payment(
+    db: Session,
+    user: User,
+    fee_ids: List[int],
+    payment_method: str,
+    idempotency_key: Optional[str],
+    outcome: Callable[[dict], Tuple[int, str]]
+) -> Response:
+    """
+    Pay `fee_ids` once per Idempotency-Key. The key is claimed by inserting
+    the FeePayment row in the same transaction as the fee UPDATE: a
+    concurrent retry blocks on the unique (user, key) index until this one
+    commits, then fails the insert and replays the stored response.
+    """
+    request_hash = hashlib.sha256(f"{sorted(set(fee_ids))}|{payment_method}".encode()).hexdigest()
+    previous = _claimed_payment(db, user.id, idempotency_key)
+    if previous:
+        return _replay(previous, request_hash)
+    
+    payment = FeePayment(
+        user_id=user.id,
+        idempotency_key=idempotency_key,
+        request_hash=request_hash,
+        payment_method=payment_method
+    )
+    db.add(payment)
+    try:
+        db.flush()
+    except IntegrityError:
+        db.rollback()
+        # Only a lost race for this user's key is a replay; anything else is a real error
+        previous = _claimed_payment(db, user.id, idempotency_key)
+        if previous is None:
+            raise
+        return _replay(previous, request_hash)
+    
+    result = pay_fees(db, fee_ids, payment_method)
+    status_code, message = outcome(result)
+    payment.status_code = status_code
+    payment.response = orjson.dumps({"message" if status_code < 400 else "detail": message, **result}).decode()
+    db.commit()
+    invalidate_fees(fee["student_id"] for fee in result["paid"])
+    return _payment_response(payment.status_code, payment.response)
+
+@router.post("/pay")
+async def pay_fees_batch(
+    request: FeePaymentRequest,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Pay several fees in one call (admins, or parents for their own
+    children's fees). Fees that are already paid or do not exist are
+    reported, not paid again. Send an Idempotency-Key header to make
+    retries safe: a repeated key returns the first response.
+    """
+    if not check_user_has_role(current_user, ["admin"]):
+        parent = db.query(Parent).filter(Parent.user_id == current_user.id).first()
+        if not parent:
+            raise HTTPException(status_code=403, detail="Insufficient permissions")
+        own = {fee_id for fee_id, in db.query(FeeRecord.id)
+               .join(StudentParent, StudentParent.student_id == FeeRecord.student_id)
+               .filter(StudentParent.parent_id == parent.id, FeeRecord.id.in_(request.fee_ids))}
+        if set(request.fee_ids) - own:
+            raise HTTPException(status_code=403, detail="You can only pay fees of your own children")
+    
+    def outcome(result):
+        if not result["paid"] and result["not_found"]:
+            return 404, "Fee records not found"
+        return 200, f"{len(result['paid'])} fee payments recorded"
+    
+    return _record_payment(db, current_user, request.fee_ids, request.payment_method, idempotency_key, outcome)
+
 @router.get("/{fee_id}", response_model=FeeRecordResponse)
 async def get_fee(
     fee_id: int,
@@ -84,19 +318,19 @@ async def get_fee(
 async def pay_fee(
     fee_id: int,
     payment_method: str,
+    idempotency_key: Optional[str] = Header(None, max_length=255),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    fee = db.query(FeeRecord).filter(FeeRecord.id == fee_id).first()
-    if not fee:
-        raise HTTPException(status_code=404, detail="Fee record not found")
-    
-    fee.is_paid = True
-    fee.paid_date = datetime.now(timezone.utc).date()
-    fee.payment_method = payment_method
-    db.commit()
+    """404 if the fee does not exist, 409 if it is already paid (unless replaying an Idempotency-Key)"""
+    def outcome(result):
+        if result["not_found"]:
+            return 404, "Fee record not found"
+        if result["already_paid"]:
+            return 409, "Fee is already paid"
+        return 200, "Fee payment recorded successfully"
     
-    return {"message": "Fee payment recorded successfully"}
+    return _record_payment(db, current_user, [fee_id], payment_method, idempotency_key, outcome)
 
 @router.delete("/{fee_id}")
 async def delete_fee(
@@ -108,6 +342,8 @@ async def delete_fee(
     if not fee:
         raise HTTPException(status_code=404, detail="Fee record not found")
     
+    student_id = fee.student_id
     db.delete(fee)
     db.commit()
+    invalidate_fees([student_id])
     return {"message": "Fee record deleted successfully"}
\ No newline at end of file
@@ -6,6 +6,9 @@ from database import get_db
 from dependencies import get_current_user, require_roles
 from models import User, Grade, Course
 from schemas.academic import GradeCreate, GradeResponse
+from repositories.versions import bump_versions
+from services.exam_stats import invalidate_exam_stats
+from services.report_cards import invalidate_report_cards
 
 router = APIRouter(prefix="/grades", tags=["grades"])
 
@@ -24,8 +27,11 @@ async def create_grade(
         comments=grade.comments
     )
     db.add(new_grade)
+    bump_versions(db, f"grades:{grade.student_id}")
     db.commit()
     db.refresh(new_grade)
+    invalidate_report_cards(db, [new_grade.student_id])
+    invalidate_exam_stats(db, [new_grade.exam_id])
     
     return GradeResponse(
         id=new_grade.id,
@@ -100,5 +106,8 @@ async def delete_grade(
         raise HTTPException(status_code=404, detail="Grade not found")
     
     db.delete(grade)
+    bump_versions(db, f"grades:{grade.student_id}")
     db.commit()
+    invalidate_report_cards(db, [grade.student_id])
+    invalidate_exam_stats(db, [grade.exam_id])
     return {"message": "Grade deleted successfully"}
\ No newline at end of file
@@ -1,13 +1,22 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import Response, StreamingResponse
 from sqlalchemy.orm import Session
 from typing import Optional
 
+import orjson
+
 from database import get_db
 from dependencies import get_current_user
 from models import User, Role, RoleUser, Parent, Student, StudentParent
 from schemas.student import ParentResponse
 from utils.security import get_password_hash
 from utils.enums import RoleType
+from repositories.loader import DataLoader, get_loader
+from repositories.parent_overview import build_parent_overview
+from utils.http_cache import conditional_json
+from utils.response_cache import response_cache
+from repositories.fees import parent_statement_tag
+from services.family_statement import get_family_statement, statement_csv
 
 router = APIRouter(prefix="/parents", tags=["parents"])
 
@@ -75,6 +84,55 @@ async def get_my_parent_profile(
         address=parent.address
     )
 
+@router.get("/me/overview")
+async def get_my_parent_overview(
+    request: Request,
+    grades_per_child: int = Query(5, ge=0, le=50),
+    attendance_days: int = Query(30, ge=1, le=366),
+    events_limit: int = Query(20, ge=0, le=100),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Parent home screen in one call: children with recent grades, attendance
+    summary, open fees and pending excuses, plus upcoming targeted events.
+    Supports conditional GET via ETag / If-None-Match.
+    """
+    parent = db.query(Parent).filter(Parent.user_id == current_user.id).first()
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent profile not found")
+    
+    overview = build_parent_overview(
+        db, parent, current_user,
+        grades_per_child=grades_per_child,
+        attendance_days=attendance_days,
+        events_limit=events_limit
+    )
+    return conditional_json(request, overview)
+
+@router.get("/me/statement")
+async def get_my_statement(
+    format: str = Query("json", pattern="^(json|csv)$"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    All fees of all the parent's children: totals, sums per academic year
+    and fee type, and line items. `format=csv` streams the line items.
+    """
+    parent = db.query(Parent).filter(Parent.user_id == current_user.id).first()
+    if not parent:
+        raise HTTPException(status_code=404, detail="Parent profile not found")
+    
+    body = get_family_statement(db, parent.id)
+    if format == "csv":
+        return StreamingResponse(
+            statement_csv(orjson.loads(body)),
+            media_type="text/csv",
+            headers={"Content-Disposition": 'attachment; filename="statement.csv"'}
+        )
+    return Response(content=body, media_type="application/json")
+
 @router.post("/{parent_id}/students/{student_id}")
 async def link_parent_to_student(
     parent_id: int,
@@ -106,6 +164,7 @@ async def link_parent_to_student(
     )
     db.add(student_parent)
     db.commit()
+    response_cache.invalidate(parent_statement_tag(parent_id))
     
     return {"message": "Parent linked to student successfully"}
 
@@ -113,18 +172,20 @@ async def link_parent_to_student(
 async def get_parent_children(
     parent_id: int,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: DataLoader = Depends(get_loader)
 ):
     parent = db.query(Parent).filter(Parent.id == parent_id).first()
     if not parent:
         raise HTTPException(status_code=404, detail="Parent not found")
     
     relationships = db.query(StudentParent).filter(StudentParent.parent_id == parent_id).all()
+    students = loader.load_many(Student, (rel.student_id for rel in relationships))
+    loader.want(User, (s.user_id for s in students if s))
     
     result = []
-    for rel in relationships:
-        student = db.query(Student).filter(Student.id == rel.student_id).first()
-        user = db.query(User).filter(User.id == student.user_id).first()
+    for rel, student in zip(relationships, students):
+        user = loader.load(User, student.user_id)
         
         result.append({
             "student_id": student.id,
@@ -7,6 +7,7 @@ from dependencies import get_current_user
 from models import User, RegistrationRequest, RegistrationApprovalLog
 from schemas.registration import RegistrationRequestCreate, RegistrationRequestResponse
 from utils.enums import RegistrationStatus
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/registrations", tags=["registrations"])
 
@@ -29,6 +30,7 @@ async def create_registration_request(
     db.add(new_registration)
     db.commit()
     db.refresh(new_registration)
+    response_cache.invalidate("registrations")
     
     return RegistrationRequestResponse(
         id=new_registration.id,
@@ -105,6 +107,7 @@ async def approve_registration(
     )
     db.add(approval_log)
     db.commit()
+    response_cache.invalidate("registrations")
     
     return {"message": "Registration approved successfully"}
 
@@ -130,6 +133,7 @@ async def reject_registration(
     )
     db.add(approval_log)
     db.commit()
+    response_cache.invalidate("registrations")
     
     return {"message": "Registration rejected successfully"}
 
@@ -145,4 +149,5 @@ async def delete_registration(
     
     db.delete(registration)
     db.commit()
+    response_cache.invalidate("registrations")
     return {"message": "Registration request deleted successfully"}
\ No newline at end of file
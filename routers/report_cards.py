@@ -0,0 +1,115 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import ORJSONResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from urllib.parse import quote
+import re
+
+from database import get_db
+from dependencies import require_roles
+from models import User, Class
+from services.report_card_renderer import pdf_available, stream_report_cards
+from services.report_cards import get_report_cards, report_card_documents
+from utils.enums import GradeLevel
+
+router = APIRouter(prefix="/report-cards", tags=["report-cards"])
+
+TERM_QUERY = Query(None, ge=1, le=2, description="1 (Aug-Jan) or 2 (Feb-Jul); omit for the whole year")
+FORMAT_QUERY = Query("html", pattern="^(html|pdf)$")
+
+def _content_disposition(filename: str) -> str:
+    """Attachment header for a filename built from class names and query input: an ASCII fallback plus RFC 5987 UTF-8."""
+    fallback = re.sub(r'[^A-Za-z0-9._-]+', "_", filename)
+    return f"attachment; filename=\"{fallback}\"; filename*=UTF-8''{quote(filename, safe='')}"
+
+def _documents_response(db: Session, classes, term: Optional[int], fmt: str, filename: str):
+    if fmt == "pdf" and not pdf_available():
+        raise HTTPException(status_code=501, detail="PDF rendering is not available on this server")
+    try:
+        documents = report_card_documents(db, classes, term)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    # Everything the workers need is in `documents`; release the connection before streaming
+    db.close()
+    return StreamingResponse(
+        stream_report_cards(documents, fmt),
+        media_type="application/zip",
+        headers={"Content-Disposition": _content_disposition(filename)}
+    )
+
+@router.get("/classes/{class_id}")
+async def get_class_report_cards(
+    class_id: int,
+    term: Optional[int] = TERM_QUERY,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Weighted course averages, German grades and class rank for every student of a class"""
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    try:
+        cards = get_report_cards(db, [class_obj], term)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse(cards[0])
+
+@router.get("/grade-levels/{grade_level}")
+async def get_grade_level_report_cards(
+    grade_level: GradeLevel,
+    academic_year: str,
+    term: Optional[int] = TERM_QUERY,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Report cards for every class of a grade level, ranked within each class"""
+    classes = db.query(Class).filter(
+        Class.grade_level == grade_level,
+        Class.academic_year == academic_year
+    ).order_by(Class.name).all()
+    
+    try:
+        cards = get_report_cards(db, classes, term) if classes else []
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return ORJSONResponse({
+        "grade_level": grade_level.value,
+        "academic_year": academic_year,
+        "term": term,
+        "classes": cards
+    })
+
+@router.get("/classes/{class_id}/documents")
+def download_class_report_cards(
+    class_id: int,
+    term: Optional[int] = TERM_QUERY,
+    format: str = FORMAT_QUERY,
+    current_user: User = Depends(require_roles(["teacher", "admin"])),
+    db: Session = Depends(get_db)
+):
+    """Zip of rendered report cards (HTML or PDF), one per student of the class"""
+    class_obj = db.query(Class).filter(Class.id == class_id).first()
+    if not class_obj:
+        raise HTTPException(status_code=404, detail="Class not found")
+    
+    return _documents_response(db, [class_obj], term, format, f"report-cards-{class_obj.name}.zip")
+
+@router.get("/grade-levels/{grade_level}/documents")
+def download_grade_level_report_cards(
+    grade_level: GradeLevel,
+    academic_year: str,
+    term: Optional[int] = TERM_QUERY,
+    format: str = FORMAT_QUERY,
+    current_user: User = Depends(require_roles(["admin"])),
+    db: Session = Depends(get_db)
+):
+    """Zip of rendered report cards for every student of a grade level"""
+    classes = db.query(Class).filter(
+        Class.grade_level == grade_level,
+        Class.academic_year == academic_year
+    ).order_by(Class.name).all()
+    if not classes:
+        raise HTTPException(status_code=404, detail="No classes for this grade level and year")
+    
+    return _documents_response(db, classes, term, format, f"report-cards-{grade_level.value}-{academic_year}.zip")
@@ -0,0 +1,50 @@
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from database import get_db
+from dependencies import get_current_user, get_user_roles
+from models import User
+from services.event_bus import event_bus
+
+router = APIRouter(prefix="/stream", tags=["stream"])
+
+KEEPALIVE_SECONDS = 15
+
+@router.get("")
+async def stream(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent events for the current user: excuse.created, excuse.reviewed,
+    event.rsvp_count, appointment.confirmed and admission.status. Each SSE
+    message carries the type in `event:` and a JSON object in `data:`.
+    Missed messages are not replayed; clients catch up with /sync.
+    """
+    subscription = event_bus.subscribe(current_user.id, get_user_roles(current_user))
+    # Don't hold a pooled connection for the lifetime of the stream
+    db.close()
+    
+    async def events():
+        try:
+            yield f"retry: {KEEPALIVE_SECONDS * 1000}\n\n"
+            while not await request.is_disconnected():
+                try:
+                    message = await asyncio.wait_for(subscription.get(), timeout=KEEPALIVE_SECONDS)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: {message['type']}\ndata: {json.dumps(message['data'])}\n\n"
+        finally:
+            event_bus.unsubscribe(subscription)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 from typing import List
 from datetime import date
@@ -9,6 +9,11 @@ from models import User, Role, RoleUser, Student, Grade, Course, Attendance, Fee
 from schemas.student import StudentCreate, StudentResponse
 from utils.security import get_password_hash
 from utils.enums import RoleType
+from repositories.loader import DataLoader, get_loader
+from repositories.versions import get_versions, bump_versions
+from utils.response_cache import response_cache
+from utils.http_cache import make_etag, not_modified, validator_headers
+from utils.serialization import row_data, orm_response
 
 router = APIRouter(prefix="/students", tags=["students"])
 
@@ -50,6 +55,7 @@ async def create_student(
     db.add(new_student)
     db.commit()
     db.refresh(new_student)
+    response_cache.invalidate("students")
     
     return StudentResponse(
         id=new_student.id,
@@ -67,23 +73,16 @@ async def get_students(
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    loader: DataLoader = Depends(get_loader)
 ):
     students = db.query(Student).offset(skip).limit(limit).all()
+    loader.want(User, (s.user_id for s in students))
     result = []
     for s in students:
-        user = db.query(User).filter(User.id == s.user_id).first()
-        result.append(StudentResponse(
-            id=s.id,
-            firstName=user.firstName,
-            lastName=user.lastName,
-            email=user.email,
-            student_number=s.student_number,
-            date_of_birth=s.date_of_birth.isoformat() if isinstance(s.date_of_birth, date) else str(s.date_of_birth),
-            grade_level=s.grade_level,
-            class_id=s.class_id
-        ))
-    return result
+        user = loader.load(User, s.user_id)
+        result.append(row_data(s, firstName=user.firstName, lastName=user.lastName, email=user.email))
+    return orm_response(List[StudentResponse], result)
 
 @router.get("/me")
 async def get_my_student_profile(
@@ -139,16 +138,28 @@ async def delete_student(
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
     
+    class_id = student.class_id
     db.delete(student)
+    bump_versions(db, f"grades:{student_id}")
     db.commit()
+    response_cache.invalidate("students", "classes", f"class:{class_id}")
     return {"message": "Student deleted successfully"}
 
 @router.get("/{student_id}/grades")
 async def get_student_grades(
     student_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    versions, last_modified = get_versions(db, f"grades:{student_id}")
+    etag = make_etag(request.url.path, versions)
+    unchanged = not_modified(request, etag, last_modified)
+    if unchanged:
+        return unchanged
+    response.headers.update(validator_headers(etag, last_modified))
+    
     student = db.query(Student).filter(Student.id == student_id).first()
     if not student:
         raise HTTPException(status_code=404, detail="Student not found")
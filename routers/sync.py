@@ -0,0 +1,23 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from database import get_db
+from dependencies import get_current_user, get_user_roles
+from models import User
+from repositories.sync import get_changes
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+@router.get("")
+async def sync(
+    since: int = Query(0, ge=0, description="Cursor from the previous response; 0 for a full download"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Delta sync for offline clients: events, grades, attendance, fees, absence
+    excuses, appointments and RSVPs changed since `since` that the caller can
+    see. Store the returned `cursor` and call again immediately while
+    `has_more` is true.
+    """
+    return get_changes(db, current_user, get_user_roles(current_user), since)
@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from typing import List
 
@@ -8,6 +8,8 @@ from models import User, Role, RoleUser, Teacher, Course, Class
 from schemas.teacher import TeacherCreate, TeacherResponse
 from utils.security import get_password_hash
 from utils.enums import RoleType
+from repositories.roster import get_classes_with_student_counts, get_courses_with_names
+from utils.response_cache import response_cache
 
 router = APIRouter(prefix="/teachers", tags=["teachers"])
 
@@ -47,6 +49,7 @@ async def create_teacher(
     db.add(new_teacher)
     db.commit()
     db.refresh(new_teacher)
+    response_cache.invalidate("teachers")
     
     return TeacherResponse(
         id=new_teacher.id,
@@ -59,11 +62,16 @@ async def create_teacher(
 
 @router.get("", response_model=List[TeacherResponse])
 async def get_teachers(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     teachers = db.query(Teacher).offset(skip).limit(limit).all()
     result = []
     for t in teachers:
@@ -76,7 +84,7 @@ async def get_teachers(
             employee_number=t.employee_number,
             subject_specialization=t.subject_specialization
         ))
-    return result
+    return response_cache.put(request, result, ["teachers"])
 
 @router.get("/me", response_model=TeacherResponse)
 async def get_my_teacher_profile(
@@ -100,22 +108,27 @@ async def get_my_teacher_profile(
 @router.get("/{teacher_id}", response_model=TeacherResponse)
 async def get_teacher(
     teacher_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    cached = response_cache.get(request)
+    if cached:
+        return cached
+    
     teacher = db.query(Teacher).filter(Teacher.id == teacher_id).first()
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
     user = db.query(User).filter(User.id == teacher.user_id).first()
-    return TeacherResponse(
+    return response_cache.put(request, TeacherResponse(
         id=teacher.id,
         firstName=user.firstName,
         lastName=user.lastName,
         email=user.email,
         employee_number=teacher.employee_number,
         subject_specialization=teacher.subject_specialization
-    )
+    ), [f"teacher:{teacher_id}"])
 
 @router.delete("/{teacher_id}")
 async def delete_teacher(
@@ -129,6 +142,7 @@ async def delete_teacher(
     
     db.delete(teacher)
     db.commit()
+    response_cache.invalidate("teachers", f"teacher:{teacher_id}")
     return {"message": "Teacher deleted successfully"}
 
 @router.get("/{teacher_id}/courses")
@@ -141,17 +155,15 @@ async def get_teacher_courses(
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
-    courses = db.query(Course).filter(Course.teacher_id == teacher_id).all()
+    courses = get_courses_with_names(db, Course.teacher_id == teacher_id)
     
     result = []
-    for c in courses:
-        class_obj = db.query(Class).filter(Class.id == c.class_id).first()
-        
+    for c, _, class_name in courses:
         result.append({
             "id": c.id,
             "name": c.name,
             "code": c.code,
-            "class_name": class_obj.name if class_obj else None,
+            "class_name": class_name,
             "academic_year": c.academic_year
         })
     
@@ -167,13 +179,10 @@ async def get_teacher_classes(
     if not teacher:
         raise HTTPException(status_code=404, detail="Teacher not found")
     
-    from models import Student
-    classes = db.query(Class).filter(Class.class_teacher_id == teacher_id).all()
+    classes = get_classes_with_student_counts(db, Class.class_teacher_id == teacher_id)
     
     result = []
-    for c in classes:
-        student_count = db.query(Student).filter(Student.class_id == c.id).count()
-        
+    for c, student_count in classes:
         result.append({
             "id": c.id,
             "name": c.name,
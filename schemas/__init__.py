@@ -29,7 +29,9 @@ from schemas.absence_excuse import(
 )
 from schemas.appointment import (
     AppointmentCreate,AppointmentStatus,
-    MeetingSummaryCreate, TeacherAvailabilityCreate
+    MeetingSummaryCreate, TeacherAvailabilityCreate,
+    RecurringAvailabilityCreate, RecurringAvailabilityResult,
+    ConferencePreferenceCreate, ConferenceScheduleRequest, ConferenceScheduleResult
 )
 
 from schemas.event import(
@@ -72,7 +74,9 @@ __all__ = [
     "AbsenceExcuseResponse", "AbsenceExcuseUpdate",
     #appointment
     "AppointmentCreate", "AppointmentStatus",
-    "MeetingSummaryCreate", "TeacherAvailabilityCreate"
+    "MeetingSummaryCreate", "TeacherAvailabilityCreate",
+    "RecurringAvailabilityCreate", "RecurringAvailabilityResult",
+    "ConferencePreferenceCreate", "ConferenceScheduleRequest", "ConferenceScheduleResult",
     #event
     "EventCreate", "EventUpdate",
     "EventCancel", "EventResponse", "EventDetailResponse",
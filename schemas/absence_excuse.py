@@ -1,12 +1,15 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import List, Optional
 from datetime import date, datetime
+from utils.serialization import EnumValue
+
+MESSAGE_MAX_LENGTH = 2000
 
 class AbsenceExcuseCreate(BaseModel):
     start_date: date = Field(..., description="Start date of absence")
     end_date: date = Field(..., description="End date of absence")
     reason: str = Field(..., description="Reason for absence (illness, medical_appointment, family_emergency, family_event, other)")
-    message: str = Field(..., min_length=10, max_length=2000, description="Detailed message explaining the absence")
+    message: str = Field(..., min_length=10, max_length=MESSAGE_MAX_LENGTH, description="Detailed message explaining the absence")
     
     @validator('end_date')
     def end_date_must_be_after_start_date(cls, v, values):
@@ -32,15 +35,18 @@ class AbsenceExcuseUpdate(BaseModel):
             raise ValueError(f'status must be one of: {", ".join(valid_statuses)}')
         return v
 
+class AbsenceExcuseBatchUpdate(AbsenceExcuseUpdate):
+    excuse_ids: List[int] = Field(..., min_length=1, max_length=500, description="Excuses to approve or reject")
+
 class AbsenceExcuseResponse(BaseModel):
     id: int
     student_id: int
     parent_id: int
     start_date: date
     end_date: date
-    reason: str
+    reason: EnumValue
     message: str
-    status: str
+    status: EnumValue
     submitted_at: datetime
     reviewed_at: Optional[datetime]
     reviewed_by: Optional[int]
@@ -58,13 +64,19 @@ class AbsenceExcuseDetailResponse(BaseModel):
     parent_name: str
     start_date: date
     end_date: date
-    reason: str
+    reason: EnumValue
     message: str
-    status: str
+    status: EnumValue
     submitted_at: datetime
     reviewed_at: Optional[datetime]
     reviewed_by: Optional[str]
     admin_notes: Optional[str]
+    reconciled_attendance: Optional[int] = None  # attendance rows switched to (or back from) excused by this review
     
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class AbsenceExcuseBatchResult(BaseModel):
+    updated: int
+    reconciled_attendance: int
+    excuses: List[AbsenceExcuseDetailResponse]
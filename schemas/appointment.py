@@ -1,6 +1,7 @@
-from pydantic import BaseModel
-from datetime import datetime
+from pydantic import BaseModel, Field, validator
+from datetime import datetime, date, time
 from enum import Enum
+from typing import List
 
 class AppointmentStatus(str, Enum):
     PENDING = "Pending"
@@ -13,10 +14,55 @@ class TeacherAvailabilityCreate(BaseModel):
     start_time: datetime
     end_time: datetime
 
+class RecurringAvailabilityCreate(BaseModel):
+    weekdays: List[int] = Field(..., min_length=1, description="Weekdays to repeat on (0=Monday ... 6=Sunday)")
+    start_time: time
+    end_time: time
+    slot_minutes: int = Field(15, ge=5, le=240)
+    start_date: date
+    end_date: date
+    skip_holidays: bool = True
+
+    @validator('weekdays')
+    def validate_weekdays(cls, v):
+        if any(day < 0 or day > 6 for day in v):
+            raise ValueError('weekdays must be between 0 (Monday) and 6 (Sunday)')
+        return sorted(set(v))
+
+    @validator('end_time')
+    def end_time_after_start_time(cls, v, values):
+        if 'start_time' in values and v <= values['start_time']:
+            raise ValueError('end_time must be after start_time')
+        return v
+
+    @validator('end_date')
+    def end_date_after_start_date(cls, v, values):
+        if 'start_date' in values and v < values['start_date']:
+            raise ValueError('end_date must be on or after start_date')
+        return v
+
+class RecurringAvailabilityResult(BaseModel):
+    created_count: int
+    skipped_existing: int
+    skipped_holidays: int
+
 class AppointmentCreate(BaseModel):
     availability_id: int
     reason: str | None = None
 
+class ConferencePreferenceCreate(BaseModel):
+    conference_date: date
+    teacher_ids: List[int] = Field(..., min_length=1, max_length=20)
+
+class ConferenceScheduleRequest(BaseModel):
+    conference_date: date
+    dry_run: bool = False
+
+class ConferenceScheduleResult(BaseModel):
+    families: int
+    scheduled_count: int
+    unscheduled: List[dict]
+
 class MeetingSummaryCreate(BaseModel):
     appointment_id: int
     notes: str
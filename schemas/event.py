@@ -1,6 +1,7 @@
 from pydantic import BaseModel, Field, validator
 from typing import Optional, List
 from datetime import datetime
+from utils.serialization import EnumValue
 
 # ==================== Event Schemas ====================
 
@@ -63,11 +64,11 @@ class EventResponse(BaseModel):
     id: int
     title: str
     description: Optional[str]
-    event_type: str
+    event_type: EnumValue
     start_date: datetime
     end_date: datetime
     location: Optional[str]
-    target_audience: str
+    target_audience: EnumValue
     target_grade_levels: Optional[str]
     requires_rsvp: bool
     max_participants: Optional[int]
@@ -88,11 +89,11 @@ class EventDetailResponse(BaseModel):
     id: int
     title: str
     description: Optional[str]
-    event_type: str
+    event_type: EnumValue
     start_date: datetime
     end_date: datetime
     location: Optional[str]
-    target_audience: str
+    target_audience: EnumValue
     target_grade_levels: Optional[str]
     requires_rsvp: bool
     max_participants: Optional[int]
@@ -109,7 +110,7 @@ class EventDetailResponse(BaseModel):
     total_rsvps: int
     attending_count: int
     available_spots: Optional[int]
-    user_rsvp_status: Optional[str]
+    user_rsvp_status: Optional[EnumValue]
     
     class Config:
         from_attributes = True
@@ -144,7 +145,7 @@ class RSVPResponse(BaseModel):
     event_id: int
     user_id: int
     student_id: Optional[int]
-    status: str
+    status: EnumValue
     response_date: datetime
     notes: Optional[str]
     user_name: Optional[str]
@@ -2,8 +2,11 @@
 # ============================================================
 # schemas/fees.py
 # ============================================================
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 from datetime import date
+from typing import List, Optional
+
+from utils.enums import GradeLevel
 
 class FeeRecordCreate(BaseModel):
     student_id: int
@@ -24,3 +27,34 @@ class FeeRecordResponse(BaseModel):
     class Config:
         from_attributes = True
 
+class FeePlanCreate(BaseModel):
+    grade_level: GradeLevel
+    academic_year: str
+    fee_type: str
+    amount: float = Field(gt=0)
+    due_date: date
+
+class FeePlanResponse(BaseModel):
+    id: int
+    grade_level: GradeLevel
+    academic_year: str
+    fee_type: str
+    amount: float
+    due_date: date
+    
+    class Config:
+        from_attributes = True
+
+class FeePlanGenerate(BaseModel):
+    academic_year: str
+    grade_level: Optional[GradeLevel] = None
+
+class FeePlanGenerateResult(BaseModel):
+    plans: int
+    created: int
+    existing: int
+    students: int
+
+class FeePaymentRequest(BaseModel):
+    fee_ids: List[int] = Field(min_length=1, max_length=100)
+    payment_method: str
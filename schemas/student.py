@@ -2,6 +2,7 @@ from pydantic import BaseModel, EmailStr
 from typing import Optional
 from datetime import date
 from utils.enums import GradeLevel
+from utils.serialization import IsoDate
 
 class StudentCreate(BaseModel):
     firstName: str
@@ -20,7 +21,7 @@ class StudentResponse(BaseModel):
     lastName: str
     email: str
     student_number: str
-    date_of_birth: str
+    date_of_birth: IsoDate
     grade_level: GradeLevel
     class_id: Optional[int]
     
@@ -0,0 +1,184 @@
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from html import escape
+from typing import List, Optional
+
+from sqlalchemy import case, exists, func, insert, select
+from sqlalchemy.orm import Session, aliased
+
+from config import CHRONIC_ABSENCE_WINDOW_DAYS, CHRONIC_ABSENCE_THRESHOLD, CHRONIC_ABSENCE_COOLOFF_DAYS
+from models import User, Student, Parent, StudentParent, Class, Attendance, AbsenceAlert
+from services.email_service import email_service
+from utils.enums import AttendanceStatus
+
+
+def find_chronic_absences(
+    db: Session,
+    as_of: Optional[date] = None,
+    window_days: int = CHRONIC_ABSENCE_WINDOW_DAYS,
+    threshold: int = CHRONIC_ABSENCE_THRESHOLD
+) -> List[dict]:
+    """
+    Students who missed (absent or excused) at least `threshold` of the last
+    `window_days` school days up to `as_of`. School days are the dates with
+    any attendance recorded. Set-based: the window start is one query over
+    distinct dates; counts and the longest run of consecutive missed days
+    (gaps and islands over two row_number() windows) come from one more.
+    """
+    as_of = as_of or date.today()
+    school_days = select(Attendance.date.label("day"))\
+        .where(Attendance.date <= as_of)\
+        .distinct()\
+        .order_by(Attendance.date.desc())\
+        .limit(window_days)\
+        .subquery()
+    window_start = db.execute(select(func.min(school_days.c.day))).scalar()
+    if window_start is None:
+        return []
+
+    missed = case((Attendance.status.in_([AttendanceStatus.ABSENT, AttendanceStatus.EXCUSED]), 1), else_=0)
+    days = select(
+        Attendance.student_id,
+        Attendance.status,
+        missed.label("missed"),
+        func.row_number().over(partition_by=Attendance.student_id, order_by=Attendance.date).label("day_number"),
+        func.row_number().over(partition_by=(Attendance.student_id, missed), order_by=Attendance.date).label("run_number")
+    ).where(Attendance.date.between(window_start, as_of), Attendance.student_id.isnot(None)).subquery()
+
+    # Consecutive missed days share day_number - run_number
+    runs = select(days.c.student_id, func.count().label("length"))\
+        .where(days.c.missed == 1)\
+        .group_by(days.c.student_id, days.c.day_number - days.c.run_number)\
+        .subquery()
+    streaks = select(runs.c.student_id, func.max(runs.c.length).label("longest_streak"))\
+        .group_by(runs.c.student_id)\
+        .subquery()
+    totals = select(
+        days.c.student_id,
+        func.count().label("school_days"),
+        func.sum(days.c.missed).label("missed_days"),
+        func.sum(case((days.c.status == AttendanceStatus.ABSENT, 1), else_=0)).label("unexcused_days")
+    ).group_by(days.c.student_id)\
+        .having(func.sum(days.c.missed) >= threshold)\
+        .subquery()
+
+    rows = db.execute(
+        select(totals, streaks.c.longest_streak)
+        .join(streaks, streaks.c.student_id == totals.c.student_id)
+        .order_by(totals.c.student_id)
+    ).all()
+    return [{
+        "student_id": row.student_id,
+        "school_days": row.school_days,
+        "missed_days": row.missed_days,
+        "unexcused_days": row.unexcused_days,
+        "longest_streak": row.longest_streak,
+        "window_start": window_start,
+        "as_of": as_of
+    } for row in rows]
+
+
+def _render(parent_name: str, children: List[dict]) -> tuple:
+    subject = "Attendance notice" if len(children) == 1 else f"Attendance notice for {len(children)} children"
+    items = "".join(
+        f"<li>{escape(child['name'])} ({escape(child['class_name'] or '-')}): missed {child['missed_days']} of the last "
+        f"{child['school_days']} school days, {child['unexcused_days']} without an excuse, "
+        f"up to {child['longest_streak']} days in a row</li>"
+        for child in children
+    )
+    html = f"""
+    <p>Dear {escape(parent_name)},</p>
+    <p>Our records show frequent absences since {children[0]['window_start']:%d.%m.%Y}:</p>
+    <ul>{items}</ul>
+    <p>Please submit absence excuses where they are missing, or contact the class teacher.</p>
+    """
+    text = "\n".join(
+        f"{child['name']}: missed {child['missed_days']} of {child['school_days']} school days"
+        for child in children
+    )
+    return subject, html, text
+
+
+async def send_absence_alerts(
+    db: Session,
+    as_of: Optional[date] = None,
+    window_days: int = CHRONIC_ABSENCE_WINDOW_DAYS,
+    threshold: int = CHRONIC_ABSENCE_THRESHOLD,
+    cooloff_days: int = CHRONIC_ABSENCE_COOLOFF_DAYS,
+    dry_run: bool = False
+) -> dict:
+    """
+    Email each parent of a flagged student once, covering all their flagged
+    children, unless they were alerted within `cooloff_days`. Sent alerts
+    are logged in absence_alerts, which is also the cool-off check.
+    """
+    flagged = {row["student_id"]: row for row in find_chronic_absences(db, as_of, window_days, threshold)}
+    if not flagged:
+        return {"students": 0, "parents": 0, "sent": 0, "cooling_off": 0}
+
+    now = datetime.now(timezone.utc)
+    recently_alerted = exists().where(
+        AbsenceAlert.parent_id == Parent.id,
+        AbsenceAlert.sent_at >= now - timedelta(days=cooloff_days)
+    )
+    child = aliased(User)
+    recipients = db.query(
+        Parent.id.label("parent_id"),
+        User.email,
+        User.firstName,
+        User.lastName,
+        StudentParent.student_id,
+        child.firstName.label("child_first_name"),
+        child.lastName.label("child_last_name"),
+        Class.name.label("class_name"),
+        recently_alerted.label("cooling_off")
+    ).join(StudentParent, StudentParent.parent_id == Parent.id)\
+        .join(User, User.id == Parent.user_id)\
+        .join(Student, Student.id == StudentParent.student_id)\
+        .join(child, child.id == Student.user_id)\
+        .outerjoin(Class, Class.id == Student.class_id)\
+        .filter(StudentParent.student_id.in_(flagged))\
+        .order_by(Parent.id, StudentParent.student_id)\
+        .all()
+
+    by_parent = defaultdict(list)
+    cooling_off = set()
+    names = {}
+    for row in recipients:
+        if row.cooling_off:
+            cooling_off.add(row.parent_id)
+            continue
+        names[row.parent_id] = (row.email, f"{row.firstName} {row.lastName}")
+        by_parent[row.parent_id].append({
+            **flagged[row.student_id],
+            "name": f"{row.child_first_name} {row.child_last_name}",
+            "class_name": row.class_name
+        })
+
+    parent_ids = list(by_parent)
+    messages = []
+    for parent_id in parent_ids:
+        email, parent_name = names[parent_id]
+        messages.append((email, *_render(parent_name, by_parent[parent_id])))
+
+    sent = [False] * len(messages) if dry_run else await email_service.send_bulk(messages)
+    log = [{
+        "parent_id": parent_id,
+        "student_id": entry["student_id"],
+        "missed_days": entry["missed_days"],
+        "school_days": entry["school_days"],
+        "longest_streak": entry["longest_streak"],
+        "window_start": entry["window_start"],
+        "as_of": entry["as_of"],
+        "sent_at": now
+    } for parent_id, ok in zip(parent_ids, sent) if ok for entry in by_parent[parent_id]]
+    if log:
+        db.execute(insert(AbsenceAlert), log)
+        db.commit()
+
+    return {
+        "students": len(flagged),
+        "parents": len(parent_ids),
+        "sent": sum(sent),
+        "cooling_off": len(cooling_off)
+    }
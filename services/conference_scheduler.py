@@ -0,0 +1,110 @@
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Tuple
+
+# (availability_id, teacher_id, start, end)
+Slot = Tuple[int, int, datetime, datetime]
+
+UNSCHEDULED_PENALTY = 10 ** 9
+
+
+def _overlaps(start, end, busy) -> bool:
+    return any(start < b_end and b_start < end for b_start, b_end in busy)
+
+
+def _gap(start, end, block) -> float:
+    """Seconds between a candidate slot and the family's current block."""
+    block_start = min(b[0] for b in block)
+    block_end = max(b[1] for b in block)
+    return max(0, (block_start - end).total_seconds(), (start - block_end).total_seconds())
+
+
+def _plan_family(teachers, free_slots, anchor, busy):
+    blocked = list(busy)
+    block = []
+    picks = []
+    for teacher_id in teachers:
+        best = None
+        for slot in free_slots[teacher_id]:
+            start, end = slot[2], slot[3]
+            if _overlaps(start, end, blocked):
+                continue
+            if block:
+                key = (_gap(start, end, block), start)
+            else:
+                key = (abs((start - anchor).total_seconds()), start)
+            if best is None or key < best[0]:
+                best = (key, slot)
+        if best:
+            picks.append(best[1])
+            blocked.append((best[1][2], best[1][3]))
+            block.append((best[1][2], best[1][3]))
+
+    missing = len(teachers) - len(picks)
+    if not picks:
+        return UNSCHEDULED_PENALTY * missing, picks
+    span = (max(p[3] for p in picks) - min(p[2] for p in picks)).total_seconds()
+    idle = span - sum((p[3] - p[2]).total_seconds() for p in picks)
+    return UNSCHEDULED_PENALTY * missing + idle, picks
+
+
+def schedule_conferences(
+    slots: Iterable[Slot],
+    preferences: Dict[int, List[int]],
+    busy: Dict[int, List[Tuple[datetime, datetime]]] = None
+):
+    """
+    Assign every family (parent_id -> requested teacher ids) one slot per teacher,
+    never double-booking a slot or a family and keeping each family's meetings
+    as close to back-to-back as possible.
+
+    Families with the most requests are placed first; for each family every free
+    start time of its scarcest teacher is tried as an anchor and the plan with the
+    least idle time between meetings wins.
+
+    Returns (assignments, unscheduled) as lists of (parent_id, availability_id)
+    and (parent_id, teacher_id).
+    """
+    busy = busy or {}
+    free_slots = defaultdict(list)
+    for slot in slots:
+        free_slots[slot[1]].append(slot)
+    for teacher_slots in free_slots.values():
+        teacher_slots.sort(key=lambda s: s[2])
+
+    demand = defaultdict(int)
+    for teacher_ids in preferences.values():
+        for teacher_id in set(teacher_ids):
+            demand[teacher_id] += 1
+
+    def scarcity(teacher_id):
+        return len(free_slots[teacher_id]) / max(demand[teacher_id], 1)
+
+    families = sorted(
+        preferences.items(),
+        key=lambda item: (-len(set(item[1])), min((scarcity(t) for t in set(item[1])), default=0))
+    )
+
+    assignments = []
+    unscheduled = []
+    for parent_id, teacher_ids in families:
+        teachers = sorted(set(teacher_ids), key=scarcity)
+        family_busy = busy.get(parent_id, [])
+
+        anchor_teacher = next((t for t in teachers if free_slots[t]), None)
+        anchors = [s[2] for s in free_slots[anchor_teacher]] if anchor_teacher else []
+        best_cost, best_picks = None, []
+        for anchor in dict.fromkeys(anchors):
+            cost, picks = _plan_family(teachers, free_slots, anchor, family_busy)
+            if best_cost is None or cost < best_cost:
+                best_cost, best_picks = cost, picks
+            if cost == 0:
+                break
+
+        for slot in best_picks:
+            free_slots[slot[1]].remove(slot)
+            assignments.append((parent_id, slot[0]))
+        placed = {slot[1] for slot in best_picks}
+        unscheduled.extend((parent_id, t) for t in teachers if t not in placed)
+
+    return assignments, unscheduled
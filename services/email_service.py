@@ -3,7 +3,7 @@ import os
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
-from typing import Optional
+from typing import Iterable, List, Optional, Tuple
 
 class EmailService:
     def __init__(self):
@@ -22,14 +22,7 @@ class EmailService:
         text_content: Optional[str] = None
     ) -> bool:
         try:
-            msg = MIMEMultipart("alternative")
-            msg["From"] = f"{self.from_name} <{self.from_email}>"
-            msg["To"] = to_email
-            msg["Subject"] = subject
-
-            if text_content:
-                msg.attach(MIMEText(text_content, "plain"))
-            msg.attach(MIMEText(html_content, "html"))
+            msg = self._message(to_email, subject, html_content, text_content)
 
             with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
                 server.starttls()
@@ -42,6 +35,41 @@ class EmailService:
             print(f"❌ Failed to send email to {to_email}: {e}")
             return False
 
+    def _message(self, to_email: str, subject: str, html_content: str, text_content: Optional[str] = None) -> MIMEMultipart:
+        msg = MIMEMultipart("alternative")
+        msg["From"] = f"{self.from_name} <{self.from_email}>"
+        msg["To"] = to_email
+        msg["Subject"] = subject
+        if text_content:
+            msg.attach(MIMEText(text_content, "plain"))
+        msg.attach(MIMEText(html_content, "html"))
+        return msg
+
+    async def send_bulk(self, messages: Iterable[Tuple[str, str, str, Optional[str]]]) -> List[bool]:
+        """
+        Send (to, subject, html, text) messages over one SMTP connection.
+        Returns one success flag per message; a failed recipient does not
+        stop the rest of the batch.
+        """
+        messages = list(messages)
+        results = [False] * len(messages)
+        if not messages:
+            return results
+        try:
+            with smtplib.SMTP(self.smtp_host, self.smtp_port) as server:
+                server.starttls()
+                server.login(self.smtp_user, self.smtp_password)
+                for i, (to_email, subject, html_content, text_content) in enumerate(messages):
+                    try:
+                        server.send_message(self._message(to_email, subject, html_content, text_content))
+                        results[i] = True
+                    except smtplib.SMTPException as e:
+                        print(f"❌ Failed to send email to {to_email}: {e}")
+        except Exception as e:
+            print(f"❌ Email batch failed after {sum(results)} of {len(messages)} messages: {e}")
+        print(f"✅ Sent {sum(results)} of {len(messages)} emails")
+        return results
+
     async def send_reset_password_email(self, to_email: str, reset_link: str):
         subject = "Password Reset Request"
         html_content = f"""
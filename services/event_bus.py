@@ -0,0 +1,206 @@
+import asyncio
+import json
+from typing import Iterable, Optional
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import text
+
+from config import EVENT_BUS_CHANNEL
+from database import engine
+from utils.response_cache import response_cache
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+MAX_NOTIFY_PAYLOAD = 7900
+LISTEN_RETRY_SECONDS = 5
+
+
+class Subscription:
+    def __init__(self, user_id: int, roles: Iterable[str], max_queued: int = 100):
+        self.user_id = user_id
+        self.roles = set(roles)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queued)
+
+    def wants(self, message: dict) -> bool:
+        return (
+            message.get("broadcast")
+            or self.user_id in message.get("user_ids", ())
+            or bool(self.roles.intersection(message.get("roles", ())))
+        )
+
+    async def get(self) -> dict:
+        return await self.queue.get()
+
+
+class EventBus:
+    """
+    In-process pub/sub for the `/stream` SSE endpoint.
+
+    `publish()` can be called from async handlers and from the threadpool
+    that runs plain `def` routes. Messages are addressed to user ids, roles,
+    or everyone. On Postgres every message goes through NOTIFY and is
+    delivered by each worker's LISTEN connection, so subscribers on any
+    worker receive it; elsewhere it is delivered locally.
+
+    `notify()` sends internal messages the same way, handled by the
+    function registered with `on()` in every worker instead of going to
+    subscribers.
+    """
+
+    def __init__(self, channel: str):
+        self.channel = channel
+        self._subscribers = set()
+        self._handlers = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._listen_conn = None
+        self.use_notify = engine.dialect.name == "postgresql"
+
+    # ---------- subscribers ----------
+
+    def subscribe(self, user_id: int, roles: Iterable[str]) -> Subscription:
+        subscription = Subscription(user_id, roles)
+        self._subscribers.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription):
+        self._subscribers.discard(subscription)
+
+    def on(self, event_type: str, handler):
+        """Run `handler(data)` in every worker for internal messages of `event_type`."""
+        self._handlers[event_type] = handler
+
+    def _dispatch(self, message: dict):
+        if message.get("internal"):
+            handler = self._handlers.get(message["type"])
+            if handler:
+                handler(message["data"])
+            return
+        for subscription in list(self._subscribers):
+            if subscription.wants(message):
+                try:
+                    subscription.queue.put_nowait(message)
+                except asyncio.QueueFull:
+                    # Slow client; it can catch up through /sync on reconnect
+                    pass
+
+    # ---------- publishing ----------
+
+    def publish(
+        self,
+        event_type: str,
+        data: dict,
+        user_ids: Iterable[Optional[int]] = (),
+        roles: Iterable[str] = (),
+        broadcast: bool = False
+    ):
+        """Fire-and-forget; call after the change has been committed."""
+        message = {
+            "type": event_type,
+            "data": jsonable_encoder(data),
+            "user_ids": sorted({user_id for user_id in user_ids if user_id is not None}),
+            "roles": sorted(set(roles)),
+            "broadcast": broadcast
+        }
+        if not (message["user_ids"] or message["roles"] or broadcast):
+            return
+        if self.use_notify and self._notify(message):
+            return
+        self._deliver(message)
+
+    def notify(self, event_type: str, data: dict):
+        """
+        Internal message for the `on()` handlers of the other workers;
+        Postgres only, since elsewhere there is no other worker to reach.
+        The sending worker receives it too.
+        """
+        if self.use_notify:
+            self._notify({"type": event_type, "data": jsonable_encoder(data), "internal": True})
+
+    def _notify(self, message: dict) -> bool:
+        payload = json.dumps(message, separators=(",", ":"))
+        if len(payload.encode()) > MAX_NOTIFY_PAYLOAD:
+            return False
+        try:
+            with engine.connect() as conn:
+                conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": self.channel, "payload": payload})
+                conn.commit()
+            return True
+        except Exception as e:
+            print(f"Event bus NOTIFY failed: {e}")
+            return False
+
+    def _deliver(self, message: dict):
+        if self._loop is None or self._loop.is_closed():
+            return
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is self._loop:
+            self._dispatch(message)
+        else:
+            self._loop.call_soon_threadsafe(self._dispatch, message)
+
+    # ---------- lifecycle ----------
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        if self.use_notify:
+            self._listen()
+
+    async def stop(self):
+        self._close_listener()
+        self._loop = None
+
+    def _listen(self):
+        if self._loop is None:
+            return
+        try:
+            raw = engine.raw_connection()
+            raw.detach()
+            conn = raw.driver_connection
+            conn.set_session(autocommit=True)
+            with conn.cursor() as cursor:
+                cursor.execute(f'LISTEN "{self.channel}"')
+            self._listen_conn = conn
+            self._loop.add_reader(conn.fileno(), self._on_notify)
+        except Exception as e:
+            print(f"Event bus LISTEN failed, retrying in {LISTEN_RETRY_SECONDS}s: {e}")
+            self._close_listener()
+            self._loop.call_later(LISTEN_RETRY_SECONDS, self._listen)
+
+    def _on_notify(self):
+        conn = self._listen_conn
+        try:
+            conn.poll()
+        except Exception as e:
+            print(f"Event bus connection lost, reconnecting: {e}")
+            self._close_listener()
+            self._loop.call_later(LISTEN_RETRY_SECONDS, self._listen)
+            return
+        while conn.notifies:
+            notify = conn.notifies.pop(0)
+            try:
+                self._dispatch(json.loads(notify.payload))
+            except ValueError:
+                print(f"Event bus dropped malformed payload on {notify.channel}")
+
+    def _close_listener(self):
+        conn, self._listen_conn = self._listen_conn, None
+        if conn is None:
+            return
+        try:
+            if self._loop and not self._loop.is_closed():
+                self._loop.remove_reader(conn.fileno())
+        except Exception:
+            pass
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+event_bus = EventBus(EVENT_BUS_CHANNEL)
+
+# The in-process response cache is per worker; pass tag invalidations on to the others
+event_bus.on("cache.invalidate", lambda data: response_cache.invalidate_local(data["tags"]))
+response_cache.set_broadcast(lambda tags: event_bus.notify("cache.invalidate", {"tags": tags}))
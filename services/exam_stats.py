@@ -0,0 +1,128 @@
+from typing import Iterable, Optional
+
+import numpy as np
+import orjson
+from sqlalchemy.orm import Session
+
+from models import Exam, Grade
+from utils.grading import PASSING_GRADE, german_grades
+from utils.response_cache import response_cache
+
+
+def exam_stats_tag(exam_id: int) -> str:
+    return f"exam_stats:{exam_id}"
+
+
+def class_exam_stats_tag(class_id: int) -> str:
+    return f"exam_stats:class:{class_id}"
+
+
+def invalidate_exam_stats(db: Session, exam_ids: Iterable[Optional[int]]):
+    """Drop memoized stats of these exams and of the classes they belong to."""
+    exam_ids = {exam_id for exam_id in exam_ids if exam_id is not None}
+    if not exam_ids:
+        return
+    class_ids = db.query(Exam.class_id)\
+        .filter(Exam.id.in_(exam_ids), Exam.class_id.isnot(None))\
+        .distinct()\
+        .all()
+    response_cache.invalidate(
+        *(exam_stats_tag(exam_id) for exam_id in exam_ids),
+        *(class_exam_stats_tag(class_id) for class_id, in class_ids)
+    )
+
+
+def _round(value) -> Optional[float]:
+    return None if value is None or np.isnan(value) else round(float(value), 2)
+
+
+def describe_scores(scores: np.ndarray, max_score: float) -> dict:
+    """Descriptive statistics of one exam's scores, plus a grade 1-6 histogram."""
+    scores = np.asarray(scores, dtype=float)
+    count = len(scores)
+    percents = scores / max_score * 100 if max_score else np.full(count, np.nan)
+    grades = german_grades(percents)
+    histogram = np.bincount(grades, minlength=7)[1:]
+    if count:
+        q1, median, q3 = np.percentile(scores, [25, 50, 75])
+        summary = {
+            "mean": scores.mean(),
+            "median": median,
+            "std": scores.std(),
+            "min": scores.min(),
+            "max": scores.max(),
+            "q1": q1,
+            "q3": q3,
+            "mean_percent": np.nanmean(percents) if max_score else None
+        }
+    else:
+        summary = dict.fromkeys(("mean", "median", "std", "min", "max", "q1", "q3", "mean_percent"))
+    graded = int(histogram.sum())
+    return {
+        "count": count,
+        **{key: _round(value) for key, value in summary.items()},
+        "histogram": {str(grade): int(n) for grade, n in enumerate(histogram, start=1)},
+        "pass_rate": _round(histogram[:PASSING_GRADE].sum() / graded * 100) if graded else None
+    }
+
+
+def _exam_summary(exam) -> dict:
+    return {
+        "exam_id": exam.id,
+        "title": exam.title,
+        "exam_date": exam.exam_date.isoformat(),
+        "course_id": exam.course_id,
+        "class_id": exam.class_id,
+        "max_score": exam.max_score
+    }
+
+
+def get_exam_stats(db: Session, exam: Exam) -> bytes:
+    """JSON stats for one exam, memoized until one of its grades changes."""
+    key = f"exam-stats:{exam.id}"
+    body = response_cache.load(key)
+    if body is None:
+        scores = np.array([score for score, in db.query(Grade.score).filter(Grade.exam_id == exam.id)], dtype=float)
+        body = orjson.dumps({**_exam_summary(exam), **describe_scores(scores, exam.max_score)})
+        tags = [exam_stats_tag(exam.id)]
+        if exam.class_id:
+            tags.append(class_exam_stats_tag(exam.class_id))
+        response_cache.store(key, body, tags)
+    return body
+
+
+def get_class_exam_stats(db: Session, class_id: int) -> bytes:
+    """
+    Per-exam stats for every exam of a class, from one grade query split by
+    exam, and the distribution of all results as percentages.
+    """
+    key = f"exam-stats:class:{class_id}"
+    body = response_cache.load(key)
+    if body is not None:
+        return body
+
+    exams = db.query(Exam).filter(Exam.class_id == class_id).order_by(Exam.exam_date, Exam.id).all()
+    rows = db.query(Grade.exam_id, Grade.score)\
+        .join(Exam, Exam.id == Grade.exam_id)\
+        .filter(Exam.class_id == class_id)\
+        .order_by(Grade.exam_id)\
+        .all()
+    exam_ids = np.array([row[0] for row in rows], dtype=np.int64)
+    scores = np.array([row[1] for row in rows], dtype=float)
+    bounds = {exam.id: np.searchsorted(exam_ids, [exam.id, exam.id + 1]) for exam in exams}
+
+    per_exam = []
+    percents = []
+    for exam in exams:
+        start, end = bounds[exam.id]
+        per_exam.append({**_exam_summary(exam), **describe_scores(scores[start:end], exam.max_score)})
+        if exam.max_score:
+            percents.append(scores[start:end] / exam.max_score * 100)
+
+    body = orjson.dumps({
+        "class_id": class_id,
+        "overall_percent": describe_scores(np.concatenate(percents) if percents else np.array([]), 100),
+        "exams": per_exam
+    })
+    response_cache.store(key, body, [class_exam_stats_tag(class_id)])
+    return body
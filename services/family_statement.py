@@ -0,0 +1,108 @@
+import csv
+import io
+from typing import Iterator
+
+import orjson
+from sqlalchemy import case, func
+from sqlalchemy.orm import Session
+
+from models import User, Student, StudentParent, FeeRecord
+from repositories.fees import student_fees_tag, parent_statement_tag
+from utils.response_cache import response_cache
+
+CSV_COLUMNS = ("fee_id", "student_id", "student_name", "academic_year", "fee_type", "amount", "due_date", "is_paid", "paid_date", "payment_method")
+
+
+def _money(value) -> float:
+    return round(float(value or 0), 2)
+
+
+def _build(db: Session, parent_id: int) -> dict:
+    children = db.query(Student.id, User.firstName, User.lastName)\
+        .join(StudentParent, StudentParent.student_id == Student.id)\
+        .join(User, User.id == Student.user_id)\
+        .filter(StudentParent.parent_id == parent_id)\
+        .order_by(Student.id)\
+        .all()
+    names = {child.id: f"{child.firstName} {child.lastName}" for child in children}
+    student_ids = list(names)
+
+    paid_amount = func.sum(case((FeeRecord.is_paid, FeeRecord.amount), else_=0))
+    summary = db.query(
+        FeeRecord.academic_year,
+        FeeRecord.fee_type,
+        func.count(FeeRecord.id).label("count"),
+        func.sum(FeeRecord.amount).label("amount"),
+        paid_amount.label("paid")
+    ).filter(FeeRecord.student_id.in_(student_ids))\
+        .group_by(FeeRecord.academic_year, FeeRecord.fee_type)\
+        .order_by(FeeRecord.academic_year.desc(), FeeRecord.fee_type)\
+        .all()
+    items = db.query(FeeRecord)\
+        .filter(FeeRecord.student_id.in_(student_ids))\
+        .order_by(FeeRecord.academic_year.desc(), FeeRecord.due_date, FeeRecord.id)\
+        .all()
+
+    total = sum(row.amount or 0 for row in summary)
+    paid = sum(row.paid or 0 for row in summary)
+    return {
+        "parent_id": parent_id,
+        "children": [{"student_id": student_id, "name": name} for student_id, name in names.items()],
+        "totals": {"amount": _money(total), "paid": _money(paid), "outstanding": _money(total - paid)},
+        "summary": [{
+            "academic_year": row.academic_year,
+            "fee_type": row.fee_type,
+            "count": row.count,
+            "amount": _money(row.amount),
+            "paid": _money(row.paid),
+            "outstanding": _money((row.amount or 0) - (row.paid or 0))
+        } for row in summary],
+        "items": [{
+            "fee_id": fee.id,
+            "student_id": fee.student_id,
+            "student_name": names.get(fee.student_id),
+            "academic_year": fee.academic_year,
+            "fee_type": fee.fee_type,
+            "amount": fee.amount,
+            "due_date": fee.due_date,
+            "is_paid": bool(fee.is_paid),
+            "paid_date": fee.paid_date,
+            "payment_method": fee.payment_method
+        } for fee in items]
+    }
+
+
+def get_family_statement(db: Session, parent_id: int) -> bytes:
+    """
+    JSON statement of all fees of a parent's children: totals, sums per
+    academic year and fee type (grouped in SQL) and the line items. Cached
+    per parent until a fee of one of the children changes or a child is
+    linked.
+    """
+    key = f"statement:{parent_id}"
+    body = response_cache.load(key)
+    if body is None:
+        statement = _build(db, parent_id)
+        body = orjson.dumps(statement)
+        tags = [parent_statement_tag(parent_id)]
+        tags.extend(student_fees_tag(child["student_id"]) for child in statement["children"])
+        response_cache.store(key, body, tags)
+    return body
+
+
+def statement_csv(statement: dict) -> Iterator[str]:
+    """The statement's line items as CSV, one chunk per row."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+
+    def flush() -> str:
+        chunk = buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+        return chunk
+
+    writer.writerow(CSV_COLUMNS)
+    yield flush()
+    for item in statement["items"]:
+        writer.writerow([item[column] if item[column] is not None else "" for column in CSV_COLUMNS])
+        yield flush()
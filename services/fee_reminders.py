@@ -0,0 +1,61 @@
+from datetime import date
+from html import escape
+from typing import List, Optional
+
+from sqlalchemy.orm import Session
+
+from repositories.fees import get_overdue_families
+from services.email_service import email_service
+
+REMINDER_BATCH_SIZE = 200
+
+
+def _render(family: dict, as_of: date) -> tuple:
+    rows = "".join(
+        f"<tr><td>{escape(fee['student_name'])}</td><td>{escape(fee['fee_type'])}</td>"
+        f"<td>{escape(fee['academic_year'])}</td><td>{fee['due_date']:%d.%m.%Y}</td>"
+        f"<td style=\"text-align:right\">{fee['amount']:.2f}</td></tr>"
+        for fee in family["fees"]
+    )
+    html = f"""
+    <p>Dear {escape(family['name'] or 'parent')},</p>
+    <p>As of {as_of:%d.%m.%Y} the following fees are overdue:</p>
+    <table>
+      <tr><th>Child</th><th>Fee</th><th>Year</th><th>Due</th><th>Amount</th></tr>
+      {rows}
+      <tr><td colspan="4"><strong>Total</strong></td><td style="text-align:right"><strong>{family['amount_due']:.2f}</strong></td></tr>
+    </table>
+    <p>Please settle the outstanding amount, or contact the office if you have already paid.</p>
+    """
+    text = "\n".join(
+        f"{fee['student_name']} - {fee['fee_type']} ({fee['academic_year']}), due {fee['due_date']}: {fee['amount']:.2f}"
+        for fee in family["fees"]
+    ) + f"\nTotal: {family['amount_due']:.2f}"
+    return f"Overdue fees: {family['amount_due']:.2f} outstanding", html, text
+
+
+async def send_fee_reminders(
+    db: Session,
+    as_of: Optional[date] = None,
+    batch_size: int = REMINDER_BATCH_SIZE,
+    dry_run: bool = False
+) -> dict:
+    """
+    One statement email per parent with overdue fees, covering all their
+    children. Families are read a page at a time (two queries per page) and
+    each page goes out over one SMTP connection.
+    """
+    as_of = as_of or date.today()
+    counts = {"parents": 0, "sent": 0, "fees": 0, "no_email": 0}
+    cursor = 0
+    while True:
+        families, cursor = get_overdue_families(db, as_of, batch_size, cursor)
+        reachable: List[dict] = [family for family in families if family["email"]]
+        counts["parents"] += len(families)
+        counts["no_email"] += len(families) - len(reachable)
+        counts["fees"] += sum(family["fee_count"] for family in families)
+        if reachable and not dry_run:
+            messages = [(family["email"], *_render(family, as_of)) for family in reachable]
+            counts["sent"] += sum(await email_service.send_bulk(messages))
+        if cursor is None:
+            return counts
@@ -0,0 +1,110 @@
+import multiprocessing
+import os
+import re
+import threading
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from jinja2 import Environment, FileSystemLoader, select_autoescape
+
+from config import REPORT_CARD_WORKERS
+
+TEMPLATE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "templates")
+FORMATS = ("html", "pdf")
+
+_env: Optional[Environment] = None
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _template():
+    # One Environment per worker process; compiled templates are cached on it
+    global _env
+    if _env is None:
+        _env = Environment(loader=FileSystemLoader(TEMPLATE_DIR), autoescape=select_autoescape(["html"]))
+    return _env.get_template("report_card.html")
+
+
+def _filename(document: dict, extension: str) -> str:
+    slug = re.sub(r"[^A-Za-z0-9]+", "_", document["student"]["name"]).strip("_")
+    return f"{document['class_name']}/{document['student']['student_id']}_{slug}.{extension}"
+
+
+def render_report_card(document: dict, fmt: str = "html") -> Tuple[str, bytes]:
+    """(archive path, file contents) for one student's report card. Runs in a pool worker."""
+    html = _template().render(**document)
+    if fmt == "pdf":
+        try:
+            from weasyprint import HTML
+        except ImportError:
+            raise RuntimeError("PDF report cards need the 'weasyprint' package")
+        return _filename(document, "pdf"), HTML(string=html).write_pdf()
+    return _filename(document, "html"), html.encode()
+
+
+def pdf_available() -> bool:
+    try:
+        import weasyprint  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            # spawn, not fork: the API process runs threads (event bus, threadpool)
+            _pool = ProcessPoolExecutor(
+                max_workers=REPORT_CARD_WORKERS or None,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def shutdown_renderer():
+    global _pool
+    with _pool_lock:
+        pool, _pool = _pool, None
+    if pool is not None:
+        pool.shutdown(wait=False, cancel_futures=True)
+
+
+class _ZipStream:
+    """
+    Write-only file object whose output is drained as it is written. It has
+    no tell()/seek(), so zipfile writes data descriptors instead of going
+    back to patch local headers.
+    """
+
+    def __init__(self):
+        self._chunks: List[bytes] = []
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def flush(self):
+        pass
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def stream_report_cards(documents: Iterable[dict], fmt: str = "html") -> Iterator[bytes]:
+    """
+    Render `documents` across the process pool and yield a zip archive
+    chunk by chunk, one entry per report card in input order, so the first
+    bytes go out while later cards are still rendering.
+    """
+    documents = list(documents)
+    buffer = _ZipStream()
+    results = _get_pool().map(render_report_card, documents, [fmt] * len(documents), chunksize=8)
+    with zipfile.ZipFile(buffer, mode="w", compression=zipfile.ZIP_DEFLATED) as archive:
+        for name, content in results:
+            archive.writestr(name, content)
+            yield buffer.drain()
+    yield buffer.drain()
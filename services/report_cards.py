@@ -0,0 +1,212 @@
+from collections import defaultdict
+from datetime import date
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import orjson
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from models import User, Student, Class, Course, Exam, Grade, Attendance
+from utils.enums import AttendanceStatus
+from utils.grading import GRADE_LABELS, german_grades, term_bounds
+from utils.response_cache import response_cache
+
+
+def report_card_tag(class_id: int) -> str:
+    return f"report_cards:{class_id}"
+
+
+def _cache_key(class_id: int, term: Optional[int]) -> str:
+    return f"report-cards:{class_id}:{term or 'year'}"
+
+
+def invalidate_report_cards(db: Session, student_ids: Iterable[int]):
+    """Drop cached report cards of the classes these students are in."""
+    student_ids = set(student_ids)
+    if not student_ids:
+        return
+    class_ids = db.query(Student.class_id)\
+        .filter(Student.id.in_(student_ids), Student.class_id.isnot(None))\
+        .distinct()\
+        .all()
+    if class_ids:
+        response_cache.invalidate(*(report_card_tag(class_id) for class_id, in class_ids))
+
+
+def _round(value: float) -> Optional[float]:
+    return None if np.isnan(value) else round(float(value), 2)
+
+
+def _compute(db: Session, classes: List[Class], term: Optional[int]) -> Dict[int, dict]:
+    """
+    Report cards for classes sharing an academic year, from one student query
+    and one grade query. Per (student, course) weighted average percentages
+    are bincount sums over the flattened index, so the whole batch is a
+    handful of array operations regardless of how many grades it covers.
+    """
+    start, end = term_bounds(classes[0].academic_year, term)
+    class_ids = [c.id for c in classes]
+
+    students = db.query(Student.id, Student.class_id, User.firstName, User.lastName)\
+        .join(User, User.id == Student.user_id)\
+        .filter(Student.class_id.in_(class_ids))\
+        .order_by(User.lastName, User.firstName, Student.id)\
+        .all()
+    rows = db.query(
+        Grade.student_id,
+        func.coalesce(Grade.course_id, Exam.course_id),
+        Grade.score,
+        Exam.max_score,
+        Exam.weight
+    ).join(Exam, Exam.id == Grade.exam_id)\
+        .join(Student, Student.id == Grade.student_id)\
+        .filter(Student.class_id.in_(class_ids), Exam.exam_date.between(start, end))\
+        .all()
+
+    student_ids = np.array([s.id for s in students], dtype=np.int64)
+    order = np.argsort(student_ids)
+    n_students = len(students)
+
+    if rows:
+        grade_students, grade_courses, scores, max_scores, weights = (np.array(column) for column in zip(*rows))
+        grade_courses = np.where(grade_courses == None, -1, grade_courses).astype(np.int64)  # noqa: E711
+        course_ids, course_idx = np.unique(grade_courses, return_inverse=True)
+        student_idx = order[np.searchsorted(student_ids, grade_students.astype(np.int64), sorter=order)]
+        weights = np.where(weights == None, 1.0, weights).astype(float)  # noqa: E711
+        with np.errstate(invalid="ignore", divide="ignore"):
+            percents = scores.astype(float) / max_scores.astype(float) * 100
+        valid = ~np.isnan(percents) & (grade_courses >= 0)
+        flat = (student_idx * len(course_ids) + course_idx)[valid]
+        size = n_students * len(course_ids)
+        weighted_sum = np.bincount(flat, weights=(percents * weights)[valid], minlength=size)
+        weight_total = np.bincount(flat, weights=weights[valid], minlength=size)
+    else:
+        course_ids = np.array([], dtype=np.int64)
+        weighted_sum = weight_total = np.zeros(0)
+
+    n_courses = len(course_ids)
+    weight_total = weight_total.reshape(n_students, n_courses)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        averages = np.where(weight_total > 0, weighted_sum.reshape(n_students, n_courses) / weight_total, np.nan)
+    course_grades = german_grades(averages)
+    graded = course_grades > 0
+    graded_count = graded.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average_grade = np.round(np.where(graded, course_grades, 0).sum(axis=1) / graded_count, 2)
+        average_percent = np.where(graded, averages, 0).sum(axis=1) / graded_count
+
+    course_names = dict(db.query(Course.id, Course.name).filter(Course.id.in_(course_ids.tolist())).all())
+    members = defaultdict(list)
+    for i, student in enumerate(students):
+        members[student.class_id].append(i)
+
+    result = {}
+    for class_obj in classes:
+        idx = np.array(members[class_obj.id], dtype=np.intp)
+        columns = np.flatnonzero(graded[idx].any(axis=0)) if len(idx) else np.array([], dtype=np.intp)
+
+        # Competition ranking ("1224") on the average grade; ungraded students are unranked
+        class_averages = average_grade[idx]
+        ranked = np.sort(class_averages[~np.isnan(class_averages)])
+        ranks = np.searchsorted(ranked, class_averages, side="left") + 1
+
+        cards = []
+        for position, i in enumerate(idx):
+            student = students[i]
+            cards.append({
+                "student_id": student.id,
+                "name": f"{student.firstName} {student.lastName}",
+                "courses": [
+                    {
+                        "course_id": int(course_ids[j]),
+                        "average_percent": _round(averages[i, j]),
+                        "grade": int(course_grades[i, j]) or None
+                    }
+                    for j in columns
+                ],
+                "average_grade": _round(average_grade[i]),
+                "average_percent": _round(average_percent[i]),
+                "rank": None if np.isnan(class_averages[position]) else int(ranks[position])
+            })
+
+        result[class_obj.id] = {
+            "class_id": class_obj.id,
+            "class_name": class_obj.name,
+            "grade_level": class_obj.grade_level.value,
+            "academic_year": class_obj.academic_year,
+            "term": term,
+            "period": {"start": start.isoformat(), "end": end.isoformat()},
+            "courses": [{"id": int(course_ids[j]), "name": course_names.get(int(course_ids[j]))} for j in columns],
+            "students": cards
+        }
+    return result
+
+
+def get_report_cards(db: Session, classes: List[Class], term: Optional[int] = None) -> List[dict]:
+    """
+    Report cards for each class, in order. Cached per (class, term) until a
+    grade of one of its students changes; only the misses are computed, in
+    one batch per academic year.
+    """
+    cards = {}
+    missing = defaultdict(list)
+    for class_obj in classes:
+        body = response_cache.load(_cache_key(class_obj.id, term))
+        if body is not None:
+            cards[class_obj.id] = orjson.loads(body)
+        else:
+            missing[class_obj.academic_year].append(class_obj)
+
+    for batch in missing.values():
+        for class_id, card in _compute(db, batch, term).items():
+            response_cache.store(_cache_key(class_id, term), orjson.dumps(card), [report_card_tag(class_id)])
+            cards[class_id] = card
+
+    return [cards[class_obj.id] for class_obj in classes]
+
+
+def _attendance_totals(db: Session, student_ids: List[int], start, end) -> Dict[int, Dict[str, int]]:
+    totals = defaultdict(lambda: dict.fromkeys((status.value for status in AttendanceStatus), 0))
+    if not student_ids:
+        return totals
+    rows = db.query(Attendance.student_id, Attendance.status, func.count(Attendance.id))\
+        .filter(Attendance.student_id.in_(student_ids), Attendance.date.between(start, end))\
+        .group_by(Attendance.student_id, Attendance.status)\
+        .all()
+    for student_id, status, count in rows:
+        totals[student_id][status.value] = count
+    return totals
+
+
+def report_card_documents(db: Session, classes: List[Class], term: Optional[int] = None) -> List[dict]:
+    """One template context per student: the cached report card plus attendance totals for the period."""
+    cards = get_report_cards(db, classes, term)
+    by_period = defaultdict(list)
+    for card in cards:
+        by_period[(card["period"]["start"], card["period"]["end"])].extend(s["student_id"] for s in card["students"])
+    totals = {}
+    for (start, end), student_ids in by_period.items():
+        totals.update(_attendance_totals(db, student_ids, date.fromisoformat(start), date.fromisoformat(end)))
+
+    empty = dict.fromkeys((status.value for status in AttendanceStatus), 0)
+    documents = []
+    for card in cards:
+        course_names = {course["id"]: course["name"] for course in card["courses"]}
+        for student in card["students"]:
+            documents.append({
+                "class_name": card["class_name"],
+                "academic_year": card["academic_year"],
+                "term": card["term"],
+                "period": card["period"],
+                "class_size": len(card["students"]),
+                "student": {
+                    **student,
+                    "courses": [
+                        {**course, "name": course_names.get(course["course_id"]), "label": GRADE_LABELS.get(course["grade"])}
+                        for course in student["courses"]
+                    ]
+                },
+                "attendance": totals.get(student["student_id"], empty)
+            })
+    return documents
@@ -0,0 +1,180 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Optional
+
+import numpy as np
+from sqlalchemy import delete, insert
+from sqlalchemy.orm import Session
+
+from models import Student, Attendance, AbsenceExcuse, ExcuseStatus, Exam, Grade, StudentRiskScore
+from utils.enums import AttendanceStatus
+
+SHORT_WINDOW_DAYS = 14
+LONG_WINDOW_DAYS = 42
+GRADE_WINDOW_DAYS = 120
+
+# Component weights (sum to 1); each component is scaled to 0..1 first
+WEIGHTS = {
+    "absence_rate_short": 0.15,
+    "absence_rate_long": 0.25,
+    "unexcused_absences": 0.20,
+    "late_count": 0.10,
+    "low_grades": 0.15,
+    "grade_trend": 0.15,
+}
+UNEXCUSED_SATURATION = 5      # unexcused days in the long window that count as maximum risk
+LATE_SATURATION = 10          # lates in the long window
+FAILING_PERCENT = 50          # below this the average starts to count
+TREND_SATURATION = 20         # percentage points lost per 30 days
+LEVELS = ((50, "high"), (25, "medium"), (0, "low"))
+
+_DAY_KEY = 1 << 20  # student_id * _DAY_KEY + day ordinal offset gives a sortable (student, day) key
+
+
+def _index(student_ids: np.ndarray, values) -> np.ndarray:
+    return np.searchsorted(student_ids, np.asarray(values, dtype=np.int64))
+
+
+def _covered_by_excuse(db: Session, student_idx: np.ndarray, days: np.ndarray, student_ids: np.ndarray, since: date, as_of: date) -> np.ndarray:
+    """
+    True for each (student, day) inside an approved excuse. Excuses are turned
+    into sorted (student, day) keys; the running maximum of their ends makes
+    one searchsorted per absence enough even when excuses overlap.
+    """
+    excuses = db.query(AbsenceExcuse.student_id, AbsenceExcuse.start_date, AbsenceExcuse.end_date)\
+        .filter(
+            AbsenceExcuse.status == ExcuseStatus.APPROVED,
+            AbsenceExcuse.start_date <= as_of,
+            AbsenceExcuse.end_date >= since
+        ).all()
+    if not excuses or not len(days):
+        return np.zeros(len(days), dtype=bool)
+    excuse_students = _index(student_ids, [e.student_id for e in excuses])
+    origin = since.toordinal()
+    starts = excuse_students * _DAY_KEY + np.array([max(e.start_date, since).toordinal() - origin for e in excuses])
+    ends = excuse_students * _DAY_KEY + np.array([min(e.end_date, as_of).toordinal() - origin for e in excuses])
+    order = np.argsort(starts)
+    starts, ends = starts[order], np.maximum.accumulate(ends[order])
+    keys = student_idx * _DAY_KEY + days
+    position = np.searchsorted(starts, keys, side="right") - 1
+    return (position >= 0) & (ends[np.maximum(position, 0)] >= keys)
+
+
+def compute_risk_scores(db: Session, as_of: Optional[date] = None) -> dict:
+    """
+    Score every student from attendance over the short and long windows,
+    absences not covered by an approved excuse, and the level and trend of
+    their exam percentages. Three queries, then whole-school array math.
+    Returns the columns of `StudentRiskScore` keyed by name.
+    """
+    as_of = as_of or date.today()
+    long_since = as_of - timedelta(days=LONG_WINDOW_DAYS - 1)
+    short_since = as_of - timedelta(days=SHORT_WINDOW_DAYS - 1)
+    grade_since = as_of - timedelta(days=GRADE_WINDOW_DAYS - 1)
+
+    student_ids = np.array(sorted(student_id for student_id, in db.query(Student.id)), dtype=np.int64)
+    n = len(student_ids)
+
+    # Attendance
+    attendance = db.query(Attendance.student_id, Attendance.date, Attendance.status)\
+        .filter(Attendance.date.between(long_since, as_of), Attendance.student_id.isnot(None))\
+        .all()
+    origin = long_since.toordinal()
+    a_students = _index(student_ids, [row.student_id for row in attendance])
+    a_days = np.array([row.date.toordinal() - origin for row in attendance], dtype=np.int64)
+    a_status = np.array([row.status.value for row in attendance], dtype=str)
+
+    absent = a_status == AttendanceStatus.ABSENT.value
+    missed = absent | (a_status == AttendanceStatus.EXCUSED.value)
+    short = a_days >= (short_since - long_since).days
+
+    def per_student(mask):
+        return np.bincount(a_students[mask], minlength=n)
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        absence_rate_long = np.nan_to_num(per_student(missed) / per_student(np.ones(len(missed), dtype=bool)))
+        absence_rate_short = np.nan_to_num(per_student(missed & short) / per_student(short))
+    late_count = per_student(a_status == AttendanceStatus.LATE.value)
+    covered = _covered_by_excuse(db, a_students[absent], a_days[absent], student_ids, long_since, as_of)
+    unexcused = np.bincount(a_students[absent][~covered], minlength=n)
+
+    # Grades: mean percentage and least-squares slope against exam date
+    grades = db.query(Grade.student_id, Exam.exam_date, Grade.score, Exam.max_score)\
+        .join(Exam, Exam.id == Grade.exam_id)\
+        .filter(Exam.exam_date.between(grade_since, as_of), Exam.max_score > 0, Grade.student_id.isnot(None))\
+        .all()
+    g_students = _index(student_ids, [g.student_id for g in grades])
+    x = np.array([(g.exam_date - as_of).days for g in grades], dtype=float)
+    y = np.array([g.score / g.max_score * 100 for g in grades], dtype=float)
+    count = np.bincount(g_students, minlength=n).astype(float)
+    sx = np.bincount(g_students, weights=x, minlength=n)
+    sy = np.bincount(g_students, weights=y, minlength=n)
+    sxx = np.bincount(g_students, weights=x * x, minlength=n)
+    sxy = np.bincount(g_students, weights=x * y, minlength=n)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        average_percent = np.where(count > 0, sy / count, np.nan)
+        denominator = count * sxx - sx * sx
+        slope = np.where((count >= 2) & (denominator > 0), (count * sxy - sx * sy) / denominator, np.nan)
+    grade_trend = slope * 30  # percentage points per 30 days
+
+    components = {
+        "absence_rate_short": absence_rate_short,
+        "absence_rate_long": absence_rate_long,
+        "unexcused_absences": np.minimum(unexcused / UNEXCUSED_SATURATION, 1),
+        "late_count": np.minimum(late_count / LATE_SATURATION, 1),
+        "low_grades": np.clip((FAILING_PERCENT - np.nan_to_num(average_percent, nan=100)) / FAILING_PERCENT, 0, 1),
+        "grade_trend": np.clip(-np.nan_to_num(grade_trend) / TREND_SATURATION, 0, 1),
+    }
+    score = np.round(sum(WEIGHTS[name] * values for name, values in components.items()) * 100, 1)
+
+    return {
+        "student_id": student_ids,
+        "score": score,
+        "absence_rate_short": np.round(absence_rate_short, 3),
+        "absence_rate_long": np.round(absence_rate_long, 3),
+        "unexcused_absences": unexcused,
+        "late_count": late_count,
+        "average_percent": np.round(average_percent, 1),
+        "grade_trend": np.round(grade_trend, 1),
+        "as_of": as_of,
+    }
+
+
+def _level(score: float) -> str:
+    for threshold, level in LEVELS:
+        if score >= threshold:
+            return level
+    return LEVELS[-1][1]
+
+
+def refresh_risk_scores(db: Session, as_of: Optional[date] = None) -> dict:
+    """Recompute all scores and replace the table in one transaction. Returns counts per level."""
+    scores = compute_risk_scores(db, as_of)
+    computed_at = datetime.now(timezone.utc)
+
+    def value(column, i):
+        v = scores[column][i].item()
+        return None if isinstance(v, float) and np.isnan(v) else v
+
+    rows = [{
+        "student_id": int(student_id),
+        "score": value("score", i),
+        "level": _level(scores["score"][i]),
+        "absence_rate_short": value("absence_rate_short", i),
+        "absence_rate_long": value("absence_rate_long", i),
+        "unexcused_absences": value("unexcused_absences", i),
+        "late_count": value("late_count", i),
+        "average_percent": value("average_percent", i),
+        "grade_trend": value("grade_trend", i),
+        "as_of": scores["as_of"],
+        "computed_at": computed_at
+    } for i, student_id in enumerate(scores["student_id"])]
+
+    db.execute(delete(StudentRiskScore))
+    if rows:
+        db.execute(insert(StudentRiskScore), rows)
+    db.commit()
+
+    counts = {level: 0 for _, level in LEVELS}
+    for row in rows:
+        counts[row["level"]] += 1
+    return {"students": len(rows), **counts}
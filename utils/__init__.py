@@ -9,9 +9,15 @@ from utils.security import (
     create_access_token,
     generate_password
 )
+from utils.intervals import IntervalIndex
+from utils.http_cache import make_etag, etag_matches, conditional_json, not_modified, validator_headers
+from utils.grading import german_grade, german_grades, term_bounds, term_of
 
 __all__ = [
     "RoleType", "GradeLevel", "AttendanceStatus", "RegistrationStatus",
     "validate_password_strength", "get_password_hash", "verify_password",
-    "create_access_token", "generate_password"
+    "create_access_token", "generate_password",
+    "IntervalIndex",
+    "make_etag", "etag_matches", "conditional_json", "not_modified", "validator_headers",
+    "german_grade", "german_grades", "term_bounds", "term_of"
 ]
\ No newline at end of file
@@ -0,0 +1,57 @@
+from datetime import date
+from typing import Optional, Tuple
+
+import numpy as np
+
+# Lower percentage bound of grades 5, 4, 3, 2 and 1 (German grading system)
+GRADE_THRESHOLDS = (30, 50, 67, 81, 92)
+PASSING_GRADE = 4
+GRADE_LABELS = {
+    1: "sehr gut",
+    2: "gut",
+    3: "befriedigend",
+    4: "ausreichend",
+    5: "mangelhaft",
+    6: "ungenügend",
+}
+
+
+def german_grade(percentage: float) -> str:
+    """1 (Sehr gut) ... 6 (Ungenügend) for a score percentage."""
+    grade = 6
+    for threshold in GRADE_THRESHOLDS:
+        if percentage >= threshold:
+            grade -= 1
+    return str(grade)
+
+
+def german_grades(percentages: np.ndarray) -> np.ndarray:
+    """Vectorized `german_grade`, as integers; NaN percentages map to 0."""
+    grades = 6 - np.digitize(percentages, GRADE_THRESHOLDS)
+    return np.where(np.isnan(percentages), 0, grades)
+
+
+def term_bounds(academic_year: str, term: Optional[int] = None) -> Tuple[date, date]:
+    """
+    Inclusive date range of a term of an academic year such as "2025-2026":
+    term 1 runs August to January, term 2 February to July, and no term
+    means the whole year.
+    """
+    try:
+        start_year = int(academic_year.replace("/", "-").split("-")[0])
+    except ValueError:
+        raise ValueError(f"Invalid academic year: {academic_year}")
+    if term == 1:
+        return date(start_year, 8, 1), date(start_year + 1, 1, 31)
+    if term == 2:
+        return date(start_year + 1, 2, 1), date(start_year + 1, 7, 31)
+    if term is None:
+        return date(start_year, 8, 1), date(start_year + 1, 7, 31)
+    raise ValueError(f"Invalid term: {term}")
+
+
+def term_of(day: date) -> Tuple[str, int]:
+    """(academic year, term) a date falls in, the inverse of `term_bounds`."""
+    if day.month >= 8:
+        return f"{day.year}-{day.year + 1}", 1
+    return f"{day.year - 1}-{day.year}", 1 if day.month == 1 else 2
@@ -0,0 +1,71 @@
+import hashlib
+import json
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+
+def make_etag(*parts) -> str:
+    """Build a strong ETag from any JSON-serializable validator parts."""
+    raw = json.dumps(jsonable_encoder(parts), sort_keys=True, separators=(",", ":"), default=str)
+    return '"' + hashlib.sha1(raw.encode()).hexdigest() + '"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _utc(value: datetime) -> datetime:
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value.astimezone(timezone.utc)
+
+
+def validator_headers(etag: str, last_modified: Optional[datetime] = None) -> dict:
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified:
+        headers["Last-Modified"] = format_datetime(_utc(last_modified), usegmt=True)
+    return headers
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> Optional[Response]:
+    """
+    Return an empty 304 if the client's validators are still current, else
+    None. If-None-Match takes precedence over If-Modified-Since (RFC 9110).
+    """
+    if request.headers.get("if-none-match"):
+        fresh = etag_matches(request, etag)
+    else:
+        fresh = False
+        since = request.headers.get("if-modified-since")
+        if since and last_modified:
+            try:
+                fresh = _utc(last_modified).replace(microsecond=0) <= parsedate_to_datetime(since)
+            except (TypeError, ValueError):
+                fresh = False
+    if fresh:
+        return Response(status_code=304, headers=validator_headers(etag, last_modified))
+    return None
+
+
+def conditional_json(request: Request, payload, headers: dict = None) -> Response:
+    """
+    Return `payload` as JSON with an ETag derived from its content, or an
+    empty 304 when the client already holds that exact representation.
+    """
+    content = jsonable_encoder(payload)
+    etag = make_etag(content)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache", **(headers or {})}
+    if etag_matches(request, etag):
+        return Response(status_code=304, headers=headers)
+    return JSONResponse(content=content, headers=headers)
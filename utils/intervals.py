@@ -0,0 +1,28 @@
+from bisect import bisect_right
+from typing import Iterable, Tuple, Any
+
+
+class IntervalIndex:
+    """
+    Sorted, merged half-open [start, end) intervals.
+    Overlap lookups are a binary search instead of a scan.
+    """
+
+    def __init__(self, intervals: Iterable[Tuple[Any, Any]] = ()):
+        self._starts = []
+        self._ends = []
+        for start, end in sorted(intervals):
+            if self._ends and start <= self._ends[-1]:
+                self._ends[-1] = max(self._ends[-1], end)
+            else:
+                self._starts.append(start)
+                self._ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def overlaps(self, start, end) -> bool:
+        i = bisect_right(self._starts, start) - 1
+        if i >= 0 and self._ends[i] > start:
+            return True
+        return i + 1 < len(self._starts) and self._starts[i + 1] < end
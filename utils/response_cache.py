@@ -0,0 +1,206 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from typing import Iterable, Optional
+
+import orjson
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from config import RESPONSE_CACHE_URL, RESPONSE_CACHE_MAX_ENTRIES, RESPONSE_CACHE_TTL_SECONDS
+
+
+class LRUBackend:
+    """In-process LRU with TTL and a tag -> keys index for invalidation."""
+
+    shared = False
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (expires_at, body, tags)
+        self._tags = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry:
+            for tag in entry[2]:
+                keys = self._tags.get(tag)
+                if keys:
+                    keys.discard(key)
+                    if not keys:
+                        del self._tags[tag]
+
+    def get(self, key) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if not entry:
+                return None
+            if entry[0] < time.monotonic():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key, body: bytes, tags: Iterable[str], ttl: int):
+        tags = tuple(tags)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, body, tags)
+            for tag in tags:
+                self._tags[tag].add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def invalidate(self, tags: Iterable[str]):
+        with self._lock:
+            for tag in tags:
+                for key in list(self._tags.get(tag, ())):
+                    self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+
+class RedisBackend:
+    """Redis-compatible backend; tags are stored as sets of cache keys."""
+
+    PREFIX = "rc:"
+    TAG_PREFIX = "rc-tag:"
+    shared = True
+
+    def __init__(self, url: str):
+        try:
+            import redis
+        except ImportError:
+            raise RuntimeError("RESPONSE_CACHE_URL points at Redis but the 'redis' package is not installed")
+        self.client = redis.Redis.from_url(url)
+
+    def get(self, key) -> Optional[bytes]:
+        return self.client.get(self.PREFIX + key)
+
+    def set(self, key, body: bytes, tags: Iterable[str], ttl: int):
+        pipe = self.client.pipeline()
+        pipe.set(self.PREFIX + key, body, ex=ttl)
+        for tag in tags:
+            pipe.sadd(self.TAG_PREFIX + tag, key)
+            pipe.expire(self.TAG_PREFIX + tag, ttl)
+        pipe.execute()
+
+    def invalidate(self, tags: Iterable[str]):
+        for tag in tags:
+            keys = self.client.smembers(self.TAG_PREFIX + tag)
+            pipe = self.client.pipeline()
+            for key in keys:
+                pipe.delete(self.PREFIX + key.decode())
+            pipe.delete(self.TAG_PREFIX + tag)
+            pipe.execute()
+
+    def clear(self):
+        for pattern in (self.PREFIX + "*", self.TAG_PREFIX + "*"):
+            for key in self.client.scan_iter(pattern):
+                self.client.delete(key)
+
+
+class ResponseCache:
+    """
+    Cache of serialized JSON responses keyed on route, query params and the
+    caller's scope, tagged with the entities they were built from
+    (e.g. "events", "event:42"). Write handlers call `invalidate()` with the
+    tags they touched.
+
+    The in-process LRU backend is private to each worker. Invalidations are
+    passed to the function set with `set_broadcast()` (the event bus wires
+    in Postgres NOTIFY) so the other workers drop their copies too. Without
+    a broadcast (not on Postgres, or while a worker's LISTEN connection is
+    down) other workers serve stale entries until the TTL runs out; run a
+    single worker or use the Redis backend in that case.
+    """
+
+    BROADCAST_CHUNK = 100  # tags per broadcast message, to stay within NOTIFY's payload limit
+
+    def __init__(self, backend, ttl: int):
+        self.backend = backend
+        self.ttl = ttl
+        self._broadcast = None
+
+    def set_broadcast(self, broadcast):
+        """`broadcast(tags)` forwards invalidations to the other workers; unused with a shared backend."""
+        self._broadcast = broadcast
+
+    @staticmethod
+    def key(request: Request, scope: str) -> str:
+        params = sorted(request.query_params.multi_items())
+        raw = f"{request.url.path}?{params}|{scope}"
+        return hashlib.sha1(raw.encode()).hexdigest()
+
+    def get(self, request: Request, scope: str = "public") -> Optional[Response]:
+        try:
+            body = self.backend.get(self.key(request, scope))
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            return None
+        if body is None:
+            return None
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "HIT"})
+
+    def put(self, request: Request, payload, tags: Iterable[str], scope: str = "public") -> Response:
+        """`payload` is anything jsonable, or an already encoded JSON body."""
+        if isinstance(payload, bytes):
+            body = payload
+        else:
+            body = orjson.dumps(jsonable_encoder(payload))
+        try:
+            self.backend.set(self.key(request, scope), body, tags, self.ttl)
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+        return Response(content=body, media_type="application/json", headers={"X-Cache": "MISS"})
+
+    def load(self, key: str) -> Optional[bytes]:
+        """Raw lookup for computed payloads shared by several endpoints."""
+        try:
+            return self.backend.get(key)
+        except Exception as e:
+            print(f"Response cache read failed: {e}")
+            return None
+
+    def store(self, key: str, body: bytes, tags: Iterable[str]):
+        try:
+            self.backend.set(key, body, tags, self.ttl)
+        except Exception as e:
+            print(f"Response cache write failed: {e}")
+
+    def invalidate(self, *tags: str):
+        self.invalidate_local(tags)
+        if self._broadcast is None or self.backend.shared:
+            return
+        tags = sorted(set(tags))
+        for i in range(0, len(tags), self.BROADCAST_CHUNK):
+            try:
+                self._broadcast(tags[i:i + self.BROADCAST_CHUNK])
+            except Exception as e:
+                print(f"Response cache invalidation broadcast failed: {e}")
+
+    def invalidate_local(self, tags: Iterable[str]):
+        """Invalidate in this process only; what the other workers run on a broadcast."""
+        try:
+            self.backend.invalidate(tags)
+        except Exception as e:
+            print(f"Response cache invalidation failed: {e}")
+
+
+def _create_backend(url: str):
+    if url.startswith(("redis://", "rediss://", "unix://")):
+        return RedisBackend(url)
+    return LRUBackend(RESPONSE_CACHE_MAX_ENTRIES)
+
+
+response_cache = ResponseCache(_create_backend(RESPONSE_CACHE_URL), RESPONSE_CACHE_TTL_SECONDS)
+
+
+def user_scope(user) -> str:
+    """Scope for responses that contain per-user fields."""
+    return f"user:{user.id}"